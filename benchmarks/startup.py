@@ -0,0 +1,179 @@
+"""
+Startup benchmark for main.py.
+
+Measures, in fresh interpreter processes:
+  * cold import: time to `import main`
+  * first menu: time from process start until the main menu header is printed
+  * first listing: time from process start until `import main` and get.list_secrets() have listed
+    a vault of --items secrets served by the emulator (emulator/), SDK imports and the first
+    credential and client included
+and checks that no Azure SDK package is imported before the first menu, and that listing secrets
+only loads the secrets SDK.
+
+The first menu is measured offline. The inventory is re-listed only when an item type is first
+opened, so startup itself does no SDK or network work; that cost is what first listing measures.
+
+Exits with status 1 when a median exceeds its budget, so it can gate CI:
+
+    python benchmarks/startup.py --runs 10 --import-budget-ms 250 --menu-budget-ms 600 --listing-budget-ms 1000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from emulator import Emulator
+
+MENU_MARKER = "Azure Key Vault Management"
+HEAVY_MODULES = (
+    "azure.identity",
+    "azure.keyvault.keys",
+    "azure.keyvault.secrets",
+    "azure.keyvault.certificates",
+    "dotenv",
+)
+
+IMPORT_SNIPPET = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print(json.dumps({'seconds': elapsed, 'heavy': heavy}))\n"
+)
+
+LISTING_SNIPPET = (
+    "import io, os, sys, time, json, contextlib\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "from src import auth, get\n"
+    "from emulator import StaticTokenCredential\n"
+    "from azure.core.pipeline.transport import RequestsTransport\n"
+    "auth.configure(StaticTokenCredential(), verify_challenge_resource=False,\n"
+    "               transport=RequestsTransport(connection_verify=os.environ['KV_EMULATOR_CERT']))\n"
+    "with contextlib.redirect_stdout(io.StringIO()) as out:\n"
+    "    get.list_secrets()\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print(json.dumps({'seconds': elapsed, 'heavy': heavy, 'error': 'Error listing' in out.getvalue()}))\n"
+)
+# Modules that listing secrets may load (dotenv reads KEY_VAULT_URL); any other in HEAVY_MODULES is paid for needlessly
+LISTING_MODULES = ("azure.keyvault.secrets", "dotenv")
+
+def _env(**overrides):
+    env = dict(os.environ)
+    # Keep the run side-effect free: no snapshot, and no vault unless one is passed in
+    env.update({"KV_SNAPSHOT_PATH": "", "KEY_VAULT_URL": "", "PYTHONUNBUFFERED": "1", "TERM": "dumb"})
+    env.update(overrides)
+    return env
+
+def measure_import():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=_env(),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure_first_menu():
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        for line in process.stdout:
+            if MENU_MARKER in line:
+                elapsed = time.perf_counter() - start
+                break
+        else:
+            raise RuntimeError("main menu was never printed")
+        process.stdin.write("0\n")
+        process.stdin.flush()
+        process.wait(timeout=10)
+        return elapsed
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+def measure_first_listing(emulator):
+    env = _env(KEY_VAULT_URL=emulator.url, KV_EMULATOR_CERT=emulator.cert_path)
+    result = subprocess.run(
+        [sys.executable, "-c", LISTING_SNIPPET], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+    run = json.loads(result.stdout.strip().splitlines()[-1])
+    if run['error']:
+        raise RuntimeError("listing secrets from the emulator failed")
+    return run
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=float(os.getenv("KV_IMPORT_BUDGET_MS", "250")))
+    parser.add_argument("--menu-budget-ms", type=float, default=float(os.getenv("KV_MENU_BUDGET_MS", "600")))
+    parser.add_argument("--listing-budget-ms", type=float, default=float(os.getenv("KV_LISTING_BUDGET_MS", "1000")))
+    parser.add_argument("--items", type=int, default=100, help="secrets in the emulated vault for the first listing")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    imports = [measure_import() for _ in range(args.runs)]
+    menus = [measure_first_menu() for _ in range(args.runs)]
+    with Emulator() as emulator:
+        emulator.vault.seed('secret', args.items)
+        listings = [measure_first_listing(emulator) for _ in range(args.runs)]
+
+    heavy = sorted({m for run in imports for m in run['heavy']})
+    extra = sorted({m for run in listings for m in run['heavy']} - set(LISTING_MODULES))
+    results = {
+        "runs": args.runs,
+        "cold_import_ms": {
+            "median": statistics.median(r['seconds'] for r in imports) * 1000,
+            "max": max(r['seconds'] for r in imports) * 1000,
+            "budget": args.import_budget_ms,
+        },
+        "first_menu_ms": {
+            "median": statistics.median(menus) * 1000,
+            "max": max(menus) * 1000,
+            "budget": args.menu_budget_ms,
+        },
+        "first_listing_ms": {
+            "median": statistics.median(r['seconds'] for r in listings) * 1000,
+            "max": max(r['seconds'] for r in listings) * 1000,
+            "budget": args.listing_budget_ms,
+            "items": args.items,
+        },
+        "heavy_modules_at_startup": heavy,
+        "extra_modules_for_secrets": extra,
+    }
+
+    for label in ("cold_import_ms", "first_menu_ms", "first_listing_ms"):
+        r = results[label]
+        print(f"{label}: median {r['median']:.1f} ms, max {r['max']:.1f} ms (budget {r['budget']:.0f} ms)")
+    if heavy:
+        print(f"SDK modules imported before the first menu: {', '.join(heavy)}")
+    if extra:
+        print(f"Modules imported to list secrets that it does not need: {', '.join(extra)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = (
+        results["cold_import_ms"]["median"] > args.import_budget_ms
+        or results["first_menu_ms"]["median"] > args.menu_budget_ms
+        or results["first_listing_ms"]["median"] > args.listing_budget_ms
+        or bool(heavy)
+        or bool(extra)
+    )
+    if failed:
+        print("Startup budget exceeded.")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Throughput benchmark for listing, sidebar rendering, version cleanup and bulk updates.
+
+Runs the real src/* functions, and the Azure SDK underneath them, against the Key Vault emulator
+(emulator/) started in-process and seeded with 1k/10k/50k secrets. For every vault size and workload it reports
+ops/sec, p50/p99 latency and peak traced memory, and saves the results as JSON so runs can be compared:
+
+    python benchmarks/throughput.py --sizes 1000,10000,50000
+    python benchmarks/throughput.py --sizes 1000 --output new.json --compare old.json
+    python benchmarks/throughput.py --sizes 10000 --latency-ms 20 --throttle-rate 0.01
+
+Workloads:
+  * list: get.get_all_secrets(refresh=True); ops are items, latency is per page request
+  * sidebar: name index build, then prompt redraws (filter + layout + one page); latency per redraw
+  * version_cleanup: edit.disable_all_but_newest_key_version over keys with many versions;
+    ops are disabled versions, latency is per SDK call
+  * bulk_update: bulk.bulk_set_enabled on up to --bulk-items secrets; latency is per SDK call
+
+The emulator shares the process (and the GIL) with the client, so its work is part of the numbers,
+and the memory peak includes its allocations. --latency-ms and --throttle-rate inject network delay
+and 429s to see how the workloads behave against a remote, busy vault. Compare runs made on the same machine instead of reading
+them as service throughput. Unless KV_RATE_LIMITS is set, the request scheduler's limits are lifted
+so the client is measured rather than the throttle.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["KV_SNAPSHOT_PATH"] = ""
+os.environ.setdefault("KV_INVENTORY_TTL", "3600")
+
+from azure.core.pipeline.policies import HTTPPolicy
+from emulator import Emulator, Vault, StaticTokenCredential
+from src import auth, get, edit, bulk, scheduler
+from src.index import NameIndex
+import main
+
+DEFAULT_SIZES = "1000,10000,50000"
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+# Terminal the sidebar is rendered for, and the text typed into the prompt between redraws
+SIDEBAR_COLUMNS, SIDEBAR_LINES = 160, 50
+SIDEBAR_QUERIES = ("", "s", "se", "secret-00", "secret-0012", "sc0", "st99", "x")
+SIDEBAR_PAGES = 4
+
+class LatencyPolicy(HTTPPolicy):
+    """
+    Per-call policy recording how long each SDK call took, retries and scheduler wait included.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.samples = []
+
+    def send(self, request):
+        start = time.perf_counter()
+        try:
+            return self.next.send(request)
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+def percentile(samples, q):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+class Context:
+
+    def __init__(self, size, args):
+        self.size = size
+        self.vault = Vault()
+        self.names = self.vault.seed('secret', size)
+        self.bulk_names = self.names[:min(size, args.bulk_items)]
+        self.versioned = self.vault.seed('key', args.cleanup_items, versions=args.cleanup_versions, prefix="versioned")
+        self.sidebar_rounds = args.sidebar_rounds
+        self.recorder = LatencyPolicy()
+
+def bench_list(ctx):
+    get.invalidate_inventory('secret')
+    items = get.get_all_secrets(refresh=True)
+    return len(items), None, {}
+
+def bench_sidebar(ctx):
+    names = [item.name for item in get.get_inventory('secret')]
+    start = time.perf_counter()
+    index = NameIndex(names)
+    name_width = max(map(len, index.names), default=0)
+    build = time.perf_counter() - start
+
+    samples = []
+    for _ in range(ctx.sidebar_rounds):
+        for text in SIDEBAR_QUERIES:
+            for page in range(SIDEBAR_PAGES):
+                start = time.perf_counter()
+                rows, cols, col_width, _ = main.sidebar_layout(
+                    len(index), SIDEBAR_COLUMNS, SIDEBAR_LINES - main.SIDEBAR_RESERVED_LINES, name_width)
+                per_page = rows * cols
+                matches = index.search(text, limit=(page + 1) * per_page + 1) if text else index.names
+                main.render_sidebar_page(matches, page, rows, cols, col_width)
+                samples.append(time.perf_counter() - start)
+    return len(samples), samples, {'index_build_ms': round(build * 1000, 3)}
+
+def bench_version_cleanup(ctx):
+    ctx.vault.reset_enabled('key', ctx.versioned)
+    disabled = 0
+    for name in ctx.versioned:
+        summary = edit.disable_all_but_newest_key_version(name)
+        disabled += sum(1 for result in summary if result['error'] is None)
+    return disabled, None, {'items': len(ctx.versioned)}
+
+def bench_bulk_update(ctx):
+    ctx.vault.reset_enabled('secret', ctx.bulk_names)
+    summary = bulk.bulk_set_enabled('secret', ctx.bulk_names, False)
+    return sum(1 for result in summary if result['status'] == 'ok'), None, {'items': len(ctx.bulk_names)}
+
+WORKLOADS = {
+    'list': bench_list,
+    'sidebar': bench_sidebar,
+    'version_cleanup': bench_version_cleanup,
+    'bulk_update': bench_bulk_update,
+}
+
+def run_once(func, ctx, trace_memory):
+    ctx.recorder.samples.clear()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    # The src functions report progress per item; keep it off the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        ops, samples, extra = func(ctx)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if samples is None:
+        samples = list(ctx.recorder.samples)
+    return ops, elapsed, samples, peak, extra
+
+def measure(name, ctx, trace_memory):
+    """
+    One timed run, then (with trace_memory) a second run under tracemalloc for the peak,
+    since tracing slows allocation-heavy code down too much to time it.
+    """
+    func = WORKLOADS[name]
+    ops, elapsed, samples, _, extra = run_once(func, ctx, False)
+    peak = run_once(func, ctx, True)[3] if trace_memory else None
+    p50, p99 = percentile(samples, 0.5), percentile(samples, 0.99)
+    return {
+        'size': ctx.size,
+        'workload': name,
+        'ops': ops,
+        'seconds': round(elapsed, 4),
+        'ops_per_sec': round(ops / elapsed, 1) if elapsed else None,
+        'samples': len(samples),
+        'p50_ms': round(p50 * 1000, 3) if p50 is not None else None,
+        'p99_ms': round(p99 * 1000, 3) if p99 is not None else None,
+        'peak_memory_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+        **extra,
+    }
+
+def run_size(size, workloads, args):
+    ctx = Context(size, args)
+    with Emulator(ctx.vault) as emulator:
+        emulator.faults.configure(latency=args.latency_ms / 1000, throttle_rate=args.throttle_rate, retry_after=args.retry_after)
+        auth.configure(StaticTokenCredential(), per_call_policies=[ctx.recorder], **emulator.client_options)
+        os.environ["KEY_VAULT_URL"] = emulator.url
+        get.invalidate_inventory()
+        try:
+            return [measure(name, ctx, not args.no_memory) for name in workloads]
+        finally:
+            auth.configure()
+            get.invalidate_inventory()
+
+def _sdk_versions():
+    versions = {}
+    for package in ("azure-core", "azure-keyvault-keys", "azure-keyvault-secrets", "azure-keyvault-certificates"):
+        try:
+            from importlib.metadata import version
+            versions[package] = version(package)
+        except Exception:
+            versions[package] = None
+    return versions
+
+def print_results(results, baseline=None):
+    previous = {(r['size'], r['workload']): r for r in (baseline or [])}
+    print(f"{'Size':>7} {'Workload':<16} {'Ops':>7} {'Ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'Peak MB':>8}"
+          + ("  vs baseline" if baseline else ""))
+    for r in results:
+        line = (f"{r['size']:>7} {r['workload']:<16} {r['ops']:>7} {r['ops_per_sec'] or 0:>10.1f} "
+                f"{r['p50_ms'] or 0:>9.3f} {r['p99_ms'] or 0:>9.3f} "
+                f"{r['peak_memory_mb'] if r['peak_memory_mb'] is not None else '-':>8}")
+        old = previous.get((r['size'], r['workload']))
+        if old and old.get('ops_per_sec') and r['ops_per_sec']:
+            line += f"  ops/s x{r['ops_per_sec'] / old['ops_per_sec']:.2f}"
+            if old.get('p99_ms') and r['p99_ms']:
+                line += f", p99 x{r['p99_ms'] / old['p99_ms']:.2f}"
+        print(line)
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated vault sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS),
+                        help=f"comma-separated subset of: {', '.join(WORKLOADS)}")
+    parser.add_argument("--bulk-items", type=int, default=5000, help="items updated by bulk_update (capped at the size)")
+    parser.add_argument("--cleanup-items", type=int, default=20, help="keys processed by version_cleanup")
+    parser.add_argument("--cleanup-versions", type=int, default=50, help="versions per key for version_cleanup")
+    parser.add_argument("--sidebar-rounds", type=int, default=10, help="passes over the sidebar queries")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency the emulator adds to every request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="JSON results file (default benchmarks/results/throughput-<time>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    workloads = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    unknown = [w for w in workloads if w not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(unknown)}")
+    if not os.getenv("KV_RATE_LIMITS"):
+        scheduler.RATES.update({name: 1e6 for name in scheduler.RATES})
+        scheduler.reset()
+
+    results = []
+    for size in sizes:
+        print(f"Running {', '.join(workloads)} against {size} secrets...", file=sys.stderr)
+        results.extend(run_size(size, workloads, args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f).get('results', [])
+    print_results(results, baseline)
+
+    started = datetime.now(timezone.utc)
+    output = args.output or os.path.join(RESULTS_DIR, f"throughput-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    document = {
+        'meta': {
+            'timestamp': started.isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'packages': _sdk_versions(),
+            'options': {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        'results': results,
+    }
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
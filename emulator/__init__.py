@@ -0,0 +1,20 @@
+"""
+Local Key Vault emulator: an HTTPS server implementing the keys/secrets/certificates REST subset
+that src/* uses, so the real SDK (serialization, paging, pollers, retries) runs offline.
+
+    from emulator import Emulator, StaticTokenCredential
+    from src import auth
+
+    with Emulator() as emulator:
+        emulator.vault.seed('secret', 10000)
+        emulator.faults.configure(latency=0.02, throttle_rate=0.01)
+        auth.configure(StaticTokenCredential(), **emulator.client_options)
+        os.environ["KEY_VAULT_URL"] = emulator.url
+
+Supported: listing with maxresults/nextLink paging, versions, get/set/create/update, soft delete
+with recover and purge, delete/recover/certificate-creation operations that complete after a
+configurable delay, backup and restore, and injected latency and 429 faults. Faults and counters
+are also reachable over HTTP at /_emulator/faults (GET/PUT), /_emulator/stats and /_emulator/reset.
+"""
+from .store import Vault, VaultError
+from .server import Emulator, Faults, StaticTokenCredential
@@ -0,0 +1,483 @@
+import os
+import ssl
+import json
+import time
+import base64
+import random
+import datetime
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from .store import Vault, VaultError, ITEM_TYPES
+
+COLLECTIONS = {'keys': 'key', 'secrets': 'secret', 'certificates': 'certificate'}
+DELETED_COLLECTIONS = {f"deleted{collection}": item_type for collection, item_type in COLLECTIONS.items()}
+PLURAL = {item_type: collection for collection, item_type in COLLECTIONS.items()}
+MAX_PAGE_SIZE = 25
+API_VERSION = "7.5"
+CHALLENGE = (
+    'Bearer authorization="https://login.microsoftonline.com/00000000-0000-0000-0000-000000000000", '
+    'resource="https://vault.azure.net"'
+)
+# Stand-ins for key material and certificate bytes; clients only decode them
+RSA_MODULUS = base64.urlsafe_b64encode(b"\x01" * 256).decode().rstrip("=")
+EC_COORDINATE = base64.urlsafe_b64encode(b"\x02" * 32).decode().rstrip("=")
+CERTIFICATE_BYTES = base64.b64encode(b"emulated-certificate").decode()
+CSR_BYTES = base64.b64encode(b"emulated-csr").decode()
+
+class StaticTokenCredential:
+    """
+    Credential returning a fixed token, so no request goes to Entra ID.
+    """
+
+    def get_token(self, *scopes, **kwargs):
+        from azure.core.credentials import AccessToken
+        return AccessToken("emulator-token", int(time.time()) + 3600)
+
+    def close(self):
+        pass
+
+class Faults:
+    """
+    Faults injected into authorized requests: a fixed latency plus random jitter, and 429
+    answers, either for the next `throttle_next` requests or at random with `throttle_rate`.
+    `methods` and `path` (a substring of the URL path) restrict them to some requests.
+    Change them at any time with configure() or PUT /_emulator/faults.
+    """
+    DEFAULTS = {
+        'latency': 0.0, 'jitter': 0.0, 'throttle_rate': 0.0, 'throttle_next': 0,
+        'retry_after': 1.0, 'methods': None, 'path': None,
+    }
+
+    def __init__(self, seed=None, **settings):
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.settings = dict(self.DEFAULTS)
+        self.configure(**settings)
+
+    def configure(self, **settings):
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fault setting(s): {', '.join(sorted(unknown))}")
+        with self._lock:
+            self.settings.update(settings)
+
+    def reset(self):
+        with self._lock:
+            self.settings = dict(self.DEFAULTS)
+
+    def to_dict(self):
+        with self._lock:
+            return dict(self.settings)
+
+    def decide(self, method, path):
+        """
+        Returns (delay in seconds, throttle) for one request.
+        """
+        with self._lock:
+            s = self.settings
+            if s['methods'] and method not in s['methods']:
+                return 0.0, False
+            if s['path'] and s['path'] not in path:
+                return 0.0, False
+            delay = s['latency'] + (self._random.uniform(0, s['jitter']) if s['jitter'] else 0.0)
+            throttle = False
+            if s['throttle_next'] > 0:
+                s['throttle_next'] -= 1
+                throttle = True
+            elif s['throttle_rate'] and self._random.random() < s['throttle_rate']:
+                throttle = True
+            return delay, throttle
+
+def _attributes(record, item_type):
+    attributes = {
+        'enabled': record['enabled'], 'created': record['created'], 'updated': record['updated'],
+        'recoveryLevel': "Recoverable+Purgeable", 'recoverableDays': 90,
+    }
+    for field in ('exp', 'nbf'):
+        if record.get(field) is not None:
+            attributes[field] = record[field]
+    return attributes
+
+def render(base, item_type, name, record, with_version=True, bundle=False, deleted=None):
+    """
+    JSON for a list entry (bundle=False) or a full item (bundle=True) in the service's format,
+    with the deleted-item fields when `deleted` is given.
+    """
+    collection = PLURAL[item_type]
+    item_id = f"{base}/{collection}/{name}" + (f"/{record['version']}" if with_version else "")
+    body = {'attributes': _attributes(record, item_type), 'tags': record['tags'] or None}
+    if item_type == 'key':
+        if bundle:
+            key = {'kid': item_id, 'kty': record.get('kty') or "RSA", 'key_ops': record.get('key_ops')}
+            if key['kty'].startswith("EC"):
+                key.update({'crv': record.get('crv') or "P-256", 'x': EC_COORDINATE, 'y': EC_COORDINATE})
+            else:
+                key.update({'n': RSA_MODULUS, 'e': "AQAB"})
+            body['key'] = key
+        else:
+            body['kid'] = item_id
+    elif item_type == 'secret':
+        body['id'] = item_id
+        body['contentType'] = record['content_type']
+        if bundle:
+            body['value'] = record['value']
+    else:
+        body['id'] = item_id
+        body['x5t'] = "ZW11bGF0ZWQ"
+        if bundle:
+            body['cer'] = CERTIFICATE_BYTES
+            body['kid'] = f"{base}/keys/{name}/{record['version']}"
+            body['sid'] = f"{base}/secrets/{name}/{record['version']}"
+            body['policy'] = dict(record.get('policy') or {}, id=f"{base}/certificates/{name}/policy")
+    if deleted is not None:
+        body['recoveryId'] = f"{base}/deleted{collection}/{name}"
+        body['deletedDate'] = deleted['deleted']
+        body['scheduledPurgeDate'] = deleted['scheduled_purge']
+    return body
+
+def render_operation(base, name, operation):
+    return {
+        'id': f"{base}/certificates/{name}/pending",
+        'issuer': (operation['policy'] or {}).get('issuer') or {'name': "Self"},
+        'csr': CSR_BYTES,
+        'cancellation_requested': False,
+        'status': operation['status'],
+        'status_details': "Pending certificate created." if operation['status'] == "inProgress" else None,
+        'request_id': operation['request_id'],
+        'target': f"{base}/certificates/{name}",
+    }
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, each response waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, code, message, headers=None):
+        self._send(status, {'error': {'code': code, 'message': message}}, headers)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise VaultError(400, "BadParameter", "The request body is not valid JSON.")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        emulator = self.server.emulator
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        query = parse_qs(url.query)
+        try:
+            if parts and parts[0] == "_emulator":
+                self._admin(method, parts[1:])
+                return
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                # Read the body so the connection can be reused for the authorized retry
+                self._read_json()
+                self._error(401, "Unauthorized", "AKV10000: Request is missing a Bearer or PoP token.",
+                            {"WWW-Authenticate": CHALLENGE})
+                return
+            emulator.count('requests')
+            delay, throttle = emulator.faults.decide(method, url.path)
+            if delay:
+                time.sleep(delay)
+            if throttle:
+                emulator.count('throttled')
+                self._read_json()
+                retry_after = emulator.faults.to_dict()['retry_after']
+                headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+                self._error(429, "Throttled", "Request was not processed because too many requests were received.", headers)
+                return
+            status, body = self._route(method, parts, query)
+            self._send(status, body)
+        except VaultError as e:
+            self._error(e.status, e.code, e.message)
+
+    def _admin(self, method, parts):
+        emulator = self.server.emulator
+        if parts == ["faults"] and method == "GET":
+            self._send(200, emulator.faults.to_dict())
+        elif parts == ["faults"] and method == "PUT":
+            try:
+                emulator.faults.configure(**self._read_json())
+            except (TypeError, ValueError) as e:
+                raise VaultError(400, "BadParameter", str(e))
+            self._send(200, emulator.faults.to_dict())
+        elif parts == ["stats"] and method == "GET":
+            self._send(200, emulator.stats())
+        elif parts == ["reset"] and method == "POST":
+            emulator.reset()
+            self._send(204)
+        else:
+            raise VaultError(404, "NotFound", f"No emulator endpoint {method} /_emulator/{'/'.join(parts)}")
+
+    def _route(self, method, parts, query):
+        vault = self.server.emulator.vault
+        base = self.server.emulator.url
+        if not parts:
+            raise VaultError(404, "NotFound", "No route for /")
+        head, rest = parts[0], parts[1:]
+
+        if head in DELETED_COLLECTIONS:
+            item_type = DELETED_COLLECTIONS[head]
+            if method == "GET" and not rest:
+                names = vault.deleted_names(item_type)
+
+                def entries(skip, size):
+                    rows = []
+                    for name in names[skip:skip + size]:
+                        try:
+                            record, deleted = vault.get_deleted(item_type, name)
+                        except VaultError:
+                            continue
+                        rows.append(render(base, item_type, name, record, with_version=False, deleted=deleted))
+                    return rows
+                return 200, self._page(query, entries, len(names), f"/{head}")
+            if method == "GET" and len(rest) == 1:
+                record, deleted = vault.get_deleted(item_type, rest[0])
+                return 200, render(base, item_type, rest[0], record, bundle=True, deleted=deleted)
+            if method == "DELETE" and len(rest) == 1:
+                vault.purge(item_type, rest[0])
+                return 204, None
+            if method == "POST" and len(rest) == 2 and rest[1] == "recover":
+                record = vault.recover(item_type, rest[0])
+                return 200, render(base, item_type, rest[0], record, bundle=True)
+            raise VaultError(405, "MethodNotAllowed", f"{method} is not supported on /{head}")
+
+        if head not in COLLECTIONS:
+            raise VaultError(404, "NotFound", f"No route for /{'/'.join(parts)}")
+        item_type = COLLECTIONS[head]
+
+        if method == "GET":
+            if not rest:
+                names = vault.names(item_type)
+
+                def entries(skip, size):
+                    rows = []
+                    for name in names[skip:skip + size]:
+                        try:
+                            rows.append(render(base, item_type, name, vault.latest(item_type, name), with_version=False))
+                        except VaultError:
+                            # Deleted, or recovered but not readable yet, since the page list was taken
+                            continue
+                    return rows
+                return 200, self._page(query, entries, len(names), f"/{head}")
+            name = rest[0]
+            if len(rest) == 2 and rest[1] == "versions":
+                versions = vault.versions(item_type, name)
+
+                def entries(skip, size):
+                    return [render(base, item_type, name, record) for record in versions[skip:skip + size]]
+                return 200, self._page(query, entries, len(versions), f"/{head}/{name}/versions")
+            if item_type == 'certificate' and len(rest) == 2 and rest[1] == "pending":
+                return 200, render_operation(base, name, vault.get_operation(name))
+            if item_type == 'certificate' and len(rest) == 2 and rest[1] == "policy":
+                record = vault.latest(item_type, name)
+                return 200, dict(record.get('policy') or {}, id=f"{base}/certificates/{name}/policy")
+            record = vault.get(item_type, name, rest[1] if len(rest) > 1 else None)
+            return 200, render(base, item_type, name, record, bundle=True)
+
+        if method == "PATCH" and rest:
+            update = self._read_json()
+            record = vault.update(
+                item_type, rest[0], rest[1] if len(rest) > 1 else None,
+                attributes=update.get('attributes'), tags=update.get('tags'),
+                content_type=update.get('contentType'), key_ops=update.get('key_ops'),
+            )
+            return 200, render(base, item_type, rest[0], record, bundle=True)
+
+        if method == "PUT" and item_type == 'secret' and len(rest) == 1:
+            body = self._read_json()
+            attributes = body.get('attributes') or {}
+            record = vault.create(
+                'secret', rest[0], value=body.get('value', ""), tags=body.get('tags'),
+                enabled=attributes.get('enabled'), content_type=body.get('contentType'),
+                exp=attributes.get('exp'), nbf=attributes.get('nbf'),
+            )
+            return 200, render(base, 'secret', rest[0], record, bundle=True)
+
+        if method == "POST":
+            if item_type == 'key' and len(rest) == 2 and rest[1] == "create":
+                body = self._read_json()
+                attributes = body.get('attributes') or {}
+                record = vault.create(
+                    'key', rest[0], tags=body.get('tags'), enabled=attributes.get('enabled'),
+                    exp=attributes.get('exp'), nbf=attributes.get('nbf'), request=body,
+                )
+                return 200, render(base, 'key', rest[0], record, bundle=True)
+            if item_type == 'certificate' and len(rest) == 2 and rest[1] == "create":
+                body = self._read_json()
+                attributes = body.get('attributes') or {}
+                operation = vault.begin_certificate(rest[0], body.get('policy'), body.get('tags'), attributes.get('enabled'))
+                return 202, render_operation(base, rest[0], operation)
+            if len(rest) == 2 and rest[1] == "backup":
+                return 200, {'value': vault.backup(item_type, rest[0])}
+            if rest == ["restore"]:
+                name, record = vault.restore(item_type, self._read_json().get('value') or "")
+                return 200, render(base, item_type, name, record, bundle=True)
+
+        if method == "DELETE" and len(rest) == 1:
+            record, deleted = vault.delete(item_type, rest[0])
+            return 200, render(base, item_type, rest[0], record, bundle=True, deleted=deleted)
+
+        raise VaultError(405, "MethodNotAllowed", f"{method} is not supported on /{'/'.join(parts)}")
+
+    def _page(self, query, entries, total, link_path):
+        try:
+            page_size = int(query.get('maxresults', [MAX_PAGE_SIZE])[0])
+            skip = int(query.get('$skiptoken', ["0"])[0])
+        except ValueError:
+            raise VaultError(400, "BadParameter", "maxresults and $skiptoken must be integers.")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise VaultError(400, "BadParameter", f"maxresults must be between 1 and {MAX_PAGE_SIZE}.")
+        next_link = None
+        if skip + page_size < total:
+            next_link = (f"{self.server.emulator.url}{link_path}?api-version={API_VERSION}"
+                         f"&maxresults={page_size}&$skiptoken={skip + page_size}")
+        return {'value': entries(skip, page_size), 'nextLink': next_link}
+
+def make_certificate(directory):
+    """
+    Writes a self-signed certificate for 127.0.0.1 and localhost and its key;
+    returns (cert_path, key_path).
+    """
+    import ipaddress
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Key Vault emulator")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(subject).issuer_name(subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=7))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.IPAddress(ipaddress.ip_address("127.0.0.1")), x509.DNSName("localhost"),
+        ]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "emulator.crt")
+    key_path = os.path.join(directory, "emulator.key")
+    with open(cert_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return cert_path, key_path
+
+class Emulator:
+    """
+    Serves a Vault over HTTPS from a background thread. The SDK refuses plain HTTP, so a throwaway
+    self-signed certificate is generated on start(); client_options makes the clients trust it.
+    """
+
+    def __init__(self, vault=None, faults=None, host="127.0.0.1", port=0):
+        self.vault = vault or Vault()
+        self.faults = faults or Faults()
+        self.host = host
+        self.port = port
+        self.url = None
+        self.cert_path = None
+        self._server = None
+        self._thread = None
+        self._directory = None
+        self._counters = {'requests': 0, 'throttled': 0}
+        self._counter_lock = threading.Lock()
+
+    @property
+    def client_options(self):
+        """
+        Keyword arguments for the SDK clients: trust the emulator's certificate, and do not check
+        that the challenge resource matches the emulator's host. They hold no transport, so the
+        same options work for the sync and the async (src/aio) clients.
+        """
+        return {'connection_verify': self.cert_path, 'verify_challenge_resource': False}
+
+    def count(self, name):
+        with self._counter_lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._counter_lock:
+            counters = dict(self._counters)
+        with self.vault.lock:
+            counters['items'] = {t: len(self.vault.items[t]) for t in ITEM_TYPES}
+            counters['deleted'] = {t: len(self.vault.deleted[t]) for t in ITEM_TYPES}
+        return counters
+
+    def reset(self):
+        """
+        Empties the vault and clears faults and counters.
+        """
+        self.vault.clear()
+        self.faults.reset()
+        with self._counter_lock:
+            self._counters = {name: 0 for name in self._counters}
+
+    def start(self):
+        server = ThreadingHTTPServer((self.host, self.port), EmulatorHandler)
+        server.daemon_threads = True
+        self._directory = tempfile.TemporaryDirectory()
+        self.cert_path, key_path = make_certificate(self._directory.name)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert_path, key_path)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        server.emulator = self
+        self.url = f"https://{self.host}:{server.server_address[1]}"
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="kv-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,309 @@
+import json
+import time
+import uuid
+import base64
+import threading
+
+ITEM_TYPES = ('key', 'secret', 'certificate')
+LABELS = {'key': 'Key', 'secret': 'Secret', 'certificate': 'Certificate'}
+DEFAULT_RECOVERABLE_DAYS = 90
+
+class VaultError(Exception):
+    """
+    An error the emulator answers with, in the service's {"error": {"code", "message"}} shape.
+    """
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+def not_found(item_type, name):
+    return VaultError(404, f"{LABELS[item_type]}NotFound", f"A {item_type} with (name/id) {name} was not found in this key vault.")
+
+def new_version(value=None, tags=None, created=None, enabled=True, **fields):
+    now = int(time.time()) if created is None else int(created)
+    record = {
+        'version': uuid.uuid4().hex, 'enabled': enabled, 'created': now, 'updated': now,
+        'exp': None, 'nbf': None, 'tags': dict(tags or {}), 'value': value, 'content_type': None,
+    }
+    record.update(fields)
+    return record
+
+class Vault:
+    """
+    In-memory keys, secrets and certificates with versions, soft delete and pending
+    certificate operations. Every method takes the lock, so the server's threads can share one Vault.
+
+    Delays make the long-running operations observable: a deleted item shows up in the deleted
+    collection `delete_delay` seconds after the delete, a recovered one comes back after
+    `recover_delay`, and a certificate operation completes after `issuance_delay`.
+    """
+
+    def __init__(self, delete_delay=0.0, recover_delay=0.0, issuance_delay=0.0,
+                 recoverable_days=DEFAULT_RECOVERABLE_DAYS):
+        self.lock = threading.RLock()
+        self.delete_delay = delete_delay
+        self.recover_delay = recover_delay
+        self.issuance_delay = issuance_delay
+        self.recoverable_days = recoverable_days
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            # item_type -> name -> {'versions': [record, ...] oldest first, 'available_at': time}
+            self.items = {item_type: {} for item_type in ITEM_TYPES}
+            # item_type -> name -> {'versions', 'deleted', 'scheduled_purge', 'available_at'}
+            self.deleted = {item_type: {} for item_type in ITEM_TYPES}
+            # certificate name -> pending operation dict
+            self.operations = {}
+            self._name_lists = {}
+
+    # --- seeding -------------------------------------------------------------------------------
+
+    def seed(self, item_type, count, versions=1, prefix=None, tags=None, expires_in=None):
+        """
+        Adds `count` items named <prefix>-000000... with `versions` enabled versions each, the
+        newest created last. expires_in (seconds from now) sets an expiry on every version.
+        Returns the names.
+        """
+        prefix = prefix or item_type
+        names = [f"{prefix}-{i:06d}" for i in range(count)]
+        now = int(time.time())
+        with self.lock:
+            for name in names:
+                for v in range(versions):
+                    record = new_version(
+                        value=f"value-{v}", tags=tags, created=now - (versions - v) * 60,
+                        **self._material(item_type, {})
+                    )
+                    if expires_in is not None:
+                        record['exp'] = now + int(expires_in)
+                    elif item_type == 'certificate':
+                        record['exp'] = record['created'] + validity_months(record['policy']) * 30 * 86400
+                    self._add(item_type, name, record)
+        return names
+
+    def reset_enabled(self, item_type, names):
+        """
+        Enables every version of the named items again.
+        """
+        with self.lock:
+            for name in names:
+                for record in self.items[item_type].get(name, {}).get('versions', ()):
+                    record['enabled'] = True
+
+    def _material(self, item_type, request):
+        if item_type == 'key':
+            return {'kty': request.get('kty', "RSA"), 'key_ops': request.get('key_ops') or ["sign", "verify", "wrapKey", "unwrapKey"],
+                    'crv': request.get('crv')}
+        if item_type == 'certificate':
+            return {'policy': request.get('policy') or default_policy()}
+        return {}
+
+    def _add(self, item_type, name, record):
+        entry = self.items[item_type].get(name)
+        if entry is None:
+            entry = self.items[item_type][name] = {'versions': [], 'available_at': 0.0}
+            self._name_lists.pop(item_type, None)
+        entry['versions'].append(record)
+        return record
+
+    # --- reads ---------------------------------------------------------------------------------
+
+    def names(self, item_type):
+        """
+        Names in creation order. The list is cached until an item is added or removed,
+        so paging through a large vault slices it instead of rebuilding it per page.
+        """
+        with self.lock:
+            names = self._name_lists.get(item_type)
+            if names is None:
+                names = self._name_lists[item_type] = list(self.items[item_type])
+            return names
+
+    def _entry(self, item_type, name):
+        entry = self.items[item_type].get(name)
+        if entry is None or entry['available_at'] > time.time():
+            raise not_found(item_type, name)
+        return entry
+
+    def latest(self, item_type, name):
+        with self.lock:
+            return self._entry(item_type, name)['versions'][-1]
+
+    def versions(self, item_type, name):
+        with self.lock:
+            return list(self._entry(item_type, name)['versions'])
+
+    def get(self, item_type, name, version=None):
+        with self.lock:
+            versions = self._entry(item_type, name)['versions']
+            if not version:
+                return versions[-1]
+            for record in versions:
+                if record['version'] == version:
+                    return record
+            raise not_found(item_type, f"{name}/{version}")
+
+    # --- writes --------------------------------------------------------------------------------
+
+    def _check_not_deleted(self, item_type, name):
+        if name in self.deleted[item_type]:
+            raise VaultError(
+                409, "Conflict",
+                f"{LABELS[item_type]} {name} is currently in a deleted but recoverable state, and its name "
+                f"cannot be reused; in this state, the {item_type} can only be recovered or purged."
+            )
+
+    def create(self, item_type, name, value=None, tags=None, enabled=None, content_type=None, exp=None, nbf=None, request=None):
+        with self.lock:
+            self._check_not_deleted(item_type, name)
+            record = new_version(value=value, tags=tags, **self._material(item_type, request or {}))
+            record['content_type'] = content_type
+            record['exp'] = exp
+            record['nbf'] = nbf
+            if enabled is not None:
+                record['enabled'] = enabled
+            return self._add(item_type, name, record)
+
+    def update(self, item_type, name, version=None, attributes=None, tags=None, content_type=None, key_ops=None):
+        with self.lock:
+            record = self.get(item_type, name, version)
+            for field in ('enabled', 'exp', 'nbf'):
+                if field in (attributes or {}):
+                    record[field] = attributes[field]
+            if tags is not None:
+                record['tags'] = dict(tags)
+            if content_type is not None:
+                record['content_type'] = content_type
+            if key_ops is not None:
+                record['key_ops'] = key_ops
+            record['updated'] = int(time.time())
+            return record
+
+    # --- soft delete ---------------------------------------------------------------------------
+
+    def delete(self, item_type, name):
+        """
+        Moves an item to the deleted collection, where it appears after delete_delay.
+        Returns (latest record, deleted entry).
+        """
+        with self.lock:
+            entry = self._entry(item_type, name)
+            del self.items[item_type][name]
+            self._name_lists.pop(item_type, None)
+            now = time.time()
+            deleted = {
+                'versions': entry['versions'],
+                'deleted': int(now),
+                'scheduled_purge': int(now) + self.recoverable_days * 86400,
+                'available_at': now + self.delete_delay,
+            }
+            self.deleted[item_type][name] = deleted
+            if item_type == 'certificate':
+                self.operations.pop(name, None)
+            return entry['versions'][-1], deleted
+
+    def _deleted_entry(self, item_type, name):
+        deleted = self.deleted[item_type].get(name)
+        if deleted is None or deleted['available_at'] > time.time():
+            raise not_found(item_type, name)
+        return deleted
+
+    def deleted_names(self, item_type):
+        with self.lock:
+            now = time.time()
+            return [name for name, deleted in self.deleted[item_type].items() if deleted['available_at'] <= now]
+
+    def get_deleted(self, item_type, name):
+        with self.lock:
+            deleted = self._deleted_entry(item_type, name)
+            return deleted['versions'][-1], deleted
+
+    def purge(self, item_type, name):
+        with self.lock:
+            self._deleted_entry(item_type, name)
+            del self.deleted[item_type][name]
+
+    def recover(self, item_type, name):
+        """
+        Moves a deleted item back; it becomes readable again after recover_delay.
+        """
+        with self.lock:
+            deleted = self._deleted_entry(item_type, name)
+            del self.deleted[item_type][name]
+            self.items[item_type][name] = {'versions': deleted['versions'], 'available_at': time.time() + self.recover_delay}
+            self._name_lists.pop(item_type, None)
+            return deleted['versions'][-1]
+
+    # --- backup and restore --------------------------------------------------------------------
+
+    def backup(self, item_type, name):
+        with self.lock:
+            entry = self._entry(item_type, name)
+            document = {'type': item_type, 'name': name, 'versions': entry['versions']}
+        return base64.urlsafe_b64encode(json.dumps(document).encode()).decode().rstrip("=")
+
+    def restore(self, item_type, blob):
+        try:
+            document = json.loads(base64.urlsafe_b64decode(blob + "=" * (-len(blob) % 4)))
+            name = document['name']
+            versions = document['versions']
+        except (ValueError, KeyError, TypeError):
+            raise VaultError(400, "BadParameter", "Backup blob is corrupt.")
+        if document.get('type') != item_type:
+            raise VaultError(400, "BadParameter", f"Backup blob does not contain a {item_type}.")
+        with self.lock:
+            self._check_not_deleted(item_type, name)
+            if name in self.items[item_type]:
+                raise VaultError(409, "Conflict", f"{LABELS[item_type]} {name} already exists.")
+            self.items[item_type][name] = {'versions': versions, 'available_at': 0.0}
+            self._name_lists.pop(item_type, None)
+            return name, versions[-1]
+
+    # --- certificate operations ----------------------------------------------------------------
+
+    def begin_certificate(self, name, policy, tags=None, enabled=None):
+        """
+        Starts a certificate operation; the new version is added once it completes.
+        """
+        with self.lock:
+            self._check_not_deleted('certificate', name)
+            operation = self.operations.get(name)
+            if operation is not None and operation['status'] == "inProgress":
+                raise VaultError(409, "Conflict", f"There is a pending operation on certificate {name}.")
+            operation = {
+                'status': "inProgress", 'request_id': uuid.uuid4().hex, 'policy': policy or default_policy(),
+                'tags': tags, 'enabled': enabled, 'complete_at': time.time() + self.issuance_delay,
+            }
+            self.operations[name] = operation
+            self._advance(name, operation)
+            return operation
+
+    def _advance(self, name, operation):
+        if operation['status'] == "inProgress" and time.time() >= operation['complete_at']:
+            self.create('certificate', name, tags=operation['tags'], enabled=operation['enabled'],
+                        exp=int(time.time()) + validity_months(operation['policy']) * 30 * 86400,
+                        request={'policy': operation['policy']})
+            operation['status'] = "completed"
+
+    def get_operation(self, name):
+        with self.lock:
+            operation = self.operations.get(name)
+            if operation is None:
+                raise VaultError(404, "PendingCertificateNotFound", f"Pending certificate not found: {name}")
+            self._advance(name, operation)
+            return operation
+
+def default_policy():
+    return {
+        'key_props': {'exportable': True, 'kty': "RSA", 'key_size': 2048, 'reuse_key': False},
+        'secret_props': {'contentType': "application/x-pkcs12"},
+        'x509_props': {'subject': "CN=DefaultPolicy", 'validity_months': 12},
+        'issuer': {'name': "Self"},
+    }
+
+def validity_months(policy):
+    return int(((policy or {}).get('x509_props') or {}).get('validity_months') or 12)
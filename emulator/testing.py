@@ -0,0 +1,38 @@
+import os
+import unittest
+from .server import Emulator, StaticTokenCredential
+
+class EmulatorTestCase(unittest.TestCase):
+    """
+    Runs one emulator per test class with src.auth pointed at it. Every test starts with an
+    empty vault, no faults, and fresh inventory and scheduler state.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from src import auth
+        super().setUpClass()
+        cls.emulator = Emulator().start()
+        cls._previous_url = os.environ.get("KEY_VAULT_URL")
+        os.environ["KEY_VAULT_URL"] = cls.emulator.url
+        auth.configure(StaticTokenCredential(), **cls.emulator.client_options)
+
+    @classmethod
+    def tearDownClass(cls):
+        from src import auth
+        auth.configure()
+        if cls._previous_url is None:
+            os.environ.pop("KEY_VAULT_URL", None)
+        else:
+            os.environ["KEY_VAULT_URL"] = cls._previous_url
+        cls.emulator.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        from src import get, scheduler
+        super().setUp()
+        self.emulator.reset()
+        self.vault = self.emulator.vault
+        get.invalidate_inventory()
+        get.invalidate_versions()
+        scheduler.reset()
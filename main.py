@@ -3,10 +3,7 @@ import os
 import shutil
 from datetime import datetime
 from colorama import init, Fore, Style
-from src import get, create, delete, edit
-
-# Initialize colorama
-init(autoreset=True)
+from src import auth, get, create, delete, edit, snapshot, bulk, jobs, deleted, backup, sync, tags, metrics, retention, expiry
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -17,32 +14,61 @@ def print_header(text):
 def pause():
     input(Fore.YELLOW + "\nPress Enter to continue..." + Style.RESET_ALL)
 
-def input_with_esc(prompt):
+# Escape sequences reported to an input_with_esc key handler. On Windows, special keys arrive
+# as a b'\x00' or b'\xe0' prefix followed by a scan code.
+POSIX_KEYS = {'\x1b[5~': 'pgup', '\x1b[6~': 'pgdn'}
+WINDOWS_KEYS = {b'I': 'pgup', b'Q': 'pgdn'}
+
+def input_with_esc(prompt, on_key=None):
+    """
+    Reads a line, returning None if Esc is pressed.
+    on_key: optional callback on_key(key, text) for 'pgup', 'pgdn', 'tab' and 'change' (the text
+    was edited). It may redraw the screen. It returns the new text for the prompt line, which is
+    then written again, or None to leave the line as it is. Without a callback Tab is ignored.
+    """
     sys.stdout.write(prompt)
     sys.stdout.flush()
     buffer = []
-    
+
+    def handle_key(key):
+        text = on_key(key, ''.join(buffer))
+        if text is not None:
+            buffer[:] = text
+            sys.stdout.write('\r' + prompt + text + '\x1b[K')
+            sys.stdout.flush()
+
     if os.name == 'nt':
         import msvcrt
         while True:
             ch = msvcrt.getch()
-            if ch == b'\x1b': # Esc
+            if ch in (b'\x00', b'\xe0'): # Special key, the scan code follows
+                key = WINDOWS_KEYS.get(msvcrt.getch())
+                if key and on_key:
+                    handle_key(key)
+            elif ch == b'\x1b': # Esc
                 print('')
                 return None
             elif ch == b'\r': # Enter
                 print('')
                 return ''.join(buffer)
+            elif ch == b'\t': # Tab
+                if on_key:
+                    handle_key('tab')
             elif ch == b'\x08': # Backspace
                 if buffer:
                     buffer.pop()
                     sys.stdout.write('\b \b')
                     sys.stdout.flush()
+                    if on_key:
+                        handle_key('change')
             else:
                 try:
                     char = ch.decode('utf-8')
                     buffer.append(char)
                     sys.stdout.write(char)
                     sys.stdout.flush()
+                    if on_key:
+                        handle_key('change')
                 except:
                     pass
     else:
@@ -53,146 +79,191 @@ def input_with_esc(prompt):
         try:
             tty.setcbreak(fd)
             while True:
-                ch = sys.stdin.read(1)
-                if ord(ch) == 27: # Esc
-                    print('')
-                    return None
-                elif ord(ch) == 10: # Enter
-                    print('')
-                    return ''.join(buffer)
-                elif ord(ch) == 127: # Backspace
-                    if buffer:
-                        buffer.pop()
-                        sys.stdout.write('\b \b')
-                        sys.stdout.flush()
+                if on_key:
+                    # Read straight from the fd so an escape sequence arrives in one chunk and a
+                    # lone Esc can be told apart from the start of Page Up/Down
+                    chars = os.read(fd, 32).decode('utf-8', 'ignore')
+                    key = POSIX_KEYS.get(chars)
+                    if key:
+                        handle_key(key)
+                        continue
+                    if chars.startswith('\x1b') and len(chars) > 1: # Other special keys
+                        continue
                 else:
-                    buffer.append(ch)
-                    sys.stdout.write(ch)
-                    sys.stdout.flush()
+                    chars = sys.stdin.read(1)
+                edited = False
+                for ch in chars:
+                    if ord(ch) == 27: # Esc
+                        print('')
+                        return None
+                    elif ord(ch) == 10: # Enter
+                        print('')
+                        return ''.join(buffer)
+                    elif ord(ch) == 9: # Tab
+                        if on_key:
+                            handle_key('tab')
+                    elif ord(ch) == 127: # Backspace
+                        if buffer:
+                            buffer.pop()
+                            sys.stdout.write('\b \b')
+                            sys.stdout.flush()
+                            edited = True
+                    else:
+                        buffer.append(ch)
+                        sys.stdout.write(ch)
+                        sys.stdout.flush()
+                        edited = True
+                # A pasted chunk triggers one redraw rather than one per character
+                if edited and on_key:
+                    handle_key('change')
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
+# Lines of the name prompt screen that are not sidebar rows: header, blank line, sidebar title
+# and rule, the closing rule, the hint and the prompt itself.
+SIDEBAR_RESERVED_LINES = 9
+SIDEBAR_MAX_NAME_WIDTH = 40
+
+def sidebar_layout(count, width, height, name_width):
+    """
+    Fits `count` names into a width x height area. Returns (rows, cols, col_width, pages).
+    """
+    col_width = min(max(name_width, 1), SIDEBAR_MAX_NAME_WIDTH) + 2
+    cols = max(1, width // col_width)
+    rows = max(1, height)
+    pages = max(1, -(-count // (rows * cols)))
+    return rows, cols, col_width, pages
+
+def render_sidebar_page(names, page, rows, cols, col_width):
+    """
+    Returns the text rows for one page of names, packed column by column.
+    Only the names on that page are touched.
+    """
+    per_page = rows * cols
+    window = names[page * per_page:(page + 1) * per_page]
+    used_rows = min(rows, len(window))
+    lines = []
+    for row in range(used_rows):
+        cells = []
+        for col in range(cols):
+            index = col * rows + row
+            if index >= len(window):
+                break
+            name = window[index]
+            if len(name) > col_width - 2:
+                name = name[:col_width - 3] + "~"
+            cells.append(f"{name:<{col_width}}")
+        lines.append("".join(cells).rstrip())
+    return lines
+
 def get_input_with_list(prompt, item_type):
     """
     Displays a prompt on the left and a list of items on the right.
     item_type: 'key', 'secret', 'certificate'
+    The list is windowed to the terminal height and filtered as you type; Page Up/Down flips
+    through it and Tab completes the name.
     """
-    items = []
-    header = ""
-    if item_type == 'key':
-        items = get.get_all_keys()
-        header = "Available Keys"
-    elif item_type == 'secret':
-        items = get.get_all_secrets()
-        header = "Available Secrets"
-    elif item_type == 'certificate':
-        items = get.get_all_certificates()
-        header = "Available Certificates"
-    
-    item_names = [item.name for item in items]
-    
-    # Get terminal size
-    columns, lines = shutil.get_terminal_size()
-    
-    # Calculate layout
-    # We want to print the list on the right side.
-    # Let's say right column takes 1/3 of screen or fixed width.
-    # Fixed width of 40 chars seems reasonable for names.
-    sidebar_width = 40
-    main_width = columns - sidebar_width - 5 # 5 for padding/separator
-    
-    if main_width < 20: # Fallback for small screens
-        print(Fore.MAGENTA + f"\n--- {header} ---" + Style.RESET_ALL)
-        for name in item_names:
-            print(f"- {name}")
-        print("-" * 20)
-        print(Fore.YELLOW + "(Press Esc to go back)" + Style.RESET_ALL)
-        val = input_with_esc(prompt)
-        if val is None:
-            return None
-        return val
-
-    # Prepare sidebar lines
-    sidebar_lines = [Fore.MAGENTA + f"--- {header} ---" + Style.RESET_ALL]
-    for name in item_names:
-        sidebar_lines.append(f"- {name}")
-    
-    # We need to clear screen to draw this properly? 
-    # Or just print it below the current menu.
-    # The prompt usually comes after some menu text.
-    # To make it look "right side", we should probably reprint the screen or just print the list.
-    # But the user asked for "right side".
-    # Let's try to print the list aligned to the right, starting from current line?
-    # No, we can't move cursor up easily without curses.
-    
-    # Strategy: Clear screen, reprint a simple header/instruction, then the split view.
-    clear_screen()
-    print_header(f"Select {item_type.capitalize()}")
-    
-    # Content for main area (left)
+    headers = {'key': "Available Keys", 'secret': "Available Secrets", 'certificate': "Available Certificates"}
+    header = headers[item_type]
+    index = get.get_name_index(item_type)
+    name_width = max(map(len, index.names), default=0)
     main_lines = [
         f"Please enter the name of the {item_type}.",
-        "You can see the available items on the right.",
-        "",
-        prompt
+        "Typing filters the list on the right.",
+        "Tab completes, Page Up/Down scrolls.",
     ]
-    
-    max_lines = max(len(main_lines), len(sidebar_lines))
-    
-    print("\n")
-    for i in range(max_lines):
-        left = main_lines[i] if i < len(main_lines) else ""
-        right = sidebar_lines[i] if i < len(sidebar_lines) else ""
-        
-        # Strip ansi codes for length calculation (simplified, assuming no ansi in left for now except prompt)
-        # Actually prompt might have color.
-        # Let's just pad spaces.
-        
-        padding = " " * (main_width - len(left)) # This is naive if left has colors
-        # Better: use f-string with width, but color codes mess up length.
-        # Let's just print right aligned.
-        
-        # Construct the line
-        # We need to move cursor to the right column.
-        # Or just print padding.
-        
-        # Simple approach:
-        # Left content | Right content
-        
-        # Since 'left' might contain the prompt which we want to be the last thing,
-        # we can't print the prompt line here if we want `input()` to be at the end.
-        # `input()` must be the last call.
-        
-        # So we print everything EXCEPT the prompt line.
-        pass
-
-    # Revised Strategy:
-    # Print the list on the right side of the screen, line by line.
-    # Then print the prompt at the bottom.
-    
-    # Header
-    print(f"{' ':<{main_width}} | {Fore.MAGENTA}{header}{Style.RESET_ALL}")
-    print(f"{' ':<{main_width}} | {'-'*20}")
-    
-    for name in item_names:
-        print(f"{' ':<{main_width}} | {name}")
-    
-    print("\n" + "-" * columns)
-    print(Fore.YELLOW + "(Press Esc to go back)" + Style.RESET_ALL)
-    val = input_with_esc(prompt)
-    if val is None:
-        return None
-    return val
+    state = {'page': 0, 'text': '', 'drawn': False}
+
+    def draw():
+        columns, lines = shutil.get_terminal_size()
+        # Fixed left area for the instructions; on narrow screens the list takes the full width
+        main_width = 50 if columns - 50 >= 30 else 0
+        sidebar_width = columns - main_width - (3 if main_width else 0)
+        rows, cols, col_width, _ = sidebar_layout(
+            len(index), sidebar_width, lines - SIDEBAR_RESERVED_LINES, name_width)
+        per_page = rows * cols
+        state['page'] = max(state['page'], 0)
+
+        text = state['text']
+        if text:
+            # Only as many matches as this page needs, plus one to know whether more follow
+            matches = index.search(text, limit=(state['page'] + 1) * per_page + 1)
+            more = len(matches) > (state['page'] + 1) * per_page
+            total = f"{(state['page'] + 1) * per_page}+" if more else str(len(matches))
+            label = f"{header} matching '{text}'"
+        else:
+            matches = index.names
+            more = False
+            total = str(len(matches))
+            label = header
+        pages = max(1, -(-len(matches) // per_page))
+        if not more:
+            state['page'] = min(state['page'], pages - 1)
+        page = state['page']
+
+        first = page * per_page
+        shown = min(len(matches), first + per_page)
+        title = f"{label} ({first + 1}-{shown} of {total})" if matches else f"{label} (none)"
+        sidebar_lines = [Fore.MAGENTA + title + Style.RESET_ALL, "-" * min(sidebar_width, 20)]
+        sidebar_lines += render_sidebar_page(matches, page, rows, cols, col_width)
+
+        if state['drawn']:
+            # Redraws happen on every keystroke; ANSI clear avoids spawning a shell each time
+            sys.stdout.write("\x1b[2J\x1b[H")
+        else:
+            clear_screen()
+            state['drawn'] = True
+        print_header(f"Select {item_type.capitalize()}")
+        print("")
+        if main_width:
+            for i in range(max(len(main_lines), len(sidebar_lines))):
+                left = main_lines[i] if i < len(main_lines) else ""
+                right = sidebar_lines[i] if i < len(sidebar_lines) else ""
+                print(f"{left:<{main_width}} | {right}")
+        else:
+            for line in sidebar_lines:
+                print(line)
+        print("-" * columns)
+        print(Fore.YELLOW + "(Press Esc to go back)" + Style.RESET_ALL)
+
+    def on_key(key, text):
+        if key == 'tab':
+            text = index.complete(text)
+        if key in ('tab', 'change'):
+            if text == state['text']:
+                return text if key == 'tab' else None
+            state['text'] = text
+            state['page'] = 0
+        else:
+            state['page'] += 1 if key == 'pgdn' else -1
+        draw()
+        return text
+
+    draw()
+    return input_with_esc(prompt, on_key=on_key)
+
+def print_job_updates():
+    for job in jobs.pop_finished():
+        if job.status == 'succeeded':
+            print(Fore.GREEN + f"Job #{job.id} finished: {job.description}" + Style.RESET_ALL)
+        else:
+            print(Fore.RED + f"Job #{job.id} failed: {job.description} ({job.error})" + Style.RESET_ALL)
 
 def main_menu():
     while True:
         clear_screen()
         print_header("Azure Key Vault Management")
+        print_job_updates()
         print(Fore.GREEN + "1. " + Style.RESET_ALL + "List Items")
         print(Fore.GREEN + "2. " + Style.RESET_ALL + "Create Item")
         print(Fore.GREEN + "3. " + Style.RESET_ALL + "Delete Item")
         print(Fore.GREEN + "4. " + Style.RESET_ALL + "Edit Item")
         print(Fore.GREEN + "5. " + Style.RESET_ALL + "Version Management")
+        print(Fore.GREEN + "6. " + Style.RESET_ALL + "Bulk Operations")
+        print(Fore.GREEN + "7. " + Style.RESET_ALL + f"Background Jobs ({jobs.running_count()} running)")
+        print(Fore.GREEN + "8. " + Style.RESET_ALL + "Deleted Items (Recover/Purge)")
+        print(Fore.GREEN + "9. " + Style.RESET_ALL + "Backup / Restore / Sync")
+        print(Fore.GREEN + "S. " + Style.RESET_ALL + "Statistics")
         print(Fore.RED + "0. " + Style.RESET_ALL + "Exit")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -207,13 +278,44 @@ def main_menu():
             edit_menu()
         elif choice == '5':
             version_menu()
+        elif choice == '6':
+            bulk_menu()
+        elif choice == '7':
+            jobs_menu()
+        elif choice == '8':
+            deleted_menu()
+        elif choice == '9':
+            backup_menu()
+        elif choice.lower() == 's':
+            stats_menu()
         elif choice == '0':
             print(Fore.MAGENTA + "Exiting..." + Style.RESET_ALL)
+            write_metrics_file()
             break
         else:
             print(Fore.RED + "Invalid option. Please try again." + Style.RESET_ALL)
             pause()
 
+def stats_menu():
+    clear_screen()
+    print_header("Statistics")
+    print("Latency, calls, errors, 429s, retries and bytes per operation since startup.")
+    print("'op' rows are menu operations; 'sdk' rows are the HTTP requests they made.")
+    metrics.report()
+    path = os.getenv("KV_METRICS_FILE")
+    if path:
+        print(f"\nMetrics are written to {path} on exit.")
+    pause()
+
+def write_metrics_file():
+    path = os.getenv("KV_METRICS_FILE")
+    if not path:
+        return
+    try:
+        metrics.write_prometheus(path)
+    except OSError as e:
+        print(Fore.RED + f"Error writing metrics to {path}: {e}" + Style.RESET_ALL)
+
 def version_menu():
     while True:
         clear_screen()
@@ -221,6 +323,7 @@ def version_menu():
         print(Fore.GREEN + "1. " + Style.RESET_ALL + "Key Versions")
         print(Fore.GREEN + "2. " + Style.RESET_ALL + "Secret Versions")
         print(Fore.GREEN + "3. " + Style.RESET_ALL + "Certificate Versions")
+        print(Fore.GREEN + "4. " + Style.RESET_ALL + "Apply Retention Policies")
         print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -231,24 +334,54 @@ def version_menu():
             manage_secret_versions()
         elif choice == '3':
             manage_certificate_versions()
+        elif choice == '4':
+            retention_menu()
         elif choice == '0':
             return
         else:
             print(Fore.RED + "Invalid option." + Style.RESET_ALL)
             pause()
 
+def retention_menu():
+    clear_screen()
+    print_header("Retention Policies")
+    default_path = os.getenv("KV_RETENTION_FILE", "retention.json")
+    path = input(f"Policy file [{default_path}]: ").strip() or default_path
+    try:
+        policies = retention.load_policies(path)
+        print("Listing versions...")
+        plan, errors = retention.plan_retention(policies)
+    except Exception as e:
+        print(Fore.RED + f"Error evaluating retention policies: {e}" + Style.RESET_ALL)
+        pause()
+        return
+    retention.print_plan(plan, errors)
+    if plan:
+        confirm = input(Fore.RED + f"Apply {len(plan)} change(s)? (y/n): " + Style.RESET_ALL)
+        if confirm.lower() == 'y':
+            retention.apply_retention(plan)
+    pause()
+
+# How many more versions "Load more versions" shows; items can have thousands
+VERSIONS_PER_LOAD = 100
+
 def manage_key_versions():
     name = get_input_with_list("Enter key name: ", 'key')
     if not name: return
+    # The first draw lists the versions; redraws after an action use the version cache
+    count, refresh = get.VERSION_PAGE_SIZE, True
     while True:
         clear_screen()
         print_header(f"Versions for Key: {name}")
-        versions = get.list_key_versions(name)
+        versions, more = get.list_cached_versions('key', name, count, refresh)
+        refresh = False
         
         print(Fore.GREEN + "\nActions:" + Style.RESET_ALL)
         print("1. Enable/Disable Version")
         print("2. Create New Version (Rotate)")
         print("3. Disable all but newest one")
+        if more:
+            print("4. Load more versions")
         print("0. Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -287,21 +420,28 @@ def manage_key_versions():
         elif choice == '3':
             edit.disable_all_but_newest_key_version(name)
             pause()
+        elif choice == '4' and more:
+            count += VERSIONS_PER_LOAD
         elif choice == '0':
             break
 
 def manage_secret_versions():
     name = get_input_with_list("Enter secret name: ", 'secret')
     if not name: return
+    # The first draw lists the versions; redraws after an action use the version cache
+    count, refresh = get.VERSION_PAGE_SIZE, True
     while True:
         clear_screen()
         print_header(f"Versions for Secret: {name}")
-        versions = get.list_secret_versions(name)
+        versions, more = get.list_cached_versions('secret', name, count, refresh)
+        refresh = False
         
         print(Fore.GREEN + "\nActions:" + Style.RESET_ALL)
         print("1. Enable/Disable Version")
         print("2. Create New Version (Set Value)")
         print("3. Disable all but newest one")
+        if more:
+            print("4. Load more versions")
         print("0. Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -335,21 +475,28 @@ def manage_secret_versions():
         elif choice == '3':
             edit.disable_all_but_newest_secret_version(name)
             pause()
+        elif choice == '4' and more:
+            count += VERSIONS_PER_LOAD
         elif choice == '0':
             break
 
 def manage_certificate_versions():
     name = get_input_with_list("Enter certificate name: ", 'certificate')
     if not name: return
+    # The first draw lists the versions; redraws after an action use the version cache
+    count, refresh = get.VERSION_PAGE_SIZE, True
     while True:
         clear_screen()
         print_header(f"Versions for Certificate: {name}")
-        versions = get.list_certificate_versions(name)
+        versions, more = get.list_cached_versions('certificate', name, count, refresh)
+        refresh = False
         
         print(Fore.GREEN + "\nActions:" + Style.RESET_ALL)
         print("1. Enable/Disable Version")
         print("2. Create New Version (Renew)")
         print("3. Disable all but newest one")
+        if more:
+            print("4. Load more versions")
         print("0. Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -383,6 +530,8 @@ def manage_certificate_versions():
         elif choice == '3':
             edit.disable_all_but_newest_certificate_version(name)
             pause()
+        elif choice == '4' and more:
+            count += VERSIONS_PER_LOAD
         elif choice == '0':
             break
 
@@ -393,6 +542,8 @@ def list_menu():
         print(Fore.GREEN + "1. " + Style.RESET_ALL + "List Keys")
         print(Fore.GREEN + "2. " + Style.RESET_ALL + "List Secrets")
         print(Fore.GREEN + "3. " + Style.RESET_ALL + "List Certificates")
+        print(Fore.GREEN + "4. " + Style.RESET_ALL + "Search by Tag")
+        print(Fore.GREEN + "5. " + Style.RESET_ALL + "Expiring Items")
         print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -406,6 +557,22 @@ def list_menu():
         elif choice == '3':
             get.list_certificates()
             pause()
+        elif choice == '4':
+            print("Examples: owner=team-x AND env=prod | env!=prod | owner OR team=ops")
+            query = input("Tag query: ")
+            if query.strip():
+                tags.search_tags(query)
+            pause()
+        elif choice == '5':
+            try:
+                days = int(input(f"Days ahead [{expiry.DEFAULT_DAYS}]: ") or expiry.DEFAULT_DAYS)
+            except ValueError:
+                print("Invalid number of days.")
+                pause()
+                continue
+            versions = input("Include older versions? (y/n) [n]: ").lower() == 'y'
+            expiry.report_expiring(days, versions=versions)
+            pause()
         elif choice == '0':
             return
         else:
@@ -419,6 +586,7 @@ def create_menu():
         print(Fore.GREEN + "1. " + Style.RESET_ALL + "Create Key")
         print(Fore.GREEN + "2. " + Style.RESET_ALL + "Create Secret")
         print(Fore.GREEN + "3. " + Style.RESET_ALL + "Create Certificate")
+        print(Fore.GREEN + "4. " + Style.RESET_ALL + "Create Certificates from Manifest")
         print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
         
         choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
@@ -476,6 +644,11 @@ def create_menu():
             subject = input("Enter subject name (e.g. mycert): ")
             create.create_certificate(name, subject)
             pause()
+        elif choice == '4':
+            path = input("Manifest file (JSON): ").strip()
+            if path:
+                create.create_certificates_from_manifest(path)
+            pause()
         elif choice == '0':
             return
         else:
@@ -496,17 +669,17 @@ def delete_menu():
         if choice == '1':
             name = get_input_with_list("Enter key name: ", 'key')
             if name:
-                delete.delete_key(name)
+                delete.delete_key(name, wait=False)
                 pause()
         elif choice == '2':
             name = get_input_with_list("Enter secret name: ", 'secret')
             if name:
-                delete.delete_secret(name)
+                delete.delete_secret(name, wait=False)
                 pause()
         elif choice == '3':
             name = get_input_with_list("Enter certificate name: ", 'certificate')
             if name:
-                delete.delete_certificate(name)
+                delete.delete_certificate(name, wait=False)
                 pause()
         elif choice == '0':
             return
@@ -646,5 +819,224 @@ def edit_menu():
             print(Fore.RED + "Invalid option." + Style.RESET_ALL)
             pause()
 
+def parse_tag_pairs(text):
+    """
+    Parses 'a=1, b=2' into a dict. Returns None if a pair has no '='.
+    """
+    pairs = {}
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        key, sep, value = part.partition('=')
+        if not sep or not key.strip():
+            return None
+        pairs[key.strip()] = value.strip()
+    return pairs
+
+def bulk_menu():
+    while True:
+        clear_screen()
+        print_header("Bulk Operations")
+        print(Fore.GREEN + "1. " + Style.RESET_ALL + "Keys")
+        print(Fore.GREEN + "2. " + Style.RESET_ALL + "Secrets")
+        print(Fore.GREEN + "3. " + Style.RESET_ALL + "Certificates")
+        print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
+
+        choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if choice == '0':
+            return
+        item_type = {'1': 'key', '2': 'secret', '3': 'certificate'}.get(choice)
+        if not item_type:
+            print(Fore.RED + "Invalid option." + Style.RESET_ALL)
+            pause()
+            continue
+
+        patterns = get_input_with_list(f"Enter {item_type} names or patterns (comma separated, e.g. tmp-*): ", item_type)
+        if not patterns: continue
+        names = bulk.match_names(item_type, patterns.split(','))
+        if not names:
+            print("No matching items.")
+            pause()
+            continue
+
+        print(Fore.CYAN + f"\n{len(names)} {item_type}(s) selected:" + Style.RESET_ALL)
+        for name in names[:20]:
+            print(f"- {name}")
+        if len(names) > 20:
+            print(f"... and {len(names) - 20} more")
+
+        print(Fore.GREEN + "\nActions:" + Style.RESET_ALL)
+        print("1. Delete")
+        print("2. Enable")
+        print("3. Disable")
+        print("4. Delete and Purge")
+        print("5. Edit Tags")
+        print("0. Cancel")
+        action = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if action == '1':
+            confirm = input(Fore.RED + f"Delete {len(names)} {item_type}(s)? (y/n): " + Style.RESET_ALL)
+            if confirm.lower() == 'y':
+                bulk.bulk_delete(item_type, names)
+                pause()
+        elif action == '2':
+            bulk.bulk_set_enabled(item_type, names, True)
+            pause()
+        elif action == '3':
+            bulk.bulk_set_enabled(item_type, names, False)
+            pause()
+        elif action == '4':
+            confirm = input(Fore.RED + f"Delete and permanently purge {len(names)} {item_type}(s)? (y/n): " + Style.RESET_ALL)
+            if confirm.lower() == 'y':
+                deleted.delete_and_purge(item_type, names)
+                pause()
+        elif action == '5':
+            add = parse_tag_pairs(input("Tags to add or set (key=value, comma separated) [none]: "))
+            remove = [k.strip() for k in input("Tag keys to remove (comma separated) [none]: ").split(',') if k.strip()]
+            rename = parse_tag_pairs(input("Tag keys to rename (old=new, comma separated) [none]: "))
+            if add is None or rename is None:
+                print(Fore.RED + "Invalid format, expected key=value." + Style.RESET_ALL)
+            elif add or remove or rename:
+                bulk.bulk_edit_tags(item_type, names, add=add, remove=remove, rename=rename)
+            pause()
+
+def deleted_menu():
+    while True:
+        clear_screen()
+        print_header("Deleted Items")
+        print(Fore.GREEN + "1. " + Style.RESET_ALL + "Deleted Keys")
+        print(Fore.GREEN + "2. " + Style.RESET_ALL + "Deleted Secrets")
+        print(Fore.GREEN + "3. " + Style.RESET_ALL + "Deleted Certificates")
+        print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
+
+        choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if choice == '1':
+            manage_deleted('key', deleted.list_deleted_keys)
+        elif choice == '2':
+            manage_deleted('secret', deleted.list_deleted_secrets)
+        elif choice == '3':
+            manage_deleted('certificate', deleted.list_deleted_certificates)
+        elif choice == '0':
+            return
+        else:
+            print(Fore.RED + "Invalid option." + Style.RESET_ALL)
+            pause()
+
+def manage_deleted(item_type, list_deleted):
+    while True:
+        clear_screen()
+        print_header(f"Deleted {item_type.capitalize()}s")
+        items = list_deleted()
+
+        print(Fore.GREEN + "\nActions:" + Style.RESET_ALL)
+        print("1. Recover")
+        print("2. Purge (permanent)")
+        print("0. Back")
+
+        choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if choice == '0':
+            return
+        if choice not in ('1', '2'):
+            continue
+        if not items:
+            pause()
+            continue
+
+        print(Fore.YELLOW + "(Press Esc to go back)" + Style.RESET_ALL)
+        patterns = input_with_esc(f"Enter deleted {item_type} names or patterns (comma separated): ")
+        if not patterns: continue
+        names = bulk.match_names(item_type, patterns.split(','), candidates=[item.name for item in items])
+        if not names:
+            print("No matching items.")
+            pause()
+            continue
+
+        if choice == '1':
+            deleted.recover_deleted(item_type, names)
+        else:
+            confirm = input(Fore.RED + f"Permanently purge {len(names)} {item_type}(s)? (y/n): " + Style.RESET_ALL)
+            if confirm.lower() != 'y':
+                continue
+            deleted.purge_deleted(item_type, names)
+        pause()
+
+def backup_menu():
+    while True:
+        clear_screen()
+        print_header("Backup / Restore / Sync")
+        print(Fore.GREEN + "1. " + Style.RESET_ALL + "Backup Vault to Archive")
+        print(Fore.GREEN + "2. " + Style.RESET_ALL + "Restore from Archive (resumes if interrupted)")
+        print(Fore.GREEN + "3. " + Style.RESET_ALL + "Sync Secrets to Another Vault")
+        print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
+
+        choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if choice == '1':
+            default_path = f"kv-backup-{datetime.now():%Y%m%d-%H%M%S}.zip"
+            path = input(f"Archive path [{default_path}]: ") or default_path
+            backup.backup_vault(path)
+            pause()
+        elif choice == '2':
+            path = input("Archive path: ")
+            if not path: continue
+            backup.restore_vault(path)
+            pause()
+        elif choice == '3':
+            target_url = input("Target vault URL (e.g. https://other-vault.vault.azure.net/): ")
+            if not target_url: continue
+            source_url = auth.get_vault_url()
+            plan, _ = sync.sync_secrets(source_url, target_url, dry_run=True)
+            if plan and input(f"Apply {len(plan)} change(s) to {target_url}? (y/n): ").lower() == 'y':
+                sync.apply_secret_sync(source_url, target_url, plan)
+            pause()
+        elif choice == '0':
+            return
+        else:
+            print(Fore.RED + "Invalid option." + Style.RESET_ALL)
+            pause()
+
+def jobs_menu():
+    while True:
+        clear_screen()
+        print_header("Background Jobs")
+        all_jobs = jobs.list_jobs()
+        if not all_jobs:
+            print("No background jobs.")
+        for job in all_jobs:
+            color = {'running': Fore.YELLOW, 'succeeded': Fore.GREEN}.get(job.status, Fore.RED)
+            line = f"#{job.id} {job.description} | {color}{job.status}{Style.RESET_ALL} | Started: {job.started_on:%H:%M:%S}"
+            if job.error:
+                line += f" | Error: {job.error}"
+            print(line)
+
+        print(Fore.GREEN + "\n1. " + Style.RESET_ALL + "Refresh")
+        print(Fore.GREEN + "2. " + Style.RESET_ALL + "Clear finished jobs")
+        print(Fore.YELLOW + "0. " + Style.RESET_ALL + "Back")
+
+        choice = input(Fore.BLUE + "\nSelect an option: " + Style.RESET_ALL)
+
+        if choice == '2':
+            jobs.clear_finished()
+        elif choice == '0':
+            return
+
+def warm_start():
+    # Show the last known inventory immediately and re-list each item type when it is first opened
+    if snapshot.enable():
+        get.load_inventory_snapshot()
+    get.refresh_inventory_on_first_use()
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Subcommands run non-interactively: no screen clearing, colours or background refresh
+        from src import cli
+        sys.exit(cli.main(sys.argv[1:]))
+
+    # Initialize colorama
+    init(autoreset=True)
+    warm_start()
     main_menu()
@@ -0,0 +1,94 @@
+import os
+import weakref
+import asyncio
+from azure.identity.aio import ClientSecretCredential
+from azure.keyvault.keys.aio import KeyClient
+from azure.keyvault.secrets.aio import SecretClient
+from azure.keyvault.certificates.aio import CertificateClient
+from ..auth import get_vault_url, load_env, _overrides
+from ..scheduler import AsyncSchedulerPolicy
+from ..metrics import async_metrics_policy
+
+# Async clients own an aiohttp session, which is bound to the event loop that created it,
+# so the cache is kept per loop: one credential and one client per (vault URL, resource type).
+_loops = weakref.WeakKeyDictionary()
+
+def _get_loop_cache():
+    loop = asyncio.get_running_loop()
+    cache = _loops.get(loop)
+    if cache is None:
+        cache = {'credential': None, 'clients': {}}
+        _loops[loop] = cache
+    return cache
+
+class _ThreadedCredential:
+    """
+    Async wrapper around a sync credential set with auth.configure(), so one configure() call
+    serves both client flavours. get_token runs in a worker thread to keep the loop free.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    async def get_token(self, *scopes, **kwargs):
+        return await asyncio.to_thread(self._credential.get_token, *scopes, **kwargs)
+
+    async def close(self):
+        pass
+
+def get_credentials():
+    cache = _get_loop_cache()
+    if cache['credential'] is None:
+        override = _overrides['credential']
+        if override is not None:
+            if asyncio.iscoroutinefunction(getattr(override, 'get_token', None)):
+                return override
+            cache['credential'] = _ThreadedCredential(override)
+            return cache['credential']
+        load_env()
+        cache['credential'] = ClientSecretCredential(
+            tenant_id=os.getenv("AZURE_TENANT_ID"),
+            client_id=os.getenv("AZURE_CLIENT_ID"),
+            client_secret=os.getenv("AZURE_CLIENT_SECRET")
+        )
+    return cache['credential']
+
+def _get_client(resource_type, client_class, vault_url=None):
+    vault_url = get_vault_url(vault_url)
+    cache_key = (vault_url.rstrip('/').lower(), resource_type)
+    clients = _get_loop_cache()['clients']
+    client = clients.get(cache_key)
+    if client is None:
+        client = client_class(
+            vault_url=vault_url,
+            credential=get_credentials(),
+            per_retry_policies=[AsyncSchedulerPolicy(), async_metrics_policy()],
+            **_overrides['client_options']
+        )
+        clients[cache_key] = client
+    return client
+
+def get_key_client(vault_url=None):
+    return _get_client('key', KeyClient, vault_url)
+
+def get_secret_client(vault_url=None):
+    return _get_client('secret', SecretClient, vault_url)
+
+def get_certificate_client(vault_url=None):
+    return _get_client('certificate', CertificateClient, vault_url)
+
+async def close_clients():
+    """
+    Closes every client and the credential created on the running event loop.
+    """
+    cache = _loops.pop(asyncio.get_running_loop(), None)
+    if cache is None:
+        return
+    resources = list(cache['clients'].values())
+    if cache['credential'] is not None:
+        resources.append(cache['credential'])
+    for resource in resources:
+        try:
+            await resource.close()
+        except Exception:
+            pass
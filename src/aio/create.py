@@ -0,0 +1,52 @@
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from azure.keyvault.certificates import CertificatePolicy
+
+async def create_key(name, kty="RSA", size=None, curve=None, not_before=None, expires_on=None):
+    try:
+        client = get_key_client()
+        print(f"Creating key '{name}'...")
+
+        kwargs = {}
+        if size: kwargs['size'] = size
+        if curve: kwargs['curve'] = curve
+        if not_before: kwargs['not_before'] = not_before
+        if expires_on: kwargs['expires_on'] = expires_on
+
+        key = await client.create_key(name, kty, **kwargs)
+        print(f"Key '{key.name}' created successfully.")
+        return key
+    except Exception as e:
+        print(f"Error creating key: {e}")
+        return None
+
+async def create_secret(name, value):
+    try:
+        client = get_secret_client()
+        print(f"Creating secret '{name}'...")
+        secret = await client.set_secret(name, value)
+        print(f"Secret '{secret.name}' created successfully.")
+        return secret
+    except Exception as e:
+        print(f"Error creating secret: {e}")
+        return None
+
+async def create_certificate(name, subject_name):
+    try:
+        client = get_certificate_client()
+        print(f"Creating certificate '{name}'...")
+        policy = CertificatePolicy(
+            issuer_name="Self",
+            subject=f"CN={subject_name}",
+            key_type="RSA",
+            key_size=2048,
+            validity_in_months=12,
+            content_type="application/x-pkcs12"
+        )
+
+        # The async client polls the creation operation until it completes
+        result = await client.create_certificate(certificate_name=name, policy=policy)
+        print(f"Certificate '{name}' created.")
+        return result
+    except Exception as e:
+        print(f"Error creating certificate: {e}")
+        return None
@@ -0,0 +1,41 @@
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from azure.core.exceptions import HttpResponseError
+
+async def delete_key(name):
+    try:
+        client = get_key_client()
+        print(f"Deleting key '{name}'...")
+        deleted_key = await client.delete_key(name)
+        print(f"Key '{deleted_key.name}' deleted successfully.")
+        return deleted_key
+    except Exception as e:
+        print(f"Error deleting key: {e}")
+        return None
+
+async def delete_secret(name):
+    try:
+        client = get_secret_client()
+        print(f"Deleting secret '{name}'...")
+        deleted_secret = await client.delete_secret(name)
+        print(f"Secret '{deleted_secret.name}' deleted successfully.")
+        return deleted_secret
+    except HttpResponseError as e:
+        if "associated with a certificate" in str(e):
+            print(f"Error: Secret '{name}' is associated with a certificate. Please delete the certificate instead.")
+        else:
+            print(f"Error deleting secret: {e}")
+        return None
+    except Exception as e:
+        print(f"Error deleting secret: {e}")
+        return None
+
+async def delete_certificate(name):
+    try:
+        client = get_certificate_client()
+        print(f"Deleting certificate '{name}'...")
+        deleted_cert = await client.delete_certificate(name)
+        print(f"Certificate '{deleted_cert.name}' deleted successfully.")
+        return deleted_cert
+    except Exception as e:
+        print(f"Error deleting certificate: {e}")
+        return None
@@ -0,0 +1,193 @@
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from .executor import run_bounded
+from azure.core.exceptions import HttpResponseError
+
+async def update_key_properties(name, enabled=None, key_ops=None, not_before=None, expires_on=None):
+    try:
+        client = get_key_client()
+        print(f"Updating key '{name}'...")
+
+        kwargs = {}
+        if enabled is not None: kwargs['enabled'] = enabled
+        if key_ops is not None: kwargs['key_operations'] = key_ops
+        if not_before is not None: kwargs['not_before'] = not_before
+        if expires_on is not None: kwargs['expires_on'] = expires_on
+
+        key = await client.update_key_properties(name, **kwargs)
+        print(f"Key '{key.name}' updated successfully.")
+        return key
+    except Exception as e:
+        print(f"Error updating key: {e}")
+        return None
+
+async def update_key_tags(name, tags):
+    try:
+        client = get_key_client()
+        print(f"Fetching key '{name}' to get existing tags...")
+        key = await client.get_key(name)
+        current_tags = key.properties.tags or {}
+        current_tags.update(tags)
+
+        print(f"Updating key '{name}' tags...")
+        updated_key = await client.update_key_properties(name, tags=current_tags)
+        print(f"Key '{updated_key.name}' tags updated successfully.")
+        return updated_key
+    except Exception as e:
+        print(f"Error updating key tags: {e}")
+        return None
+
+async def update_secret_value(name, value, limit=None):
+    try:
+        client = get_secret_client()
+        print(f"Updating secret '{name}' (creating new version)...")
+        secret = await client.set_secret(name, value)
+        print(f"Secret '{secret.name}' updated successfully.")
+
+        print(f"Disabling older versions of secret '{name}'...")
+        old_versions = [
+            v.version async for v in client.list_properties_of_secret_versions(name)
+            if v.version != secret.properties.version and v.enabled
+        ]
+
+        async def disable(version):
+            await client.update_secret_properties(name, version=version, enabled=False)
+            print(f"Version {version} disabled.")
+
+        results = await run_bounded(disable, old_versions, limit)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            print(f"Error disabling {len(errors)} old version(s): {errors[0]}")
+        return secret
+    except Exception as e:
+        print(f"Error updating secret: {e}")
+        return None
+
+async def update_secret_tags(name, tags):
+    try:
+        client = get_secret_client()
+        print(f"Fetching secret '{name}' to get existing tags...")
+        secret = await client.get_secret(name)
+        current_tags = secret.properties.tags or {}
+        current_tags.update(tags)
+
+        print(f"Updating secret '{name}' tags...")
+        updated_secret = await client.update_secret_properties(name, tags=current_tags)
+        print(f"Secret '{updated_secret.name}' tags updated successfully.")
+        return updated_secret
+    except Exception as e:
+        print(f"Error updating secret tags: {e}")
+        return None
+
+async def update_certificate_tags(name, tags):
+    try:
+        client = get_certificate_client()
+        print(f"Fetching certificate '{name}' to get existing tags...")
+        cert = await client.get_certificate(certificate_name=name)
+        current_tags = cert.properties.tags or {}
+        current_tags.update(tags)
+
+        print(f"Updating certificate '{name}' tags...")
+        updated_cert = await client.update_certificate_properties(certificate_name=name, tags=current_tags)
+        print(f"Certificate '{updated_cert.name}' updated successfully.")
+        return updated_cert
+    except Exception as e:
+        print(f"Error updating certificate: {e}")
+        return None
+
+async def update_key_version_properties(name, version, enabled):
+    try:
+        client = get_key_client()
+        return await client.update_key_properties(name, version=version, enabled=enabled)
+    except HttpResponseError as e:
+        if "associated with a certificate" in str(e):
+            print(f"Error: Key '{name}' is associated with a certificate. Please manage the certificate versions instead.")
+        else:
+            print(f"Error updating key version: {e}")
+    except Exception as e:
+        print(f"Error updating key version: {e}")
+    return None
+
+async def update_secret_version_properties(name, version, enabled):
+    try:
+        client = get_secret_client()
+        return await client.update_secret_properties(name, version=version, enabled=enabled)
+    except HttpResponseError as e:
+        if "associated with a certificate" in str(e):
+            print(f"Error: Secret '{name}' is associated with a certificate. Please manage the certificate versions instead.")
+        else:
+            print(f"Error updating secret version: {e}")
+    except Exception as e:
+        print(f"Error updating secret version: {e}")
+    return None
+
+async def update_certificate_version_properties(name, version, enabled):
+    try:
+        client = get_certificate_client()
+        return await client.update_certificate_properties(certificate_name=name, version=version, enabled=enabled)
+    except Exception as e:
+        print(f"Error updating certificate version: {e}")
+    return None
+
+async def _disable_all_but_newest(label, versions, disable, limit):
+    if not versions:
+        print("No versions found.")
+        return []
+
+    versions.sort(key=lambda x: x.created_on, reverse=True)
+    newest = versions[0]
+    print(f"Newest version is {newest.version} (Created: {newest.created_on})")
+
+    to_disable = [v.version for v in versions[1:] if v.enabled]
+    results = await run_bounded(disable, to_disable, limit)
+    disabled = [version for version, result in zip(to_disable, results) if not isinstance(result, Exception)]
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        if any("associated with a certificate" in str(e) for e in errors):
+            print(f"Error: {label} is associated with a certificate. Please manage the certificate versions instead.")
+        else:
+            print(f"Error disabling {len(errors)} old version(s): {errors[0]}")
+    else:
+        print("All other versions disabled.")
+    return disabled
+
+async def disable_all_but_newest_key_version(name, limit=None):
+    try:
+        client = get_key_client()
+        print(f"Fetching versions for key '{name}'...")
+        versions = [v async for v in client.list_properties_of_key_versions(name)]
+
+        async def disable(version):
+            await client.update_key_properties(name, version=version, enabled=False)
+
+        return await _disable_all_but_newest(f"Key '{name}'", versions, disable, limit)
+    except Exception as e:
+        print(f"Error disabling old key versions: {e}")
+        return []
+
+async def disable_all_but_newest_secret_version(name, limit=None):
+    try:
+        client = get_secret_client()
+        print(f"Fetching versions for secret '{name}'...")
+        versions = [v async for v in client.list_properties_of_secret_versions(name)]
+
+        async def disable(version):
+            await client.update_secret_properties(name, version=version, enabled=False)
+
+        return await _disable_all_but_newest(f"Secret '{name}'", versions, disable, limit)
+    except Exception as e:
+        print(f"Error disabling old secret versions: {e}")
+        return []
+
+async def disable_all_but_newest_certificate_version(name, limit=None):
+    try:
+        client = get_certificate_client()
+        print(f"Fetching versions for certificate '{name}'...")
+        versions = [v async for v in client.list_properties_of_certificate_versions(certificate_name=name)]
+
+        async def disable(version):
+            await client.update_certificate_properties(certificate_name=name, version=version, enabled=False)
+
+        return await _disable_all_but_newest(f"Certificate '{name}'", versions, disable, limit)
+    except Exception as e:
+        print(f"Error disabling old certificate versions: {e}")
+        return []
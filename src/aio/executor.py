@@ -0,0 +1,34 @@
+import os
+import asyncio
+from .auth import close_clients
+from ..scheduler import priority, BULK
+
+DEFAULT_CONCURRENCY = int(os.getenv("KV_ASYNC_CONCURRENCY", "16"))
+
+async def run_bounded(func, items, limit=None):
+    """
+    Awaits func(item) for every item with at most `limit` calls in flight.
+    Results come back in input order; a failed call yields its exception instead of raising.
+    The calls run at bulk priority, behind interactive requests to the same vault.
+    """
+    semaphore = asyncio.Semaphore(limit or DEFAULT_CONCURRENCY)
+
+    async def run_one(item):
+        # Each task has its own context, so the bulk priority stays with these calls
+        with priority(BULK):
+            async with semaphore:
+                return await func(item)
+
+    return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+def run(coro):
+    """
+    Runs a coroutine from synchronous code and closes the async clients it opened.
+    """
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_clients()
+
+    return asyncio.run(runner())
@@ -0,0 +1,72 @@
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from .executor import run_bounded
+
+async def get_key(name):
+    try:
+        client = get_key_client()
+        return await client.get_key(name)
+    except Exception as e:
+        print(f"Error getting key: {e}")
+        return None
+
+async def get_all_keys():
+    try:
+        client = get_key_client()
+        return [key async for key in client.list_properties_of_keys()]
+    except Exception as e:
+        print(f"Error fetching keys: {e}")
+        return []
+
+async def get_all_secrets():
+    try:
+        client = get_secret_client()
+        return [secret async for secret in client.list_properties_of_secrets()]
+    except Exception as e:
+        print(f"Error fetching secrets: {e}")
+        return []
+
+async def get_all_certificates():
+    try:
+        client = get_certificate_client()
+        return [cert async for cert in client.list_properties_of_certificates()]
+    except Exception as e:
+        print(f"Error fetching certificates: {e}")
+        return []
+
+async def get_key_versions(name):
+    try:
+        client = get_key_client()
+        return [v async for v in client.list_properties_of_key_versions(name)]
+    except Exception as e:
+        print(f"Error listing key versions: {e}")
+        return []
+
+async def get_secret_versions(name):
+    try:
+        client = get_secret_client()
+        return [v async for v in client.list_properties_of_secret_versions(name)]
+    except Exception as e:
+        print(f"Error listing secret versions: {e}")
+        return []
+
+async def get_certificate_versions(name):
+    try:
+        client = get_certificate_client()
+        return [v async for v in client.list_properties_of_certificate_versions(name)]
+    except Exception as e:
+        print(f"Error listing certificate versions: {e}")
+        return []
+
+async def get_versions_of_many(item_type, names, limit=None):
+    """
+    Lists the versions of many items concurrently.
+    Returns a dict of name -> list of version properties.
+    """
+    fetchers = {
+        'key': get_key_versions,
+        'secret': get_secret_versions,
+        'certificate': get_certificate_versions,
+    }
+    names = list(names)
+    results = await run_bounded(fetchers[item_type], names, limit)
+    return {name: result for name, result in zip(names, results) if not isinstance(result, Exception)}
@@ -1,43 +1,140 @@
 import os
-from azure.identity import ClientSecretCredential
-from azure.keyvault.keys import KeyClient
-from azure.keyvault.secrets import SecretClient
-from azure.keyvault.certificates import CertificateClient
-from dotenv import load_dotenv
+import importlib
+import threading
 
-load_dotenv()
+# The SDKs are imported on first use instead of at import time, so the menu comes up without
+# loading azure.identity or any azure.keyvault package, and an operation on secrets never
+# pays for the keys or certificates SDK. The names stay patchable as module attributes.
+_LAZY_IMPORTS = {
+    'ClientSecretCredential': 'azure.identity',
+    'KeyClient': 'azure.keyvault.keys',
+    'SecretClient': 'azure.keyvault.secrets',
+    'CertificateClient': 'azure.keyvault.certificates',
+}
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def _lazy(name):
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
+_env_loaded = False
+
+def load_env():
+    """
+    Loads the .env file once, on the first call that needs configuration.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+# One credential per service principal and one client per (vault URL, resource type),
+# shared by every module for the lifetime of the process. The credential keeps its
+# token cache and only goes back to AAD when the token is close to expiry, and each
+# client keeps its HTTP connection pool warm between menu actions.
+_lock = threading.RLock()
+_credentials = {}
+_clients = {}
+# Set by configure(): a credential used instead of the service principal, and extra keyword
+# arguments for every client constructor
+_overrides = {'credential': None, 'client_options': {}}
 
 def get_credentials():
+    if _overrides['credential'] is not None:
+        return _overrides['credential']
+    load_env()
     tenant_id = os.getenv("AZURE_TENANT_ID")
     client_id = os.getenv("AZURE_CLIENT_ID")
     client_secret = os.getenv("AZURE_CLIENT_SECRET")
-    
+
     if not all([tenant_id, client_id, client_secret]):
         # Fallback or let the caller handle it, but for this script explicit check is good
         # However, DefaultAzureCredential could also be used if we wanted to be more flexible.
         # Given the user explicitly mentioned .env with these values, ClientSecretCredential is direct.
         pass
 
-    return ClientSecretCredential(
-        tenant_id=tenant_id,
-        client_id=client_id,
-        client_secret=client_secret
-    )
+    cache_key = (tenant_id, client_id)
+    with _lock:
+        credential = _credentials.get(cache_key)
+        if credential is None:
+            credential = _lazy('ClientSecretCredential')(
+                tenant_id=tenant_id,
+                client_id=client_id,
+                client_secret=client_secret
+            )
+            _credentials[cache_key] = credential
+        return credential
 
-def get_key_client():
-    vault_url = os.getenv("KEY_VAULT_URL")
+def get_vault_url(vault_url=None):
+    load_env()
+    vault_url = vault_url or os.getenv("KEY_VAULT_URL")
     if not vault_url:
         raise ValueError("Missing KEY_VAULT_URL in .env file")
-    return KeyClient(vault_url=vault_url, credential=get_credentials())
+    return vault_url
 
-def get_secret_client():
-    vault_url = os.getenv("KEY_VAULT_URL")
-    if not vault_url:
-        raise ValueError("Missing KEY_VAULT_URL in .env file")
-    return SecretClient(vault_url=vault_url, credential=get_credentials())
+def _get_client(resource_type, client_class_name, vault_url=None):
+    vault_url = get_vault_url(vault_url)
+    cache_key = (vault_url.rstrip('/').lower(), resource_type)
+    with _lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            # Imported here: the scheduler pulls in the azure.core pipeline, which startup does not need
+            from .scheduler import SchedulerPolicy
+            from .metrics import metrics_policy
+            client = _lazy(client_class_name)(
+                vault_url=vault_url,
+                credential=get_credentials(),
+                # Metrics are taken after the scheduler's wait, so they time the vault alone
+                per_retry_policies=[SchedulerPolicy(), metrics_policy()],
+                **_overrides['client_options']
+            )
+            _clients[cache_key] = client
+        return client
 
-def get_certificate_client():
-    vault_url = os.getenv("KEY_VAULT_URL")
-    if not vault_url:
-        raise ValueError("Missing KEY_VAULT_URL in .env file")
-    return CertificateClient(vault_url=vault_url, credential=get_credentials())
+def get_key_client(vault_url=None):
+    return _get_client('key', 'KeyClient', vault_url)
+
+def get_secret_client(vault_url=None):
+    return _get_client('secret', 'SecretClient', vault_url)
+
+def get_certificate_client(vault_url=None):
+    return _get_client('certificate', 'CertificateClient', vault_url)
+
+def reset_clients():
+    """
+    Drops every cached client and credential so the next call builds fresh ones.
+    Use after changing credentials or KEY_VAULT_URL at runtime.
+    """
+    with _lock:
+        clients = list(_clients.values())
+        credentials = list(_credentials.values())
+        _clients.clear()
+        _credentials.clear()
+
+    for resource in clients + credentials:
+        try:
+            resource.close()
+        except Exception:
+            pass
+
+def configure(credential=None, **client_options):
+    """
+    Builds every client from now on with `credential` instead of the service principal in .env,
+    and passes client_options (e.g. connection_verify, verify_challenge_resource=False) to each client
+    constructor. Meant for local endpoints such as the benchmark stub vault. The async clients
+    (src/aio) use the same overrides, so client_options must suit both: pass connection settings
+    rather than a transport instance. A sync credential is called from a worker thread there.
+    configure() with no arguments restores the defaults. Drops the cached clients.
+    """
+    reset_clients()
+    with _lock:
+        _overrides['credential'] = credential
+        _overrides['client_options'] = dict(client_options)
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import hashlib
+import zipfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .auth import get_key_client, get_secret_client, get_certificate_client, get_vault_url
+from .get import get_inventory, invalidate_inventory
+from .workers import call_in_bulk, DEFAULT_WORKERS
+from .metrics import instrumented
+
+# Archive layout: one zip (deflate) holding a "<type>/<name>.bak" entry per backup blob and an
+# index.json describing them. Restore records finished entries in "<archive>.checkpoint" so an
+# interrupted run can pick up where it stopped.
+INDEX_NAME = "index.json"
+ITEM_TYPES = ('key', 'secret', 'certificate')
+
+def _backup_key(name):
+    return get_key_client().backup_key(name)
+
+def _backup_secret(name):
+    return get_secret_client().backup_secret(name)
+
+def _backup_certificate(name):
+    return get_certificate_client().backup_certificate(name)
+
+def _restore_key(blob):
+    return get_key_client().restore_key_backup(blob)
+
+def _restore_secret(blob):
+    return get_secret_client().restore_secret_backup(blob)
+
+def _restore_certificate(blob):
+    return get_certificate_client().restore_certificate_backup(blob)
+
+_backupers = {'key': _backup_key, 'secret': _backup_secret, 'certificate': _backup_certificate}
+_restorers = {'key': _restore_key, 'secret': _restore_secret, 'certificate': _restore_certificate}
+
+def _progress(label, done, total):
+    sys.stdout.write(f"\r{label}: {done}/{total}")
+    sys.stdout.flush()
+    if done == total:
+        sys.stdout.write("\n")
+
+@instrumented('vault')
+def backup_vault(path, item_types=ITEM_TYPES, max_workers=None):
+    """
+    Backs up every item of the given types into a single zip archive at `path`. Keys and secrets
+    backing a certificate are skipped: the certificate's backup carries them. Blobs are written
+    to the archive as soon as each backup call returns, and no reference to them is kept after.
+    Returns (index entries written, errors); errors are {'type', 'name', 'error'} dicts, one per
+    item that could not be backed up, or a single entry naming the archive when the backup failed.
+    """
+    try:
+        work = []
+        for item_type in item_types:
+            work.extend((item_type, item.name) for item in get_inventory(item_type, refresh=True)
+                        if not getattr(item, 'managed', False))
+
+        index = []
+        failures = []
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS) as pool:
+                futures = {
+                    pool.submit(call_in_bulk, _backupers[item_type], name): (item_type, name)
+                    for item_type, name in work
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    # A finished future holds its blob, so it is dropped once the blob is written
+                    item_type, name = futures.pop(future)
+                    try:
+                        blob = future.result()
+                    except Exception as e:
+                        failures.append((item_type, name, e))
+                    else:
+                        entry = f"{item_type}/{name}.bak"
+                        archive.writestr(entry, blob)
+                        index.append({
+                            'type': item_type,
+                            'name': name,
+                            'entry': entry,
+                            'size': len(blob),
+                            'sha256': hashlib.sha256(blob).hexdigest(),
+                        })
+                    _progress("Backed up", done, len(work))
+
+            archive.writestr(INDEX_NAME, json.dumps({
+                'vault': get_vault_url(),
+                'created_on': datetime.now().isoformat(),
+                'items': index,
+            }, indent=2))
+
+        for item_type, name, e in failures:
+            print(f"Error backing up {item_type} '{name}': {e}")
+        print(f"Backup written to '{path}': {len(index)} item(s), {len(failures)} failure(s).")
+        return index, [{'type': item_type, 'name': name, 'error': str(e)} for item_type, name, e in failures]
+    except Exception as e:
+        print(f"Error creating backup: {e}")
+        return [], [{'type': None, 'name': path, 'error': str(e)}]
+
+def _read_checkpoint(checkpoint_path):
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path) as f:
+        return {line.strip() for line in f if line.strip()}
+
+@instrumented('vault')
+def restore_vault(path, item_types=ITEM_TYPES, max_workers=None, checkpoint_path=None):
+    """
+    Restores the items in a backup archive, uploading in parallel.
+    Entries already listed in the checkpoint file are skipped; the checkpoint is removed
+    once every entry has been restored. Returns (entries restored in this run, errors) with errors
+    as in backup_vault.
+    """
+    checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+    try:
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read(INDEX_NAME))
+            completed = _read_checkpoint(checkpoint_path)
+            pending = [
+                item for item in index['items']
+                if item['type'] in item_types and item['entry'] not in completed
+            ]
+            if completed:
+                print(f"Resuming restore: {len(completed)} item(s) already done, {len(pending)} remaining.")
+
+            read_lock = threading.Lock()
+
+            def restore(item):
+                with read_lock:
+                    blob = archive.read(item['entry'])
+                return call_in_bulk(_restorers[item['type']], blob)
+
+            restored = []
+            failures = []
+            with open(checkpoint_path, 'a') as checkpoint:
+                with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS) as pool:
+                    futures = {pool.submit(restore, item): item for item in pending}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        item = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            failures.append((item, e))
+                        else:
+                            restored.append(item['entry'])
+                            checkpoint.write(item['entry'] + "\n")
+                            checkpoint.flush()
+                        _progress("Restored", done, len(pending))
+
+        for item_type in item_types:
+            invalidate_inventory(item_type)
+        for item, e in failures:
+            print(f"Error restoring {item['type']} '{item['name']}': {e}")
+        if not failures:
+            os.remove(checkpoint_path)
+        print(f"Restore finished: {len(restored)} item(s) restored, {len(failures)} failure(s).")
+        return restored, [{'type': item['type'], 'name': item['name'], 'error': str(e)} for item, e in failures]
+    except Exception as e:
+        print(f"Error restoring backup: {e}")
+        return [], [{'type': None, 'name': path, 'error': str(e)}]
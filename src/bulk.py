@@ -0,0 +1,171 @@
+import fnmatch
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from .get import WRITE_MAX_AGE, get_inventory, get_recent_inventory, invalidate_inventory, patch_inventory_item
+from .workers import run_parallel, call_with_retry
+from .metrics import instrumented
+
+LABELS = {'key': 'Key', 'secret': 'Secret', 'certificate': 'Certificate'}
+
+def wait_for_operation(begin, name):
+    """
+    Starts a delete or recover with begin(name) and waits for its poller. Only the request is
+    retried: once the vault has accepted it, sending it again gets 409 Conflict, so a throttled
+    poll fails this item instead of re-sending the request. Run it with retry=False.
+    """
+    poller = call_with_retry(begin, name)
+    poller.wait()
+    return poller.result()
+
+def _delete_key(name):
+    return wait_for_operation(get_key_client().begin_delete_key, name)
+
+def _delete_secret(name):
+    return wait_for_operation(get_secret_client().begin_delete_secret, name)
+
+def _delete_certificate(name):
+    return wait_for_operation(get_certificate_client().begin_delete_certificate, name)
+
+def _set_key_enabled(name, enabled):
+    return get_key_client().update_key_properties(name, enabled=enabled)
+
+def _set_secret_enabled(name, enabled):
+    return get_secret_client().update_secret_properties(name, enabled=enabled)
+
+def _set_certificate_enabled(name, enabled):
+    return get_certificate_client().update_certificate_properties(certificate_name=name, enabled=enabled)
+
+def _set_key_tags(name, tags):
+    return get_key_client().update_key_properties(name, tags=tags).properties
+
+def _set_secret_tags(name, tags):
+    return get_secret_client().update_secret_properties(name, tags=tags)
+
+def _set_certificate_tags(name, tags):
+    return get_certificate_client().update_certificate_properties(certificate_name=name, tags=tags).properties
+
+_deleters = {'key': _delete_key, 'secret': _delete_secret, 'certificate': _delete_certificate}
+_enablers = {'key': _set_key_enabled, 'secret': _set_secret_enabled, 'certificate': _set_certificate_enabled}
+_taggers = {'key': _set_key_tags, 'secret': _set_secret_tags, 'certificate': _set_certificate_tags}
+
+def delete_item(item_type, name):
+    """
+    Deletes one item and waits for the delete poller to finish. Throttled delete requests are
+    retried here, so callers on the worker pool run it with retry=False.
+    """
+    return _deleters[item_type](name)
+
+def match_names(item_type, patterns, candidates=None):
+    """
+    Resolves names and glob patterns (e.g. 'tmp-*') against the inventory, or against
+    `candidates` when given. Plain names are kept as given; patterns are matched
+    case-insensitively, like Key Vault names.
+    """
+    names = list(candidates) if candidates is not None else None
+    matched = []
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if any(c in pattern for c in '*?['):
+            if names is None:
+                names = [item.name for item in get_inventory(item_type)]
+            matched.extend(name for name in names if fnmatch.fnmatch(name.lower(), pattern.lower()))
+        else:
+            matched.append(pattern)
+    return list(dict.fromkeys(matched))
+
+def run_for_each(item_type, names, func, done_message, max_workers=None, retry=True):
+    """
+    Runs func(name) for every name on the worker pool, printing one line per item and a total.
+    retry is passed to run_parallel. Returns a summary with one {'name', 'status', 'error'} dict
+    per item.
+    """
+    summary = []
+    label = LABELS[item_type]
+    for name, _, error in run_parallel(func, names, max_workers, retry=retry):
+        if error is None:
+            print(f"{label} '{name}' {done_message}.")
+            summary.append({'name': name, 'status': 'ok', 'error': None})
+        else:
+            if "associated with a certificate" in str(error):
+                print(f"Error: {label} '{name}' is associated with a certificate. Please manage the certificate instead.")
+            else:
+                print(f"Error processing {item_type} '{name}': {error}")
+            summary.append({'name': name, 'status': 'failed', 'error': str(error)})
+    invalidate_inventory(item_type)
+    ok = sum(1 for r in summary if r['status'] == 'ok')
+    print(f"{ok} of {len(summary)} {item_type}(s) {done_message}.")
+    return summary
+
+@instrumented()
+def bulk_delete(item_type, names, max_workers=None):
+    """
+    Deletes every named item; the delete pollers run in parallel.
+    """
+    return run_for_each(item_type, names, _deleters[item_type], "deleted", max_workers, retry=False)
+
+@instrumented()
+def bulk_set_enabled(item_type, names, enabled, max_workers=None):
+    setter = _enablers[item_type]
+    return run_for_each(
+        item_type, names, lambda name: setter(name, enabled),
+        "enabled" if enabled else "disabled", max_workers
+    )
+
+def merge_tags(tags, add=None, remove=None, rename=None):
+    """
+    Returns a new tag dict: renames ({old: new}) first, then removals, then additions.
+    """
+    tags = dict(tags or {})
+    for old, new in (rename or {}).items():
+        if old in tags:
+            tags[new] = tags.pop(old)
+    for key in remove or ():
+        tags.pop(key, None)
+    tags.update(add or {})
+    return tags
+
+@instrumented()
+def bulk_edit_tags(item_type, names, add=None, remove=None, rename=None, max_workers=None):
+    """
+    Adds, removes and renames tags on many items concurrently. The new tags are computed from
+    the listed properties (no get_* call, so no secret value is ever downloaded) and items
+    whose tags would not change are skipped. The inventory is re-listed first unless it was filled
+    within get.WRITE_MAX_AGE seconds. Successful updates are patched into the cached
+    inventory. Returns a summary with one {'name', 'status', 'error'} dict per item, where
+    status is 'ok', 'unchanged' or 'failed'.
+    """
+    label = LABELS[item_type]
+    # The whole tag set is written back, so it must be computed from current properties
+    listed = {item.name.lower(): item for item in get_recent_inventory(item_type, WRITE_MAX_AGE)}
+    if any(name.lower() not in listed for name in names):
+        listed = {item.name.lower(): item for item in get_inventory(item_type, refresh=True)}
+
+    results = {}
+    changes = {}
+    for name in names:
+        props = listed.get(name.lower())
+        if props is None:
+            print(f"Error processing {item_type} '{name}': not found")
+            results[name] = {'name': name, 'status': 'failed', 'error': "not found"}
+            continue
+        new_tags = merge_tags(props.tags, add, remove, rename)
+        if new_tags == (props.tags or {}):
+            results[name] = {'name': name, 'status': 'unchanged', 'error': None}
+        else:
+            changes[name] = new_tags
+
+    setter = _taggers[item_type]
+    for name, props, error in run_parallel(lambda name: setter(name, changes[name]), list(changes), max_workers):
+        if error is None:
+            patch_inventory_item(item_type, props)
+            print(f"{label} '{name}' tags updated.")
+            results[name] = {'name': name, 'status': 'ok', 'error': None}
+        else:
+            print(f"Error processing {item_type} '{name}': {error}")
+            results[name] = {'name': name, 'status': 'failed', 'error': str(error)}
+
+    summary = [results[name] for name in dict.fromkeys(names)]
+    counts = {status: sum(1 for r in summary if r['status'] == status) for status in ('ok', 'unchanged', 'failed')}
+    print(f"Tags updated on {counts['ok']} {item_type}(s); {counts['unchanged']} already up to date, {counts['failed']} failed.")
+    return summary
@@ -0,0 +1,278 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+from datetime import datetime
+from . import get, create, edit, bulk, deleted, backup, sync, tags, metrics, retention, expiry
+from .auth import get_vault_url
+
+# Non-interactive entry point: `python main.py <type> <command> [args] [--json]`.
+# With --json, the human-readable progress of the src modules goes to stderr and
+# stdout only carries the JSON document, so the output can be piped into other tools.
+ITEM_TYPES = ('key', 'secret', 'certificate')
+PROPERTY_FIELDS = ('name', 'id', 'version', 'enabled', 'created_on', 'updated_on',
+                   'expires_on', 'not_before', 'content_type', 'tags')
+
+_set_version_enabled = {
+    'key': edit.update_key_version_properties,
+    'secret': edit.update_secret_version_properties,
+    'certificate': edit.update_certificate_version_properties,
+}
+
+def properties_to_dict(props):
+    result = {}
+    for field in PROPERTY_FIELDS:
+        value = getattr(props, field, None)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        result[field] = value
+    return result
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Azure Key Vault management. Run without arguments for the interactive menu."
+    )
+    parser.add_argument('--json', action='store_true', help="emit machine-readable JSON on stdout")
+    parser.add_argument('--stats', action='store_true', help="print operation statistics to stderr when done")
+    parser.add_argument('--metrics-file', metavar='PATH', default=os.getenv("KV_METRICS_FILE"),
+                        help="write metrics in Prometheus text format to PATH when done (default: $KV_METRICS_FILE)")
+    # --json is accepted after the subcommand too (`main.py secret list --json`)
+    json_flag = argparse.ArgumentParser(add_help=False)
+    json_flag.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                           help="emit machine-readable JSON on stdout")
+    commands = parser.add_subparsers(dest='item_type', required=True)
+
+    for item_type in ITEM_TYPES:
+        type_parser = commands.add_parser(item_type, parents=[json_flag], help=f"{item_type} operations")
+        actions = type_parser.add_subparsers(dest='command', required=True)
+
+        list_parser = actions.add_parser('list', parents=[json_flag], help=f"list {item_type}s, streaming page by page")
+        list_parser.add_argument('--page-size', type=int, help="items per request to the vault (max 25)")
+        list_parser.add_argument('--limit', type=int, help="stop after this many items and print a continuation token")
+        list_parser.add_argument('--continuation-token', help="resume a listing stopped by --limit")
+
+        show = actions.add_parser('show', parents=[json_flag], help=f"show the properties of a {item_type}")
+        show.add_argument('name')
+
+        versions = actions.add_parser('versions', parents=[json_flag], help=f"list the versions of a {item_type}")
+        versions.add_argument('name')
+
+        disable_old = actions.add_parser('disable-old', parents=[json_flag], help="disable all but the newest version")
+        disable_old.add_argument('name')
+
+        for command in ('enable', 'disable'):
+            toggle = actions.add_parser(command, parents=[json_flag], help=f"{command} {item_type}s by name or glob pattern")
+            toggle.add_argument('names', nargs='+')
+            toggle.add_argument('--version', help="only change this version (single name)")
+
+        tag = actions.add_parser('tag', parents=[json_flag], help=f"add, remove or rename tags on {item_type}s by name or glob pattern")
+        tag.add_argument('names', nargs='+')
+        tag.add_argument('--add', action='append', default=[], metavar='KEY=VALUE', help="set a tag (repeatable)")
+        tag.add_argument('--remove', action='append', default=[], metavar='KEY', help="remove a tag (repeatable)")
+        tag.add_argument('--rename', action='append', default=[], metavar='OLD=NEW', help="rename a tag key (repeatable)")
+
+        if item_type == 'certificate':
+            batch = actions.add_parser('create-batch', parents=[json_flag],
+                                       help="create certificates from a JSON manifest and wait for issuance")
+            batch.add_argument('manifest')
+            batch.add_argument('--timeout', type=float, default=create.BATCH_TIMEOUT,
+                               help=f"seconds to wait for issuance (default {create.BATCH_TIMEOUT})")
+
+        remove = actions.add_parser('delete', parents=[json_flag], help=f"delete {item_type}s by name or glob pattern")
+        remove.add_argument('names', nargs='+')
+        remove.add_argument('--purge', action='store_true', help="purge right after deleting")
+
+    backup_parser = commands.add_parser('backup', parents=[json_flag], help="back up the vault to a zip archive")
+    backup_parser.add_argument('path')
+
+    restore_parser = commands.add_parser('restore', parents=[json_flag], help="restore (or resume restoring) a backup archive")
+    restore_parser.add_argument('path')
+
+    tags_parser = commands.add_parser('search-tags', parents=[json_flag], help="find items by tag, e.g. 'owner=team-x AND env=prod'")
+    tags_parser.add_argument('query')
+    tags_parser.add_argument('--type', choices=ITEM_TYPES, action='append', dest='types',
+                             help="only search this item type (repeatable)")
+
+    sync_parser = commands.add_parser('sync-secrets', parents=[json_flag], help="copy secret differences to another vault")
+    sync_parser.add_argument('target_url')
+    sync_parser.add_argument('--dry-run', action='store_true')
+
+    retention_parser = commands.add_parser('retention', parents=[json_flag], help="apply version retention policies from a JSON file")
+    retention_parser.add_argument('config')
+    retention_parser.add_argument('--dry-run', action='store_true', help="only print the plan")
+    retention_parser.add_argument('--type', choices=ITEM_TYPES, action='append', dest='types',
+                                  help="only apply to this item type (repeatable)")
+
+    expiring_parser = commands.add_parser('expiring', parents=[json_flag],
+                                          help="report items expiring within N days; exits 1 when any are found, 2 when the scan had errors")
+    expiring_parser.add_argument('--days', type=int, default=expiry.DEFAULT_DAYS, help=f"window in days (default {expiry.DEFAULT_DAYS})")
+    expiring_parser.add_argument('--type', choices=ITEM_TYPES, action='append', dest='types',
+                                 help="only scan this item type (repeatable)")
+    expiring_parser.add_argument('--versions', action='store_true', help="scan every version, not only the current one")
+    expiring_parser.add_argument('--include-disabled', action='store_true', help="report disabled items and versions too")
+
+    return parser
+
+def _pairs(values, flag):
+    pairs = {}
+    for value in values:
+        key, sep, rest = value.partition('=')
+        if not sep or not key:
+            raise ValueError(f"{flag} expects KEY=VALUE, got '{value}'")
+        pairs[key] = rest
+    return pairs
+
+def _summary_ok(summary):
+    return all(r['status'] != 'failed' for r in summary)
+
+def _list(args):
+    pages = get.iter_pages(args.item_type, args.page_size, args.limit, args.continuation_token)
+    if not args.json:
+        resume_token = None
+        for items, resume_token in pages:
+            for item in items:
+                print(f"Name: {item.name} | Enabled: {item.enabled} | Created: {item.created_on}")
+        if resume_token:
+            print(f"Continuation token: {resume_token}")
+        return None
+
+    items = []
+    resume_token = None
+    for page, resume_token in pages:
+        items.extend(properties_to_dict(item) for item in page)
+    # A paged request gets the token alongside the items; a full listing stays a plain array
+    if args.limit is not None or args.continuation_token:
+        return {'items': items, 'continuation_token': resume_token}
+    return items
+
+def run(args):
+    """
+    Executes a parsed command. Returns (payload, exit_code); payload is what --json prints.
+    """
+    item_type = args.item_type
+
+    if item_type == 'backup':
+        index, errors = backup.backup_vault(args.path)
+        return {'items': index, 'errors': errors}, 1 if errors else 0
+    if item_type == 'restore':
+        restored, errors = backup.restore_vault(args.path)
+        return {'items': restored, 'errors': errors}, 1 if errors else 0
+    if item_type == 'search-tags':
+        results = tags.find_by_tags(args.query, tuple(args.types or ITEM_TYPES))
+        if not args.json:
+            for result_type, name, item_tags in results:
+                print(f"{result_type}\t{name}\t" + ", ".join(f"{k}={v}" for k, v in sorted(item_tags.items())))
+        return [{'type': t, 'name': n, 'tags': tg} for t, n, tg in results], 0
+    if item_type == 'sync-secrets':
+        plan, errors = sync.sync_secrets(get_vault_url(), args.target_url, dry_run=args.dry_run)
+        plan = [{k: v for k, v in item.items() if k != 'source'} for item in plan]
+        return {'plan': plan, 'errors': errors}, 1 if errors else 0
+    if item_type == 'expiring':
+        entries, errors = expiry.report_expiring(args.days, tuple(args.types or ITEM_TYPES), args.versions, args.include_disabled)
+        # 2 means the scan was incomplete, 1 that something expires; alerts can tell them apart
+        return {'items': entries, 'errors': errors}, 2 if errors else 1 if entries else 0
+    if item_type == 'retention':
+        changes, errors = retention.apply_retention_file(args.config, dry_run=args.dry_run, item_types=tuple(args.types or ITEM_TYPES))
+        return {'changes': changes, 'errors': errors}, 0 if _summary_ok(changes) and not errors else 1
+
+    command = args.command
+    if command == 'list':
+        return _list(args), 0
+
+    if command == 'show':
+        matches = [item for item in get.get_inventory(item_type) if item.name.lower() == args.name.lower()]
+        if not matches:
+            print(f"{item_type.capitalize()} '{args.name}' not found.")
+            return None, 1
+        props = properties_to_dict(matches[0])
+        if not args.json:
+            for field, value in props.items():
+                print(f"{field}: {value}")
+        return props, 0
+
+    if command == 'versions':
+        try:
+            versions = get.print_versions(item_type, args.name)
+        except Exception as e:
+            print(f"Error listing {item_type} versions: {e}")
+            return None, 1
+        return [properties_to_dict(v) for v in versions], 0
+
+    if command == 'disable-old':
+        try:
+            summary = edit.disable_old_versions(item_type, args.name)
+        except Exception as e:
+            print(f"Error disabling old {item_type} versions: {e}")
+            return None, 1
+        return summary, 0 if _summary_ok(summary) else 1
+
+    if command in ('enable', 'disable'):
+        enabled = command == 'enable'
+        if args.version:
+            if len(args.names) != 1:
+                print("--version needs exactly one name.")
+                return None, 2
+            props = _set_version_enabled[item_type](args.names[0], args.version, enabled)
+            return (properties_to_dict(props) if props else None), 0 if props else 1
+        names = bulk.match_names(item_type, args.names)
+        summary = bulk.bulk_set_enabled(item_type, names, enabled)
+        return summary, 0 if _summary_ok(summary) else 1
+
+    if command == 'tag':
+        add, rename = _pairs(args.add, '--add'), _pairs(args.rename, '--rename')
+        if not (add or args.remove or rename):
+            print("Nothing to do: pass --add, --remove or --rename.")
+            return None, 2
+        names = bulk.match_names(item_type, args.names)
+        summary = bulk.bulk_edit_tags(item_type, names, add=add, remove=args.remove, rename=rename)
+        return summary, 0 if _summary_ok(summary) else 1
+
+    if command == 'create-batch':
+        results = create.create_certificates_from_manifest(args.manifest, args.timeout)
+        if results is None:
+            return None, 1
+        return results, 0 if all(r['status'] == 'issued' for r in results) else 1
+
+    if command == 'delete':
+        names = bulk.match_names(item_type, args.names)
+        if args.purge:
+            summary = deleted.delete_and_purge(item_type, names)
+        else:
+            summary = bulk.bulk_delete(item_type, names)
+        return summary, 0 if _summary_ok(summary) else 1
+
+    return None, 2
+
+def _emit_metrics(args):
+    if args.stats:
+        metrics.report(file=sys.stderr)
+    if args.metrics_file:
+        try:
+            metrics.write_prometheus(args.metrics_file)
+        except OSError as e:
+            print(f"Error writing metrics to {args.metrics_file}: {e}", file=sys.stderr)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # In JSON mode the modules' progress messages must not mix with the document on stdout
+    output = sys.stdout
+    redirect = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    try:
+        with redirect:
+            payload, code = run(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        _emit_metrics(args)
+    if args.json:
+        json.dump(payload, output, indent=2, default=_json_default)
+        output.write("\n")
+    return code
@@ -1,6 +1,33 @@
+import json
+import time
 from .auth import get_key_client, get_secret_client, get_certificate_client
-from azure.keyvault.certificates import CertificatePolicy
+from .get import invalidate_inventory, add_version, invalidate_versions
+from .workers import run_parallel
+from . import jobs
+from .metrics import instrumented
 
+# Policy fields a certificate manifest may override, mapped to CertificatePolicy arguments
+POLICY_OVERRIDES = {
+    'issuer': 'issuer_name', 'key_type': 'key_type', 'key_size': 'key_size', 'curve': 'key_curve_name',
+    'validity_months': 'validity_in_months', 'content_type': 'content_type', 'exportable': 'exportable',
+    'reuse_key': 'reuse_key', 'san_dns_names': 'san_dns_names', 'san_emails': 'san_emails',
+}
+MANIFEST_FIELDS = ('name', 'subject', 'policy', 'tags', 'enabled')
+# Batch creation polls each pending operation on its own schedule: soon after it starts, then
+# less and less often, so a large batch of slow issuances does not flood the vault with polls
+INITIAL_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+BATCH_TIMEOUT = 900
+
+def _certificate_done(job, name):
+    # The new version only exists once the operation completes, so it is read on the next listing
+    if job.status != 'succeeded':
+        return
+    invalidate_inventory('certificate')
+    invalidate_versions('certificate', name)
+
+@instrumented('key')
 def create_key(name, kty="RSA", size=None, curve=None, not_before=None, expires_on=None):
     try:
         client = get_key_client()
@@ -13,6 +40,8 @@ def create_key(name, kty="RSA", size=None, curve=None, not_before=None, expires_
         if expires_on: kwargs['expires_on'] = expires_on
 
         key = client.create_key(name, kty, **kwargs)
+        invalidate_inventory('key')
+        add_version('key', name, key.properties)
         
         print(f"Key '{key.name}' created successfully.")
         print(f"  ID: {key.id}")
@@ -25,31 +54,204 @@ def create_key(name, kty="RSA", size=None, curve=None, not_before=None, expires_
     except Exception as e:
         print(f"Error creating key: {e}")
 
+@instrumented('secret')
 def create_secret(name, value):
     try:
         client = get_secret_client()
         print(f"Creating secret '{name}'...")
         secret = client.set_secret(name, value)
+        invalidate_inventory('secret')
+        add_version('secret', name, secret.properties)
         print(f"Secret '{secret.name}' created successfully.")
     except Exception as e:
         print(f"Error creating secret: {e}")
 
+@instrumented('certificate')
 def create_certificate(name, subject_name):
     try:
         client = get_certificate_client()
         print(f"Creating certificate '{name}'...")
-        # Create a policy with standard defaults
-        policy = CertificatePolicy(
-            issuer_name="Self",
-            subject=f"CN={subject_name}",
-            key_type="RSA",
-            key_size=2048,
-            validity_in_months=12,
-            content_type="application/x-pkcs12"
-        )
-        
+        policy = certificate_policy(subject_name)
         operation = client.begin_create_certificate(certificate_name=name, policy=policy)
-        print(f"Certificate creation started for '{name}'. This might take a moment.")
-        # operation.wait() # Optional: wait for completion
+        invalidate_inventory('certificate')
+        job = jobs.submit(f"Create certificate '{name}'", operation, on_done=lambda job: _certificate_done(job, name))
+        print(f"Certificate creation started for '{name}' (job #{job.id}). This might take a moment.")
+        return job
     except Exception as e:
         print(f"Error creating certificate: {e}")
+        return None
+
+def certificate_policy(subject, **overrides):
+    """
+    Returns a self-signed RSA 2048, 12-month PKCS#12 policy for `subject` ("CN=..." or a bare
+    common name), with any CertificatePolicy arguments in `overrides` replacing the defaults.
+    """
+    from azure.keyvault.certificates import CertificatePolicy
+    settings = {
+        'issuer_name': "Self",
+        'subject': subject if '=' in subject else f"CN={subject}",
+        'key_type': "RSA",
+        'key_size': 2048,
+        'validity_in_months': 12,
+        'content_type': "application/x-pkcs12",
+    }
+    if str(overrides.get('key_type', "")).upper().startswith("EC") and 'key_size' not in overrides:
+        # EC keys are sized by their curve
+        del settings['key_size']
+    settings.update(overrides)
+    return CertificatePolicy(**settings)
+
+def parse_certificate_manifest(document):
+    """
+    Validates a certificate manifest: a list (or {"certificates": [...]}) of
+    {"name", "subject", "policy": {overrides}, "tags", "enabled"} entries, where the policy
+    overrides are the keys of POLICY_OVERRIDES. Returns the entries; raises ValueError.
+    """
+    if isinstance(document, dict):
+        document = document.get('certificates')
+    if not isinstance(document, list):
+        raise ValueError("Manifest must be a list of certificates or an object with a 'certificates' list")
+    entries = []
+    seen = set()
+    for i, raw in enumerate(document, 1):
+        if not isinstance(raw, dict) or not raw.get('name') or not raw.get('subject'):
+            raise ValueError(f"Manifest entry #{i} needs a name and a subject")
+        unknown = set(raw) - set(MANIFEST_FIELDS)
+        unknown_policy = set(raw.get('policy') or {}) - set(POLICY_OVERRIDES)
+        if unknown or unknown_policy:
+            raise ValueError(f"Manifest entry '{raw['name']}': unknown field(s) {', '.join(sorted(unknown | unknown_policy))}")
+        if raw['name'].lower() in seen:
+            raise ValueError(f"Manifest entry '{raw['name']}' appears more than once")
+        seen.add(raw['name'].lower())
+        entries.append({'name': raw['name'], 'subject': raw['subject'], 'policy': dict(raw.get('policy') or {}),
+                        'tags': raw.get('tags'), 'enabled': raw.get('enabled')})
+    return entries
+
+def load_certificate_manifest(path):
+    with open(path) as f:
+        return parse_certificate_manifest(json.load(f))
+
+def _drop_none(fields):
+    return {key: value for key, value in fields.items() if value is not None}
+
+def _create_request(entry):
+    """
+    Builds the REST request that starts one manifest entry's certificate operation. Batch creation
+    sends it with the client's public send_request rather than begin_create_certificate: every
+    LROPoller starts its own polling thread, and the batch already polls all operations itself.
+    """
+    from urllib.parse import quote
+    from azure.core.rest import HttpRequest
+    overrides = {POLICY_OVERRIDES[key]: value for key, value in entry['policy'].items()}
+    policy = certificate_policy(entry['subject'], **overrides)
+    body = {
+        'policy': {
+            'key_props': _drop_none({'kty': policy.key_type, 'key_size': policy.key_size, 'crv': policy.key_curve_name,
+                                     'exportable': policy.exportable, 'reuse_key': policy.reuse_key}),
+            'secret_props': _drop_none({'contentType': policy.content_type}),
+            'x509_props': _drop_none({
+                'subject': policy.subject, 'validity_months': policy.validity_in_months,
+                'sans': _drop_none({'dns_names': policy.san_dns_names, 'emails': policy.san_emails}) or None,
+            }),
+            'issuer': {'name': policy.issuer_name},
+        },
+        'attributes': _drop_none({'enabled': entry['enabled']}),
+        'tags': entry['tags'],
+    }
+    return HttpRequest("POST", f"/certificates/{quote(entry['name'])}/create", json=_drop_none(body))
+
+def _print_progress(counts, elapsed):
+    print(f"[{elapsed:5.0f}s] {counts['issued']} issued, {counts['failed']} failed, {counts['pending']} pending")
+
+@instrumented('certificate')
+def create_certificates(entries, timeout=BATCH_TIMEOUT, max_workers=None, on_progress=_print_progress,
+                        poll_interval=INITIAL_POLL_INTERVAL, max_poll_interval=MAX_POLL_INTERVAL):
+    """
+    Starts a certificate operation for every manifest entry concurrently, then polls the pending
+    operations with get_certificate_operation on one shared client until each completes, fails or
+    `timeout` seconds pass. Each operation's poll interval starts at `poll_interval` and grows by
+    POLL_BACKOFF up to `max_poll_interval`. on_progress(counts, elapsed) is called whenever the
+    issued/failed/pending counts change. Returns one {'name', 'status', 'error', 'seconds'} dict per
+    entry, in manifest order, with status 'issued', 'failed' or 'timed out'.
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+    client = get_certificate_client()
+    started = time.monotonic()
+    results = {entry['name']: {'name': entry['name'], 'status': 'pending', 'error': None, 'seconds': None} for entry in entries}
+
+    def start(entry):
+        client.send_request(_create_request(entry)).raise_for_status()
+
+    pending = {}
+    for entry, _, error in run_parallel(start, entries, max_workers):
+        if error is None:
+            pending[entry['name']] = {'next_poll': time.monotonic() + poll_interval, 'interval': poll_interval}
+        else:
+            results[entry['name']].update(status='failed', error=str(error))
+    invalidate_inventory('certificate')
+
+    def finish(name, status, error=None):
+        results[name].update(status=status, error=error, seconds=round(time.monotonic() - started, 1))
+        pending.pop(name, None)
+
+    def poll(name):
+        return client.get_certificate_operation(certificate_name=name)
+
+    last_counts = None
+    deadline = started + timeout
+    while True:
+        counts = {status: sum(1 for r in results.values() if r['status'] == status) for status in ('issued', 'failed', 'pending')}
+        if counts != last_counts and on_progress:
+            on_progress(counts, time.monotonic() - started)
+            last_counts = counts
+        if not pending:
+            break
+        now = time.monotonic()
+        if now >= deadline:
+            for name in list(pending):
+                finish(name, 'timed out', f"still in progress after {timeout}s")
+            continue
+        due = [name for name, state in pending.items() if state['next_poll'] <= now]
+        if not due:
+            time.sleep(max(0, min(min(state['next_poll'] for state in pending.values()), deadline) - now))
+            continue
+        for name, operation, error in run_parallel(poll, due, max_workers):
+            state = pending[name]
+            if isinstance(error, ResourceNotFoundError):
+                finish(name, 'failed', str(error))
+                continue
+            status = (operation.status or '').lower() if error is None else 'inprogress'
+            if status == 'completed':
+                finish(name, 'issued')
+            elif status != 'inprogress':
+                detail = operation.error.message if operation.error else operation.status_details
+                finish(name, 'failed', f"{operation.status}: {detail}")
+            else:
+                # Errors other than a missing operation are retried on the next poll, up to the deadline
+                state['interval'] = min(state['interval'] * POLL_BACKOFF, max_poll_interval)
+                state['next_poll'] = time.monotonic() + state['interval']
+
+    invalidate_inventory('certificate')
+    for name, result in results.items():
+        if result['status'] == 'issued':
+            invalidate_versions('certificate', name)
+    return [results[entry['name']] for entry in entries]
+
+def create_certificates_from_manifest(path, timeout=BATCH_TIMEOUT, max_workers=None):
+    """
+    Loads a manifest, creates its certificates (see create_certificates) and prints a summary.
+    Returns the per-certificate results, or None when the manifest cannot be read.
+    """
+    try:
+        entries = load_certificate_manifest(path)
+    except Exception as e:
+        print(f"Error reading certificate manifest: {e}")
+        return None
+    print(f"Creating {len(entries)} certificate(s)...")
+    results = create_certificates(entries, timeout, max_workers)
+    for result in results:
+        if result['status'] != 'issued':
+            print(f"Certificate '{result['name']}' {result['status']}: {result['error']}")
+    issued = sum(1 for r in results if r['status'] == 'issued')
+    print(f"Batch finished: {issued} of {len(results)} certificate(s) issued.")
+    return results
@@ -1,22 +1,39 @@
 from .auth import get_key_client, get_secret_client, get_certificate_client
-from azure.core.exceptions import HttpResponseError
+from .get import invalidate_inventory
+from . import jobs
+from .metrics import instrumented
 
-def delete_key(name):
+@instrumented('key')
+def delete_key(name, wait=True):
     try:
         client = get_key_client()
         print(f"Deleting key '{name}'...")
         poller = client.begin_delete_key(name)
+        if not wait:
+            invalidate_inventory('key')
+            job = jobs.submit(f"Delete key '{name}'", poller, on_done=lambda job: invalidate_inventory('key'))
+            print(f"Deletion of key '{name}' continues in the background (job #{job.id}).")
+            return job
         deleted_key = poller.result()
+        invalidate_inventory('key')
         print(f"Key '{deleted_key.name}' deleted successfully.")
     except Exception as e:
         print(f"Error deleting key: {e}")
 
-def delete_secret(name):
+@instrumented('secret')
+def delete_secret(name, wait=True):
+    from azure.core.exceptions import HttpResponseError
     try:
         client = get_secret_client()
         print(f"Deleting secret '{name}'...")
         poller = client.begin_delete_secret(name)
+        if not wait:
+            invalidate_inventory('secret')
+            job = jobs.submit(f"Delete secret '{name}'", poller, on_done=lambda job: invalidate_inventory('secret'))
+            print(f"Deletion of secret '{name}' continues in the background (job #{job.id}).")
+            return job
         deleted_secret = poller.result()
+        invalidate_inventory('secret')
         print(f"Secret '{deleted_secret.name}' deleted successfully.")
     except HttpResponseError as e:
         if "associated with a certificate" in str(e):
@@ -26,12 +43,19 @@ def delete_secret(name):
     except Exception as e:
         print(f"Error deleting secret: {e}")
 
-def delete_certificate(name):
+@instrumented('certificate')
+def delete_certificate(name, wait=True):
     try:
         client = get_certificate_client()
         print(f"Deleting certificate '{name}'...")
         poller = client.begin_delete_certificate(name)
+        if not wait:
+            invalidate_inventory('certificate')
+            job = jobs.submit(f"Delete certificate '{name}'", poller, on_done=lambda job: invalidate_inventory('certificate'))
+            print(f"Deletion of certificate '{name}' continues in the background (job #{job.id}).")
+            return job
         deleted_cert = poller.result()
+        invalidate_inventory('certificate')
         print(f"Certificate '{deleted_cert.name}' deleted successfully.")
     except Exception as e:
         print(f"Error deleting certificate: {e}")
@@ -0,0 +1,111 @@
+import time
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from .bulk import run_for_each, delete_item, wait_for_operation
+from .workers import call_with_retry
+from .metrics import instrumented
+
+PURGE_ATTEMPTS = 10
+PURGE_RETRY_DELAY = 2
+
+def _list_deleted(label, pager):
+    """
+    Prints deleted items page by page as they arrive and returns all of them.
+    """
+    print(f"\n--- Deleted {label}s ---")
+    items = []
+    for page in pager.by_page():
+        for item in page:
+            items.append(item)
+            print(f"Name: {item.name} | Deleted: {item.deleted_date} | Purge scheduled: {item.scheduled_purge_date}")
+    if not items:
+        print(f"No deleted {label.lower()}s found.")
+    return items
+
+@instrumented('key')
+def list_deleted_keys(page_size=None):
+    try:
+        client = get_key_client()
+        return _list_deleted("Key", client.list_deleted_keys(max_page_size=page_size))
+    except Exception as e:
+        print(f"Error listing deleted keys: {e}")
+        return []
+
+@instrumented('secret')
+def list_deleted_secrets(page_size=None):
+    try:
+        client = get_secret_client()
+        return _list_deleted("Secret", client.list_deleted_secrets(max_page_size=page_size))
+    except Exception as e:
+        print(f"Error listing deleted secrets: {e}")
+        return []
+
+@instrumented('certificate')
+def list_deleted_certificates(page_size=None):
+    try:
+        client = get_certificate_client()
+        return _list_deleted("Certificate", client.list_deleted_certificates(max_page_size=page_size))
+    except Exception as e:
+        print(f"Error listing deleted certificates: {e}")
+        return []
+
+def _recover_key(name):
+    return wait_for_operation(get_key_client().begin_recover_deleted_key, name)
+
+def _recover_secret(name):
+    return wait_for_operation(get_secret_client().begin_recover_deleted_secret, name)
+
+def _recover_certificate(name):
+    return wait_for_operation(get_certificate_client().begin_recover_deleted_certificate, name)
+
+def _purge_key(name):
+    return get_key_client().purge_deleted_key(name)
+
+def _purge_secret(name):
+    return get_secret_client().purge_deleted_secret(name)
+
+def _purge_certificate(name):
+    return get_certificate_client().purge_deleted_certificate(name)
+
+_recoverers = {'key': _recover_key, 'secret': _recover_secret, 'certificate': _recover_certificate}
+_purgers = {'key': _purge_key, 'secret': _purge_secret, 'certificate': _purge_certificate}
+
+def _purge_when_ready(purge, name):
+    from azure.core.exceptions import HttpResponseError
+    # Right after a delete the vault can still answer 409 Conflict while it finishes the soft delete
+    for attempt in range(PURGE_ATTEMPTS):
+        try:
+            return call_with_retry(purge, name)
+        except HttpResponseError as e:
+            if e.status_code != 409 or attempt == PURGE_ATTEMPTS - 1:
+                raise
+            time.sleep(PURGE_RETRY_DELAY)
+
+@instrumented()
+def recover_deleted(item_type, names, max_workers=None):
+    """
+    Recovers soft-deleted items concurrently and waits for each recovery poller.
+    """
+    return run_for_each(item_type, names, _recoverers[item_type], "recovered", max_workers, retry=False)
+
+@instrumented()
+def purge_deleted(item_type, names, max_workers=None):
+    """
+    Permanently removes soft-deleted items. This cannot be undone.
+    """
+    purge = _purgers[item_type]
+    # _purge_when_ready retries throttled purges itself
+    return run_for_each(item_type, names, lambda name: _purge_when_ready(purge, name), "purged", max_workers, retry=False)
+
+@instrumented()
+def delete_and_purge(item_type, names, max_workers=None):
+    """
+    Deletes and then purges each item; every purge starts as soon as its own delete finishes,
+    so a name can be recreated right away.
+    """
+    purge = _purgers[item_type]
+
+    def pipeline(name):
+        delete_item(item_type, name)
+        return _purge_when_ready(purge, name)
+
+    return run_for_each(item_type, names, pipeline, "deleted and purged", max_workers, retry=False)
@@ -1,6 +1,36 @@
 from .auth import get_key_client, get_secret_client, get_certificate_client
-from azure.core.exceptions import HttpResponseError
+from .get import WRITE_MAX_AGE, invalidate_inventory, patch_inventory_item, find_inventory_item, store_versions, patch_version
+from .workers import run_parallel
+from .metrics import instrumented
 
+def _disable_versions(item_type, name, versions, disable):
+    """
+    Disables the given versions concurrently and prints one line per disabled version.
+    The updated versions `disable` returns are patched into the version cache.
+    Returns a summary with one {'version', 'status', 'error'} dict per version.
+    """
+    summary = []
+    for version, updated, error in run_parallel(disable, versions):
+        if error is None:
+            if updated is not None:
+                # Keys and certificates come back whole; secrets as their properties
+                patch_version(item_type, name, getattr(updated, 'properties', updated))
+            print(f"Version {version} disabled.")
+            summary.append({'version': version, 'status': 'disabled', 'error': None})
+        else:
+            summary.append({'version': version, 'status': 'failed', 'error': str(error)})
+    return summary
+
+def _report_failures(summary, label, message):
+    failed = [r for r in summary if r['status'] == 'failed']
+    if any("associated with a certificate" in r['error'] for r in failed):
+        print(f"Error: {label} is associated with a certificate. Please manage the certificate versions instead.")
+    else:
+        for r in failed:
+            print(f"{message} ({r['version']}): {r['error']}")
+    return not failed
+
+@instrumented('key')
 def update_key_properties(name, enabled=None, key_ops=None, not_before=None, expires_on=None):
     try:
         client = get_key_client()
@@ -13,76 +43,117 @@ def update_key_properties(name, enabled=None, key_ops=None, not_before=None, exp
         if expires_on is not None: kwargs['expires_on'] = expires_on
 
         key = client.update_key_properties(name, **kwargs)
+        invalidate_inventory('key')
         print(f"Key '{key.name}' updated successfully.")
     except Exception as e:
         print(f"Error updating key: {e}")
 
+def _merged_tags(item_type, name, tags):
+    """
+    Merges `tags` into the item's current tags, read from the listed properties when the cache was
+    filled within WRITE_MAX_AGE seconds and from the vault otherwise, so tags changed elsewhere are kept.
+    Returns (properties, merged) or (None, None) when the item does not exist.
+    """
+    props = find_inventory_item(item_type, name, max_age=WRITE_MAX_AGE)
+    if props is None:
+        return None, None
+    merged = dict(props.tags or {})
+    merged.update(tags)
+    return props, merged
+
+@instrumented('key')
 def update_key_tags(name, tags):
     try:
         client = get_key_client()
-        print(f"Fetching key '{name}' to get existing tags...")
-        key = client.get_key(name)
-        current_tags = key.properties.tags or {}
-        current_tags.update(tags)
-        
+        props, current_tags = _merged_tags('key', name, tags)
+        if props is None:
+            print(f"Key '{name}' not found.")
+            return
+        if current_tags == (props.tags or {}):
+            print(f"Key '{name}' already has these tags.")
+            return
+
         print(f"Updating key '{name}' tags...")
         updated_key = client.update_key_properties(name, tags=current_tags)
+        # Names are unchanged, so the cached inventory and its tag index are patched, not re-listed
+        patch_inventory_item('key', updated_key.properties)
         print(f"Key '{updated_key.name}' tags updated successfully.")
     except Exception as e:
         print(f"Error updating key tags: {e}")
 
+@instrumented('secret')
 def update_secret_value(name, value):
     try:
         client = get_secret_client()
         print(f"Updating secret '{name}' (creating new version)...")
         secret = client.set_secret(name, value)
+        invalidate_inventory('secret')
         print(f"Secret '{secret.name}' updated successfully.")
 
         # Disable older versions
         print(f"Disabling older versions of secret '{name}'...")
-        versions = client.list_properties_of_secret_versions(name)
-        for version in versions:
-            if version.version != secret.properties.version and version.enabled:
-                client.update_secret_properties(name, version=version.version, enabled=False)
-                print(f"Version {version.version} disabled.")
-
+        versions = list(client.list_properties_of_secret_versions(name))
+        store_versions('secret', name, versions)
+        to_disable = [v.version for v in versions if v.version != secret.properties.version and v.enabled]
+        summary = _disable_versions(
+            'secret', name, to_disable, lambda version: client.update_secret_properties(name, version=version, enabled=False)
+        )
+        _report_failures(summary, f"Secret '{name}'", "Error disabling secret version")
+        return summary
     except Exception as e:
         print(f"Error updating secret: {e}")
+        return []
 
+@instrumented('secret')
 def update_secret_tags(name, tags):
     try:
         client = get_secret_client()
-        print(f"Fetching secret '{name}' to get existing tags...")
-        secret = client.get_secret(name)
-        current_tags = secret.properties.tags or {}
-        current_tags.update(tags)
-        
+        # The current tags come from the listed properties: get_secret would download the value
+        props, current_tags = _merged_tags('secret', name, tags)
+        if props is None:
+            print(f"Secret '{name}' not found.")
+            return
+        if current_tags == (props.tags or {}):
+            print(f"Secret '{name}' already has these tags.")
+            return
+
         print(f"Updating secret '{name}' tags...")
         updated_secret = client.update_secret_properties(name, tags=current_tags)
+        patch_inventory_item('secret', updated_secret)
         print(f"Secret '{updated_secret.name}' tags updated successfully.")
     except Exception as e:
         print(f"Error updating secret tags: {e}")
 
+@instrumented('certificate')
 def update_certificate_tags(name, tags):
     try:
         client = get_certificate_client()
-        print(f"Fetching certificate '{name}' to get existing tags...")
-        cert = client.get_certificate(certificate_name=name)
-        current_tags = cert.properties.tags or {}
-        current_tags.update(tags)
+        props, current_tags = _merged_tags('certificate', name, tags)
+        if props is None:
+            print(f"Certificate '{name}' not found.")
+            return
+        if current_tags == (props.tags or {}):
+            print(f"Certificate '{name}' already has these tags.")
+            return
 
         print(f"Updating certificate '{name}' tags...")
         updated_cert = client.update_certificate_properties(certificate_name=name, tags=current_tags)
+        patch_inventory_item('certificate', updated_cert.properties)
         print(f"Certificate '{updated_cert.name}' updated successfully.")
     except Exception as e:
         print(f"Error updating certificate: {e}")
 
+@instrumented('key')
 def update_key_version_properties(name, version, enabled):
+    from azure.core.exceptions import HttpResponseError
     try:
         client = get_key_client()
         print(f"Updating key '{name}' version '{version}'...")
-        client.update_key_properties(name, version=version, enabled=enabled)
+        properties = client.update_key_properties(name, version=version, enabled=enabled).properties
+        invalidate_inventory('key')
+        patch_version('key', name, properties)
         print(f"Key version updated successfully.")
+        return properties
     except HttpResponseError as e:
         if "associated with a certificate" in str(e):
             print(f"Error: Key '{name}' is associated with a certificate. Please manage the certificate versions instead.")
@@ -90,13 +161,19 @@ def update_key_version_properties(name, version, enabled):
             print(f"Error updating key version: {e}")
     except Exception as e:
         print(f"Error updating key version: {e}")
+    return None
 
+@instrumented('secret')
 def update_secret_version_properties(name, version, enabled):
+    from azure.core.exceptions import HttpResponseError
     try:
         client = get_secret_client()
         print(f"Updating secret '{name}' version '{version}'...")
-        client.update_secret_properties(name, version=version, enabled=enabled)
+        properties = client.update_secret_properties(name, version=version, enabled=enabled)
+        invalidate_inventory('secret')
+        patch_version('secret', name, properties)
         print(f"Secret version updated successfully.")
+        return properties
     except HttpResponseError as e:
         if "associated with a certificate" in str(e):
             print(f"Error: Secret '{name}' is associated with a certificate. Please manage the certificate versions instead.")
@@ -104,35 +181,70 @@ def update_secret_version_properties(name, version, enabled):
             print(f"Error updating secret version: {e}")
     except Exception as e:
         print(f"Error updating secret version: {e}")
+    return None
 
+@instrumented('certificate')
 def update_certificate_version_properties(name, version, enabled):
     try:
         client = get_certificate_client()
         print(f"Updating certificate '{name}' version '{version}'...")
-        client.update_certificate_properties(certificate_name=name, version=version, enabled=enabled)
+        properties = client.update_certificate_properties(certificate_name=name, version=version, enabled=enabled).properties
+        invalidate_inventory('certificate')
+        patch_version('certificate', name, properties)
         print(f"Certificate version updated successfully.")
+        return properties
     except Exception as e:
         print(f"Error updating certificate version: {e}")
+    return None
 
-def disable_all_but_newest_key_version(name):
-    try:
-        client = get_key_client()
-        print(f"Fetching versions for key '{name}'...")
-        versions = list(client.list_properties_of_key_versions(name))
-        if not versions:
-            print("No versions found.")
-            return
+# Per item type: how to list the versions of one item and how to disable one of them
+_version_ops = {
+    'key': (
+        lambda name: get_key_client().list_properties_of_key_versions(name),
+        lambda name, version: get_key_client().update_key_properties(name, version=version, enabled=False),
+    ),
+    'secret': (
+        lambda name: get_secret_client().list_properties_of_secret_versions(name),
+        lambda name, version: get_secret_client().update_secret_properties(name, version=version, enabled=False),
+    ),
+    'certificate': (
+        lambda name: get_certificate_client().list_properties_of_certificate_versions(certificate_name=name),
+        lambda name, version: get_certificate_client().update_certificate_properties(
+            certificate_name=name, version=version, enabled=False),
+    ),
+}
+
+@instrumented()
+def disable_old_versions(item_type, name):
+    """
+    Disables every enabled version of one item except the newest. Returns a summary with one
+    {'version', 'status', 'error'} dict per version. Raises when the versions cannot be listed;
+    the disable_all_but_newest_*_version functions print the error and return [] instead.
+    """
+    list_versions, disable = _version_ops[item_type]
+    print(f"Fetching versions for {item_type} '{name}'...")
+    versions = list(list_versions(name))
+    store_versions(item_type, name, versions)
+    if not versions:
+        print("No versions found.")
+        return []
 
-        # Sort by created_on descending
-        versions.sort(key=lambda x: x.created_on, reverse=True)
-        newest = versions[0]
-        print(f"Newest version is {newest.version} (Created: {newest.created_on})")
+    # Sort by created_on descending
+    versions.sort(key=lambda x: x.created_on, reverse=True)
+    newest = versions[0]
+    print(f"Newest version is {newest.version} (Created: {newest.created_on})")
 
-        for v in versions[1:]:
-            if v.enabled:
-                print(f"Disabling version {v.version}...")
-                client.update_key_properties(name, version=v.version, enabled=False)
+    to_disable = [v.version for v in versions[1:] if v.enabled]
+    print(f"Disabling {len(to_disable)} older version(s)...")
+    summary = _disable_versions(item_type, name, to_disable, lambda version: disable(name, version))
+    if _report_failures(summary, f"{item_type.capitalize()} '{name}'", f"Error disabling old {item_type} version"):
         print("All other versions disabled.")
+    return summary
+
+def disable_all_but_newest_key_version(name):
+    from azure.core.exceptions import HttpResponseError
+    try:
+        return disable_old_versions('key', name)
     except HttpResponseError as e:
         if "associated with a certificate" in str(e):
             print(f"Error: Key '{name}' is associated with a certificate. Please manage the certificate versions instead.")
@@ -140,26 +252,12 @@ def disable_all_but_newest_key_version(name):
             print(f"Error disabling old key versions: {e}")
     except Exception as e:
         print(f"Error disabling old key versions: {e}")
+    return []
 
 def disable_all_but_newest_secret_version(name):
+    from azure.core.exceptions import HttpResponseError
     try:
-        client = get_secret_client()
-        print(f"Fetching versions for secret '{name}'...")
-        versions = list(client.list_properties_of_secret_versions(name))
-        if not versions:
-            print("No versions found.")
-            return
-
-        # Sort by created_on descending
-        versions.sort(key=lambda x: x.created_on, reverse=True)
-        newest = versions[0]
-        print(f"Newest version is {newest.version} (Created: {newest.created_on})")
-
-        for v in versions[1:]:
-            if v.enabled:
-                print(f"Disabling version {v.version}...")
-                client.update_secret_properties(name, version=v.version, enabled=False)
-        print("All other versions disabled.")
+        return disable_old_versions('secret', name)
     except HttpResponseError as e:
         if "associated with a certificate" in str(e):
             print(f"Error: Secret '{name}' is associated with a certificate. Please manage the certificate versions instead.")
@@ -167,25 +265,11 @@ def disable_all_but_newest_secret_version(name):
             print(f"Error disabling old secret versions: {e}")
     except Exception as e:
         print(f"Error disabling old secret versions: {e}")
+    return []
 
 def disable_all_but_newest_certificate_version(name):
     try:
-        client = get_certificate_client()
-        print(f"Fetching versions for certificate '{name}'...")
-        versions = list(client.list_properties_of_certificate_versions(certificate_name=name))
-        if not versions:
-            print("No versions found.")
-            return
-
-        # Sort by created_on descending
-        versions.sort(key=lambda x: x.created_on, reverse=True)
-        newest = versions[0]
-        print(f"Newest version is {newest.version} (Created: {newest.created_on})")
-
-        for v in versions[1:]:
-            if v.enabled:
-                print(f"Disabling version {v.version}...")
-                client.update_certificate_properties(certificate_name=name, version=v.version, enabled=False)
-        print("All other versions disabled.")
+        return disable_old_versions('certificate', name)
     except Exception as e:
         print(f"Error disabling old certificate versions: {e}")
+    return []
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from .get import get_inventory, list_versions
+from .workers import run_parallel
+from .metrics import instrumented
+
+# Expiry reports are built from listed properties only: list_properties_of_* and
+# list_properties_of_*_versions carry expires_on, so no item is fetched and no secret value is read.
+ITEM_TYPES = ('key', 'secret', 'certificate')
+DEFAULT_DAYS = 30
+
+def _entry(item_type, name, props, now):
+    expires_on = props.expires_on
+    return {
+        'type': item_type, 'name': name, 'version': props.version, 'enabled': props.enabled,
+        'expires_on': expires_on, 'days_left': (expires_on - now).total_seconds() / 86400,
+        'expired': expires_on <= now,
+    }
+
+def _expiring(props, cutoff, include_disabled):
+    return props.expires_on is not None and props.expires_on <= cutoff and (include_disabled or props.enabled)
+
+@instrumented('vault')
+def scan_expiring(days=DEFAULT_DAYS, item_types=ITEM_TYPES, versions=False, include_disabled=False,
+                  now=None, max_workers=None):
+    """
+    Finds items (or, with versions=True, item versions) that expire within `days` days or have
+    already expired. The item types are listed concurrently, then with versions=True the versions
+    of every item concurrently. Keys and secrets backing a certificate are reported through the
+    certificate. Disabled items and versions are skipped unless include_disabled is set.
+    Returns (entries sorted by expiry, errors); entries are {'type', 'name', 'version', 'enabled',
+    'expires_on', 'days_left', 'expired'} dicts, errors {'type', 'name', 'error'} dicts.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now + timedelta(days=days)
+    entries = []
+    errors = []
+    names = []
+    for item_type, items, error in run_parallel(lambda t: get_inventory(t, refresh=True), item_types, max_workers):
+        if error is not None:
+            errors.append({'type': item_type, 'name': None, 'error': str(error)})
+            continue
+        for props in items:
+            if getattr(props, 'managed', False):
+                continue
+            if versions:
+                names.append((item_type, props.name))
+            elif _expiring(props, cutoff, include_disabled):
+                entries.append(_entry(item_type, props.name, props, now))
+
+    for (item_type, name), listed, error in run_parallel(lambda target: list_versions(*target), names, max_workers):
+        if error is not None:
+            errors.append({'type': item_type, 'name': name, 'error': str(error)})
+            continue
+        entries.extend(_entry(item_type, name, v, now) for v in listed if _expiring(v, cutoff, include_disabled))
+
+    entries.sort(key=lambda e: (e['expires_on'], ITEM_TYPES.index(e['type']), e['name'].lower()))
+    return entries, errors
+
+def print_report(entries, errors=(), days=DEFAULT_DAYS):
+    print(f"\n--- Expiring within {days} day(s) ---")
+    for e in entries:
+        target = f"{e['name']}/{e['version']}" if e['version'] else e['name']
+        when = "EXPIRED" if e['expired'] else f"in {e['days_left']:.1f} day(s)"
+        state = "" if e['enabled'] else " (disabled)"
+        print(f"{e['expires_on']:%Y-%m-%d %H:%M} | {when:<17} | {e['type']:<11} | {target}{state}")
+    for error in errors:
+        where = f"{error['type']} '{error['name']}'" if error['name'] else f"{error['type']}s"
+        print(f"Error listing {where}: {error['error']}")
+    if not entries:
+        print("Nothing expires in this window.")
+    else:
+        expired = sum(1 for e in entries if e['expired'])
+        print(f"{len(entries)} expiring, {expired} already expired.")
+
+def report_expiring(days=DEFAULT_DAYS, item_types=ITEM_TYPES, versions=False, include_disabled=False, max_workers=None):
+    """
+    Prints the expiry report (see scan_expiring) and returns (entries, errors).
+    """
+    try:
+        entries, errors = scan_expiring(days, item_types, versions, include_disabled, max_workers=max_workers)
+    except Exception as e:
+        print(f"Error scanning expiry dates: {e}")
+        return [], [{'type': None, 'name': None, 'error': str(e)}]
+    print_report(entries, errors, days)
+    return entries, errors
@@ -1,5 +1,355 @@
+import os
+import time
+import threading
 from .auth import get_key_client, get_secret_client, get_certificate_client
+from . import snapshot
+from .index import NameIndex, TagIndex
+from .metrics import instrumented
 
+# In-memory inventory of item properties, keyed by item type ('key', 'secret', 'certificate').
+# Entries are served until they are older than INVENTORY_TTL seconds or until a create/edit/delete
+# invalidates them, so prompts that show the item list do not re-list the whole vault every time.
+INVENTORY_TTL = float(os.getenv("KV_INVENTORY_TTL", "60"))
+_inventory_lock = threading.Lock()
+_inventory = {}
+# Read-modify-write edits (tags) only trust cached properties this many seconds old; anything older
+# may miss changes made outside this tool, which the full-set write would overwrite
+WRITE_MAX_AGE = float(os.getenv("KV_WRITE_MAX_AGE", "5"))
+# Indexes derived from each inventory entry, keyed by (item type, kind) and rebuilt only when
+# the entry is replaced
+_indexes = {}
+# Timestamp of entries that must be re-listed before anything but display uses them
+_EXPIRED = float('-inf')
+# Item types to re-list in the background the first time they are read (see refresh_inventory_on_first_use)
+_refresh_pending = set()
+
+_listers = {
+    'key': lambda **kwargs: get_key_client().list_properties_of_keys(**kwargs),
+    'secret': lambda **kwargs: get_secret_client().list_properties_of_secrets(**kwargs),
+    'certificate': lambda **kwargs: get_certificate_client().list_properties_of_certificates(**kwargs),
+}
+
+def set_inventory_ttl(seconds):
+    global INVENTORY_TTL
+    INVENTORY_TTL = seconds
+
+def invalidate_inventory(item_type=None):
+    with _inventory_lock:
+        if item_type is None:
+            _inventory.clear()
+            _indexes.clear()
+            _refresh_pending.clear()
+        else:
+            _inventory.pop(item_type, None)
+            for kind in ('names', 'tags'):
+                _indexes.pop((item_type, kind), None)
+
+def refresh_inventory(item_type):
+    return list(_refresh_entry(item_type)[1])
+
+def _refresh_entry(item_type):
+    items = list(_listers[item_type]())
+    entry = (time.monotonic(), items)
+    with _inventory_lock:
+        _inventory[item_type] = entry
+    if snapshot.is_enabled():
+        try:
+            snapshot.save(item_type, items)
+        except Exception:
+            # A stale snapshot only costs the next cold start, never the current listing
+            pass
+    return entry
+
+def load_inventory_snapshot():
+    """
+    Seeds the inventory from the on-disk snapshot so the first prompt does not wait for the network.
+    The snapshot may be days old, so its entries start out expired: the name sidebar shows them
+    right away, and every other reader re-lists the vault first. Item types that are already
+    cached are left alone.
+    """
+    for item_type in _listers:
+        try:
+            items = snapshot.load(item_type)
+        except Exception:
+            continue
+        if items:
+            with _inventory_lock:
+                _inventory.setdefault(item_type, (_EXPIRED, items))
+
+def refresh_inventory_in_background(item_type):
+    def worker():
+        try:
+            refresh_inventory(item_type)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=worker, name="inventory-refresh", daemon=True)
+    thread.start()
+    return thread
+
+def refresh_inventory_on_first_use():
+    """
+    Re-lists each item type in the background the first time it is read, instead of listing the
+    whole vault at startup. A type the user never opens never imports its SDK or costs a listing.
+    """
+    with _inventory_lock:
+        _refresh_pending.update(_listers)
+
+def _get_entry(item_type, refresh=False, allow_stale=False):
+    """
+    Returns the cached (timestamp, items) entry, re-listing when there is none, when it is older
+    than INVENTORY_TTL (unless allow_stale, for display only) or when refresh is set.
+    """
+    with _inventory_lock:
+        entry = _inventory.get(item_type)
+        pending = item_type in _refresh_pending
+        _refresh_pending.discard(item_type)
+    if not refresh and entry:
+        if time.monotonic() - entry[0] < INVENTORY_TTL:
+            return entry
+        if allow_stale:
+            if pending:
+                refresh_inventory_in_background(item_type)
+            return entry
+    return _refresh_entry(item_type)
+
+def get_inventory(item_type, refresh=False):
+    return list(_get_entry(item_type, refresh)[1])
+
+def patch_inventory_item(item_type, properties):
+    """
+    Replaces one item's properties in the cached inventory after an edit that does not change
+    its name (tags, enabled state), so the cache and its indexes stay valid without a re-list.
+    Returns False when the item is not cached.
+    """
+    with _inventory_lock:
+        entry = _inventory.get(item_type)
+        if entry is None:
+            return False
+        items = entry[1]
+        for i, item in enumerate(items):
+            if item.name.lower() == properties.name.lower():
+                items[i] = properties
+                break
+        else:
+            return False
+        cached = _indexes.get((item_type, 'tags'))
+        if cached and cached[0] is entry:
+            cached[1].update(properties.name, properties.tags)
+        return True
+
+def find_inventory_item(item_type, name, max_age=None):
+    """
+    Returns the listed properties of one item, re-listing once if the cache does not have it,
+    or None if the vault has no such item. Reads tags and dates without a get_* call, which for
+    secrets would also download the value.
+    With max_age (seconds), a cached entry older than that is not trusted: the item's current
+    properties are read from the vault instead (see read_item_properties) and patched into the cache.
+    """
+    if max_age is not None:
+        with _inventory_lock:
+            entry = _inventory.get(item_type)
+        if not entry or time.monotonic() - entry[0] > max_age:
+            props = read_item_properties(item_type, name)
+            if props is not None:
+                patch_inventory_item(item_type, props)
+            return props
+    for refresh in (False, True):
+        for item in _get_entry(item_type, refresh)[1]:
+            if item.name.lower() == name.lower():
+                return item
+    return None
+
+def read_item_properties(item_type, name):
+    """
+    Reads one item's current properties from the vault, or None if it does not exist. Secrets are
+    read from their version listing (the newest version carries the item's tags), so no value is downloaded.
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+    try:
+        if item_type == 'key':
+            return get_key_client().get_key(name).properties
+        if item_type == 'certificate':
+            return get_certificate_client().get_certificate(name).properties
+        versions = list(get_secret_client().list_properties_of_secret_versions(name))
+    except ResourceNotFoundError:
+        return None
+    return max(versions, key=lambda v: (v.created_on is not None, v.created_on), default=None)
+
+def get_recent_inventory(item_type, max_age):
+    """
+    Returns the inventory, re-listing it first unless the cached entry is at most max_age seconds
+    old. For read-modify-write edits, which must not start from properties that may be stale.
+    """
+    with _inventory_lock:
+        entry = _inventory.get(item_type)
+    fresh = entry is not None and time.monotonic() - entry[0] <= max_age
+    return list(_get_entry(item_type, refresh=not fresh)[1])
+
+def _get_index(item_type, kind, build, allow_stale=False):
+    entry = _get_entry(item_type, allow_stale=allow_stale)
+    with _inventory_lock:
+        cached = _indexes.get((item_type, kind))
+    if cached and cached[0] is entry:
+        return cached[1]
+    index = build(entry[1])
+    with _inventory_lock:
+        _indexes[(item_type, kind)] = (entry, index)
+    return index
+
+def get_name_index(item_type):
+    """
+    Returns the NameIndex over the current inventory, for prompt filtering and completion.
+    It is built once per inventory entry and shared between calls. Names are only displayed and
+    offered for completion, so an expired entry (e.g. from the snapshot) is used as is.
+    """
+    try:
+        return _get_index(item_type, 'names', lambda items: NameIndex(item.name for item in items), allow_stale=True)
+    except Exception as e:
+        print(f"Error fetching {item_type}s: {e}")
+        return NameIndex([])
+
+def get_tag_index(item_type):
+    """
+    Returns the TagIndex over the current inventory, built from the listed properties.
+    Raises when the inventory cannot be listed.
+    """
+    return _get_index(item_type, 'tags', TagIndex)
+
+def get_inventory_names(item_type):
+    """
+    Returns the item names sorted case-insensitively. The list is shared, so callers must not modify it.
+    """
+    return get_name_index(item_type).names
+
+# Versions of single items for the version menus, keyed by (item type, lower-case name). Each entry
+# holds the versions read so far and the page iterator for the rest, so an item with thousands of
+# versions is read a page at a time, and an enable/disable patches the entry instead of re-listing.
+VERSION_PAGE_SIZE = 25
+_versions_lock = threading.Lock()
+_versions = {}
+
+_version_listers = {
+    'key': lambda name, **kwargs: get_key_client().list_properties_of_key_versions(name, **kwargs),
+    'secret': lambda name, **kwargs: get_secret_client().list_properties_of_secret_versions(name, **kwargs),
+    'certificate': lambda name, **kwargs: get_certificate_client().list_properties_of_certificate_versions(name, **kwargs),
+}
+
+class VersionList:
+    """
+    The versions of one item read so far, and the pages still to read (None once all are read).
+    """
+
+    def __init__(self, items=(), pages=None):
+        self.items = list(items)
+        self._pages = pages
+
+    @property
+    def complete(self):
+        return self._pages is None
+
+    def load(self, count=None):
+        """
+        Reads pages until at least `count` versions are loaded, or all of them with count=None.
+        """
+        while self._pages is not None and (count is None or len(self.items) < count):
+            try:
+                self.items.extend(next(self._pages))
+            except StopIteration:
+                self._pages = None
+
+    def newest_first(self):
+        return sorted(self.items, key=lambda v: (v.created_on is not None, v.created_on), reverse=True)
+
+def _version_key(item_type, name):
+    return (item_type, name.lower())
+
+def list_versions(item_type, name):
+    """
+    Lists the properties of every version of one item, bypassing the version cache.
+    """
+    return list(_version_listers[item_type](name))
+
+def get_versions(item_type, name, count=VERSION_PAGE_SIZE, refresh=False):
+    """
+    Returns (versions newest first, complete) for one item from the version cache, reading more
+    pages only when fewer than `count` versions are loaded (count=None reads them all). The service
+    lists versions in no particular order, so until `complete` the order holds among the loaded ones.
+    Raises when the versions cannot be listed.
+    """
+    key = _version_key(item_type, name)
+    with _versions_lock:
+        entry = None if refresh else _versions.get(key)
+        if entry is None:
+            pages = _version_listers[item_type](name, max_page_size=VERSION_PAGE_SIZE).by_page()
+            entry = _versions[key] = VersionList(pages=pages)
+    entry.load(count)
+    return entry.newest_first(), entry.complete
+
+def store_versions(item_type, name, versions):
+    """
+    Caches a complete version listing that was read elsewhere, e.g. before disabling old versions.
+    """
+    with _versions_lock:
+        _versions[_version_key(item_type, name)] = VersionList(versions)
+
+def patch_version(item_type, name, properties):
+    """
+    Replaces one version's properties in the cached versions of an item after an update.
+    Returns False when that version is not cached.
+    """
+    with _versions_lock:
+        entry = _versions.get(_version_key(item_type, name))
+        if entry is None:
+            return False
+        for i, item in enumerate(entry.items):
+            if item.version == properties.version:
+                entry.items[i] = properties
+                return True
+        return False
+
+def add_version(item_type, name, properties):
+    """
+    Adds a version just created by this process to the cached versions of an item, if any.
+    """
+    with _versions_lock:
+        entry = _versions.get(_version_key(item_type, name))
+        if entry is not None:
+            entry.items.append(properties)
+
+def invalidate_versions(item_type=None, name=None):
+    with _versions_lock:
+        if item_type is None:
+            _versions.clear()
+        elif name is None:
+            for key in [key for key in _versions if key[0] == item_type]:
+                del _versions[key]
+        else:
+            _versions.pop(_version_key(item_type, name), None)
+
+def list_cached_versions(item_type, name, count=VERSION_PAGE_SIZE, refresh=False):
+    """
+    Prints up to `count` cached versions of one item newest first, loading pages as get_versions does.
+    Returns (versions shown, more) where `more` is True when versions beyond those shown exist;
+    on an error nothing is shown and `more` is False.
+    """
+    print(f"\n--- Versions for {item_type.capitalize()}: {name} ---")
+    try:
+        versions, complete = get_versions(item_type, name, count, refresh)
+    except Exception as e:
+        print(f"Error listing {item_type} versions: {e}")
+        return [], False
+    more = not complete or len(versions) > count
+    versions = versions[:count]
+    for i, v in enumerate(versions, 1):
+        print(f"[{i}] Version: {v.version} | Enabled: {v.enabled} | Created: {v.created_on}")
+    if not versions:
+        print("No versions found.")
+    elif more:
+        print(f"Showing {len(versions)} versions, newest first among those loaded; more are available.")
+    return versions, more
+
+@instrumented('key')
 def get_key(name):
     try:
         client = get_key_client()
@@ -8,113 +358,152 @@ def get_key(name):
         print(f"Error getting key: {e}")
         return None
 
-def get_all_keys():
+@instrumented('key')
+def get_all_keys(refresh=False):
     try:
-        client = get_key_client()
-        return list(client.list_properties_of_keys())
+        return get_inventory('key', refresh)
     except Exception as e:
         print(f"Error fetching keys: {e}")
         return []
 
-def get_all_secrets():
+@instrumented('secret')
+def get_all_secrets(refresh=False):
     try:
-        client = get_secret_client()
-        return list(client.list_properties_of_secrets())
+        return get_inventory('secret', refresh)
     except Exception as e:
         print(f"Error fetching secrets: {e}")
         return []
 
-def get_all_certificates():
+@instrumented('certificate')
+def get_all_certificates(refresh=False):
     try:
-        client = get_certificate_client()
-        return list(client.list_properties_of_certificates())
+        return get_inventory('certificate', refresh)
     except Exception as e:
         print(f"Error fetching certificates: {e}")
         return []
 
-def list_keys():
+# Continuation tokens handed out by iter_pages are "<skip>:<service token>": the service token
+# (empty for the first page) fetches a page and skip is how many of its items were already shown,
+# so a --limit that stops in the middle of a page resumes at the right item.
+def _make_token(skip, service_token):
+    if not skip and service_token is None:
+        return None
+    return f"{skip}:{service_token or ''}"
+
+def _parse_token(token):
+    if not token:
+        return 0, None
+    skip, sep, service_token = token.partition(':')
+    if not sep or not skip.isdigit():
+        raise ValueError(f"Invalid continuation token: {token}")
+    return int(skip), service_token or None
+
+def iter_pages(item_type, page_size=None, limit=None, continuation_token=None):
+    """
+    Yields (items, resume_token) for each page as the vault returns it, so a caller never holds
+    more than one page. resume_token continues right after the last item yielded and is None once
+    the listing is complete. Stops after `limit` items. The inventory cache is not touched.
+    """
+    skip, service_token = _parse_token(continuation_token)
+    pages = _listers[item_type](max_page_size=page_size).by_page(continuation_token=service_token)
+    remaining = limit
+    for page in pages:
+        items = list(page)[skip:]
+        offset, skip = skip, 0
+        if remaining is not None and len(items) >= remaining:
+            if len(items) > remaining:
+                yield items[:remaining], _make_token(offset + remaining, service_token)
+            else:
+                yield items, _make_token(0, pages.continuation_token)
+            return
+        service_token = pages.continuation_token
+        if remaining is not None:
+            remaining -= len(items)
+        yield items, _make_token(0, service_token)
+
+def _print_listing(item_type, label, page_size, limit, continuation_token):
+    print(f"\n--- {label}s ---")
+    count = 0
+    resume_token = None
+    for items, resume_token in iter_pages(item_type, page_size, limit, continuation_token):
+        for item in items:
+            print(f"Name: {item.name} | Enabled: {item.enabled} | Created: {item.created_on}")
+        count += len(items)
+    if count == 0:
+        print(f"No {label.lower()}s found.")
+    if resume_token:
+        print(f"More {label.lower()}s available. Continuation token: {resume_token}")
+    return resume_token
+
+@instrumented('key')
+def list_keys(page_size=None, limit=None, continuation_token=None):
+    """
+    Prints keys page by page as they arrive. Returns the continuation token when `limit`
+    stopped the listing early, otherwise None.
+    """
     try:
-        print("\n--- Keys ---")
-        keys = get_all_keys()
-        count = 0
-        for key in keys:
-            print(f"Name: {key.name} | Enabled: {key.enabled} | Created: {key.created_on}")
-            count += 1
-        if count == 0:
-            print("No keys found.")
+        return _print_listing('key', "Key", page_size, limit, continuation_token)
     except Exception as e:
         print(f"Error listing keys: {e}")
+        return None
 
-def list_secrets():
+@instrumented('secret')
+def list_secrets(page_size=None, limit=None, continuation_token=None):
+    """
+    Prints secrets page by page as they arrive. Returns the continuation token when `limit`
+    stopped the listing early, otherwise None.
+    """
     try:
-        print("\n--- Secrets ---")
-        secrets = get_all_secrets()
-        count = 0
-        for secret in secrets:
-            print(f"Name: {secret.name} | Enabled: {secret.enabled} | Created: {secret.created_on}")
-            count += 1
-        if count == 0:
-            print("No secrets found.")
+        return _print_listing('secret', "Secret", page_size, limit, continuation_token)
     except Exception as e:
         print(f"Error listing secrets: {e}")
+        return None
 
-def list_certificates():
+@instrumented('certificate')
+def list_certificates(page_size=None, limit=None, continuation_token=None):
+    """
+    Prints certificates page by page as they arrive. Returns the continuation token when `limit`
+    stopped the listing early, otherwise None.
+    """
     try:
-        print("\n--- Certificates ---")
-        certs = get_all_certificates()
-        count = 0
-        for cert in certs:
-            print(f"Name: {cert.name} | Enabled: {cert.enabled} | Created: {cert.created_on}")
-            count += 1
-        if count == 0:
-            print("No certificates found.")
+        return _print_listing('certificate', "Certificate", page_size, limit, continuation_token)
     except Exception as e:
         print(f"Error listing certificates: {e}")
+        return None
+
+@instrumented()
+def print_versions(item_type, name):
+    """
+    Lists every version of one item, bypassing the version cache, and prints one line per version.
+    Raises when the versions cannot be listed; the list_*_versions functions print the error and
+    return [] instead.
+    """
+    print(f"\n--- Versions for {item_type.capitalize()}: {name} ---")
+    version_list = []
+    for v in _version_listers[item_type](name):
+        version_list.append(v)
+        print(f"[{len(version_list)}] Version: {v.version} | Enabled: {v.enabled} | Created: {v.created_on}")
+    if not version_list:
+        print("No versions found.")
+    return version_list
 
 def list_key_versions(name):
     try:
-        client = get_key_client()
-        print(f"\n--- Versions for Key: {name} ---")
-        versions = client.list_properties_of_key_versions(name)
-        version_list = []
-        for v in versions:
-            version_list.append(v)
-            print(f"[{len(version_list)}] Version: {v.version} | Enabled: {v.enabled} | Created: {v.created_on}")
-        if not version_list:
-            print("No versions found.")
-        return version_list
+        return print_versions('key', name)
     except Exception as e:
         print(f"Error listing key versions: {e}")
         return []
 
 def list_secret_versions(name):
     try:
-        client = get_secret_client()
-        print(f"\n--- Versions for Secret: {name} ---")
-        versions = client.list_properties_of_secret_versions(name)
-        version_list = []
-        for v in versions:
-            version_list.append(v)
-            print(f"[{len(version_list)}] Version: {v.version} | Enabled: {v.enabled} | Created: {v.created_on}")
-        if not version_list:
-            print("No versions found.")
-        return version_list
+        return print_versions('secret', name)
     except Exception as e:
         print(f"Error listing secret versions: {e}")
         return []
 
 def list_certificate_versions(name):
     try:
-        client = get_certificate_client()
-        print(f"\n--- Versions for Certificate: {name} ---")
-        versions = client.list_properties_of_certificate_versions(name)
-        version_list = []
-        for v in versions:
-            version_list.append(v)
-            print(f"[{len(version_list)}] Version: {v.version} | Enabled: {v.enabled} | Created: {v.created_on}")
-        if not version_list:
-            print("No versions found.")
-        return version_list
+        return print_versions('certificate', name)
     except Exception as e:
         print(f"Error listing certificate versions: {e}")
         return []
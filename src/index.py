@@ -0,0 +1,161 @@
+import re
+from bisect import bisect_left
+
+# Key Vault names are case-insensitive, so every lookup works on lowercased keys.
+# The sorted key list doubles as the prefix index: all names starting with a prefix sit in
+# one contiguous range found with two binary searches. Fuzzy lookups match the query as a
+# subsequence ("pdb" matches "prod-db"); a bitmask per character (bit i set when name i
+# contains it) narrows the candidates before the character order is checked.
+
+def subsequence_pattern(query):
+    """
+    Compiles a regex matching strings that contain the characters of `query` in order.
+    Each `[^c]*c` segment can only stop at the first `c`, so the match is one left-to-right pass
+    without backtracking, and no possessive quantifiers (Python 3.11+) are needed.
+    """
+    return re.compile("".join(f"[^{re.escape(c)}]*{re.escape(c)}" for c in query))
+
+class NameIndex:
+    __slots__ = ('names', '_keys', '_masks')
+
+    def __init__(self, names):
+        self.names = sorted(names, key=str.lower)
+        self._keys = [name.lower() for name in self.names]
+        self._masks = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _range(self, prefix):
+        prefix = prefix.lower()
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + '\U0010ffff', lo)
+        return lo, hi
+
+    def prefix(self, prefix, limit=None):
+        lo, hi = self._range(prefix)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self.names[lo:hi]
+
+    def complete(self, text):
+        """
+        Extends `text` to the longest prefix shared by every name that starts with it.
+        Returns `text` unchanged when nothing matches.
+        """
+        lo, hi = self._range(text)
+        if lo == hi:
+            return text
+        # In sorted order the first and last match bound the common prefix of the whole range
+        first, last = self._keys[lo], self._keys[hi - 1]
+        length = len(text)
+        while length < len(first) and length < len(last) and first[length] == last[length]:
+            length += 1
+        return text + self.names[lo][len(text):length]
+
+    def _build_masks(self):
+        bits = {}
+        for i, key in enumerate(self._keys):
+            byte, bit = i >> 3, 1 << (i & 7)
+            for char in set(key):
+                array = bits.get(char)
+                if array is None:
+                    array = bits[char] = bytearray((len(self._keys) + 7) // 8)
+                array[byte] |= bit
+        self._masks = {char: int.from_bytes(array, 'little') for char, array in bits.items()}
+
+    def fuzzy(self, query, limit=None, exclude=None):
+        """
+        Returns names containing the characters of `query` in order, in sorted order.
+        exclude: optional (lo, hi) index range to skip, used by search() for the prefix matches.
+        """
+        query = query.lower()
+        if not query:
+            return self.names[:limit]
+        if self._masks is None:
+            self._build_masks()
+
+        candidates = -1
+        for char in set(query):
+            mask = self._masks.get(char)
+            if mask is None:
+                return []
+            candidates &= mask
+
+        match = subsequence_pattern(query).match
+        bits = bin(candidates)[:1:-1]
+        lo, hi = exclude or (0, 0)
+        results = []
+        position = bits.find('1')
+        while position != -1:
+            if lo <= position < hi:
+                position = bits.find('1', hi)
+                continue
+            if match(self._keys[position]):
+                results.append(self.names[position])
+                if limit is not None and len(results) >= limit:
+                    break
+            position = bits.find('1', position + 1)
+        return results
+
+    def search(self, query, limit=None):
+        """
+        Prefix matches first, then the remaining fuzzy matches, at most `limit` names in total.
+        """
+        lo, hi = self._range(query)
+        results = self.names[lo:hi if limit is None else min(hi, lo + limit)]
+        if limit is not None and len(results) >= limit:
+            return results
+        remaining = None if limit is None else limit - len(results)
+        return results + self.fuzzy(query, remaining, exclude=(lo, hi))
+
+class TagIndex:
+    """
+    Inverted index from tag (key, value) and tag key to item names. Built from item
+    properties, so it never needs the items themselves.
+    """
+    __slots__ = ('_postings', '_keys', '_tags')
+
+    def __init__(self, items=()):
+        self._postings = {}
+        self._keys = {}
+        self._tags = {}
+        for item in items:
+            self.add(item.name, item.tags)
+
+    def __len__(self):
+        return len(self._tags)
+
+    def add(self, name, tags):
+        tags = dict(tags or {})
+        self._tags[name] = tags
+        for key, value in tags.items():
+            self._postings.setdefault((key, value), set()).add(name)
+            self._keys.setdefault(key, set()).add(name)
+
+    def remove(self, name):
+        for key, value in self._tags.pop(name, {}).items():
+            for bucket, index_key in ((self._postings, (key, value)), (self._keys, key)):
+                names = bucket.get(index_key)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del bucket[index_key]
+
+    def update(self, name, tags):
+        self.remove(name)
+        self.add(name, tags)
+
+    def tags(self, name):
+        return self._tags.get(name, {})
+
+    def names(self):
+        return set(self._tags)
+
+    def match(self, key, value=None):
+        """
+        Names tagged key=value, or carrying `key` at all when value is None.
+        """
+        if value is None:
+            return set(self._keys.get(key, ()))
+        return set(self._postings.get((key, value), ()))
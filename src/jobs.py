@@ -0,0 +1,88 @@
+import itertools
+import threading
+from datetime import datetime
+
+# Long-running operations (LROPollers) tracked in the background so the menu can return
+# to the prompt immediately. Each job gets a daemon thread that waits on poller.result().
+_lock = threading.Lock()
+_jobs = []
+_ids = itertools.count(1)
+_unreported = []
+
+class Job:
+    def __init__(self, job_id, description, poller):
+        self.id = job_id
+        self.description = description
+        self.poller = poller
+        self.status = 'running'
+        self.result = None
+        self.error = None
+        self.started_on = datetime.now()
+        self.finished_on = None
+
+    @property
+    def done(self):
+        return self.status != 'running'
+
+def _operation_error(result):
+    """
+    Certificate pollers do not raise when issuance fails or is cancelled: they return the
+    CertificateOperation instead of the certificate. Returns its error text, or None when
+    the result is not an unfinished operation.
+    """
+    status = getattr(result, 'status', None)
+    if not isinstance(status, str) or status.lower() == 'completed':
+        return None
+    error = getattr(result, 'error', None)
+    detail = getattr(error, 'message', None) or getattr(result, 'status_details', None)
+    return f"{status}: {detail}" if detail else f"operation {status}"
+
+def _wait(job, on_done):
+    try:
+        job.result = job.poller.result()
+        job.error = _operation_error(job.result)
+        job.status = 'failed' if job.error else 'succeeded'
+    except Exception as e:
+        job.error = str(e)
+        job.status = 'failed'
+    job.finished_on = datetime.now()
+    with _lock:
+        _unreported.append(job)
+    if on_done:
+        try:
+            on_done(job)
+        except Exception:
+            pass
+
+def submit(description, poller, on_done=None):
+    """
+    Tracks a poller as a background job. on_done(job) is called from the job thread when it finishes.
+    """
+    with _lock:
+        job = Job(next(_ids), description, poller)
+        _jobs.append(job)
+    thread = threading.Thread(target=_wait, args=(job, on_done), name=f"job-{job.id}", daemon=True)
+    thread.start()
+    return job
+
+def list_jobs():
+    with _lock:
+        return list(_jobs)
+
+def running_count():
+    with _lock:
+        return sum(1 for job in _jobs if not job.done)
+
+def pop_finished():
+    """
+    Returns the jobs that finished since the last call.
+    """
+    with _lock:
+        finished = list(_unreported)
+        _unreported.clear()
+    return finished
+
+def clear_finished():
+    with _lock:
+        _jobs[:] = [job for job in _jobs if not job.done]
+        _unreported.clear()
@@ -0,0 +1,285 @@
+import os
+import time
+import threading
+import functools
+from bisect import bisect_left
+from urllib.parse import urlparse
+
+# In-process metrics at two layers:
+#   'sdk' - every HTTP attempt, recorded by MetricsPolicy in each client's pipeline, named by
+#           method and path template ("GET /secrets/{name}");
+#   'op'  - every public src/* operation, recorded by the @instrumented decorator.
+# Each (layer, resource, operation) series keeps a latency histogram, call/error/throttle counts,
+# retries (attempts after the first of one SDK call) and bytes sent and received. report() prints
+# a table (the --stats view) and write_prometheus() writes the text exposition format for
+# node_exporter's textfile collector.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+RESOURCES = {
+    'keys': 'key', 'deletedkeys': 'key',
+    'secrets': 'secret', 'deletedsecrets': 'secret',
+    'certificates': 'certificate', 'deletedcertificates': 'certificate',
+}
+# Path segments after an item name that name an action rather than an item version
+ACTIONS = {
+    'backup', 'versions', 'create', 'import', 'pending', 'recover', 'policy',
+    'encrypt', 'decrypt', 'sign', 'verify', 'wrapkey', 'unwrapkey', 'rotate', 'rotationpolicy',
+}
+# Actions on a whole collection, posted to /{collection}/{action} where an item name would go
+COLLECTION_ACTIONS = {'restore'}
+
+class Series:
+    __slots__ = ('buckets', 'count', 'errors', 'throttled', 'retries', 'total', 'bytes_sent', 'bytes_received')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.throttled = 0
+        self.retries = 0
+        self.total = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def quantile(self, q):
+        """
+        Upper bound of the histogram bucket holding the q-quantile (inf past the last bucket).
+        """
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+_lock = threading.Lock()
+_series = {}
+
+def record(layer, resource, operation, seconds, error=False, throttled=False, retry=False, sent=0, received=0):
+    with _lock:
+        series = _series.get((layer, resource, operation))
+        if series is None:
+            series = _series[(layer, resource, operation)] = Series()
+        series.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        series.count += 1
+        series.total += seconds
+        series.errors += bool(error)
+        series.throttled += bool(throttled)
+        series.retries += bool(retry)
+        series.bytes_sent += sent
+        series.bytes_received += received
+
+def reset():
+    with _lock:
+        _series.clear()
+
+def snapshot():
+    """
+    Returns a list of ((layer, resource, operation), Series copy) pairs, sorted.
+    """
+    with _lock:
+        items = []
+        for key, series in sorted(_series.items()):
+            copy = Series()
+            for field in Series.__slots__:
+                value = getattr(series, field)
+                setattr(copy, field, list(value) if isinstance(value, list) else value)
+            items.append((key, copy))
+        return items
+
+ITEM_TYPES = ('key', 'secret', 'certificate')
+
+def instrumented(resource=None):
+    """
+    Decorator recording latency and outcome of a src/* operation. Without a resource, the
+    item type passed as the first argument is used ('vault' if there is none). Most operations
+    print and swallow their errors, so failures of the underlying calls show up at the 'sdk' layer.
+    """
+    def decorator(func):
+        operation = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            series_resource = resource or (args[0] if args and args[0] in ITEM_TYPES else 'vault')
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                record('op', series_resource, operation, time.perf_counter() - start, error=error)
+        return wrapper
+    return decorator
+
+def describe_request(http_request):
+    """
+    Maps a Key Vault request to (resource, operation), e.g. ('secret', 'GET /secrets/{name}').
+    Paths are /{collection}/{name}/{version or action}/{action}, so segments are classified by
+    position: the one after the collection is the item name even when the item is called "backup".
+    """
+    segments = [s for s in urlparse(http_request.url).path.lower().split('/') if s]
+    if not segments:
+        return 'vault', f"{http_request.method} /"
+    template = [segments[0]]
+    if len(segments) == 2 and http_request.method == 'POST' and segments[1] in COLLECTION_ACTIONS:
+        template.append(segments[1])
+    elif len(segments) > 1:
+        template.append('{name}')
+    for segment in segments[2:]:
+        template.append(segment if segment in ACTIONS else '{version}')
+    return RESOURCES.get(segments[0], 'vault'), f"{http_request.method} /" + "/".join(template)
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode())
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+def _response_size(http_response):
+    length = http_response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        return int(length)
+    try:
+        return len(http_response.body())
+    except Exception:
+        return 0
+
+def _attempt(request):
+    # The pipeline request, and so its context, is reused for every retry of one call
+    attempt = request.context.get('kv_metrics_attempt', 0) + 1
+    request.context['kv_metrics_attempt'] = attempt
+    return attempt
+
+def _record_request(http_request, start, attempt, response=None):
+    resource, operation = describe_request(http_request)
+    status = response.http_response.status_code if response is not None else None
+    record(
+        'sdk', resource, operation, time.perf_counter() - start,
+        error=status is None or status >= 400,
+        throttled=status == 429,
+        retry=attempt > 1,
+        sent=_body_size(http_request.body),
+        received=_response_size(response.http_response) if response is not None else 0,
+    )
+
+@functools.lru_cache(maxsize=None)
+def _policy_classes():
+    """
+    Builds MetricsPolicy and AsyncMetricsPolicy on first use. Every operation module imports this
+    one for @instrumented, so the azure.core pipeline base classes are only imported once a client
+    is built.
+    """
+    from azure.core.pipeline.policies import HTTPPolicy, AsyncHTTPPolicy
+
+    class MetricsPolicy(HTTPPolicy):
+        """
+        Per-retry pipeline policy recording every HTTP attempt.
+        """
+
+        def send(self, request):
+            attempt = _attempt(request)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.next.send(request)
+                return response
+            finally:
+                _record_request(request.http_request, start, attempt, response)
+
+    class AsyncMetricsPolicy(AsyncHTTPPolicy):
+
+        async def send(self, request):
+            attempt = _attempt(request)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = await self.next.send(request)
+                return response
+            finally:
+                _record_request(request.http_request, start, attempt, response)
+
+    return {'MetricsPolicy': MetricsPolicy, 'AsyncMetricsPolicy': AsyncMetricsPolicy}
+
+def __getattr__(name):
+    classes = _policy_classes() if name in ('MetricsPolicy', 'AsyncMetricsPolicy') else {}
+    if name not in classes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return classes[name]
+
+def metrics_policy():
+    return _policy_classes()['MetricsPolicy']()
+
+def async_metrics_policy():
+    return _policy_classes()['AsyncMetricsPolicy']()
+
+def _format_seconds(value):
+    return "inf" if value == float('inf') else f"{value * 1000:.0f}ms"
+
+def report(file=None):
+    """
+    Prints one row per series: calls, errors, throttled, retries, mean, p50/p95 and bytes.
+    """
+    rows = snapshot()
+    print("\n--- Operation Statistics ---", file=file)
+    if not rows:
+        print("No operations recorded yet.", file=file)
+        return
+    print(f"{'Layer':<5} {'Resource':<12} {'Operation':<44} {'Calls':>6} {'Err':>5} {'429':>5} {'Retry':>5} "
+          f"{'Mean':>8} {'p50':>7} {'p95':>7} {'Sent':>9} {'Recv':>9}", file=file)
+    for (layer, resource, operation), s in rows:
+        mean = s.total / s.count if s.count else 0
+        print(f"{layer:<5} {resource:<12} {operation[:44]:<44} {s.count:>6} {s.errors:>5} {s.throttled:>5} {s.retries:>5} "
+              f"{mean * 1000:>6.0f}ms {_format_seconds(s.quantile(0.5)):>7} {_format_seconds(s.quantile(0.95)):>7} "
+              f"{s.bytes_sent:>9} {s.bytes_received:>9}", file=file)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(layer, resource, operation, **extra):
+    pairs = {'layer': layer, 'resource': resource, 'operation': operation, **extra}
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+def render_prometheus():
+    rows = snapshot()
+    lines = [
+        "# HELP kv_operation_duration_seconds Latency of Key Vault operations and SDK requests.",
+        "# TYPE kv_operation_duration_seconds histogram",
+    ]
+    for (layer, resource, operation), s in rows:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), s.buckets):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f"kv_operation_duration_seconds_bucket{_labels(layer, resource, operation, le=le)} {cumulative}")
+        lines.append(f"kv_operation_duration_seconds_sum{_labels(layer, resource, operation)} {s.total:.6f}")
+        lines.append(f"kv_operation_duration_seconds_count{_labels(layer, resource, operation)} {s.count}")
+    counters = (
+        ('kv_operation_errors_total', "Failed operations and requests.", 'errors'),
+        ('kv_operation_throttled_total', "Requests answered with 429.", 'throttled'),
+        ('kv_operation_retries_total', "Request attempts after the first.", 'retries'),
+        ('kv_bytes_sent_total', "Request body bytes sent.", 'bytes_sent'),
+        ('kv_bytes_received_total', "Response body bytes received.", 'bytes_received'),
+    )
+    for name, help_text, field in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (layer, resource, operation), s in rows:
+            lines.append(f"{name}{_labels(layer, resource, operation)} {getattr(s, field)}")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path):
+    """
+    Writes the metrics in Prometheus text format. The file is replaced atomically so the
+    textfile collector never reads a half-written file; node_exporter expects a .prom suffix.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(render_prometheus())
+    os.replace(temp_path, path)
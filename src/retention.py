@@ -0,0 +1,229 @@
+import json
+import fnmatch
+from datetime import datetime, timedelta, timezone
+from .auth import get_key_client, get_secret_client, get_certificate_client
+from .get import get_inventory, get_tag_index, invalidate_inventory, patch_version, list_versions
+from .workers import run_parallel
+from .bulk import bulk_delete
+from .deleted import delete_and_purge
+from .tags import parse_query, evaluate
+from .metrics import instrumented
+
+# Version retention policies, applied vault-wide from a JSON file:
+#
+#   {"policies": [{"name": "app-secrets", "types": ["secret"], "names": ["app-*"], "tags": "env=prod",
+#                  "keep_newest": 3, "disable_after_days": 90, "delete_disabled_items_after_days": 365}]}
+#
+# `names` (glob patterns) and `tags` (a tag query, see tags.parse_query) select the items; an item
+# must match both when both are given, and the first matching policy wins. Rules:
+#   keep_newest                      disable enabled versions beyond the N newest enabled ones
+#   disable_after_days               disable versions created more than X days ago
+#   delete_disabled_items_after_days soft-delete whole items whose versions have all been disabled
+#                                    and unchanged for Y days
+# The newest enabled version of an item is never disabled, so the version rules never leave an item
+# unusable; only the explicitly named item rule removes anything. Deleted items stay recoverable
+# unless the policy also sets "purge": true. The Y days count from the newest version's updated_on,
+# which any property or tag edit moves forward, so an edit postpones the deletion.
+ITEM_TYPES = ('key', 'secret', 'certificate')
+RULES = ('keep_newest', 'disable_after_days', 'delete_disabled_items_after_days')
+POLICY_FIELDS = ('name', 'types', 'names', 'tags', 'purge') + RULES
+
+def _disable_key_version(name, version):
+    return get_key_client().update_key_properties(name, version=version, enabled=False).properties
+
+def _disable_secret_version(name, version):
+    return get_secret_client().update_secret_properties(name, version=version, enabled=False)
+
+def _disable_certificate_version(name, version):
+    return get_certificate_client().update_certificate_properties(certificate_name=name, version=version, enabled=False).properties
+
+_disablers = {'key': _disable_key_version, 'secret': _disable_secret_version, 'certificate': _disable_certificate_version}
+
+def parse_policies(document):
+    """
+    Validates a retention document ({"policies": [...]}) and returns the policies as dicts with
+    every field present. Raises ValueError describing the first problem found.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get('policies'), list):
+        raise ValueError("Retention config must be an object with a 'policies' list")
+    policies = []
+    for i, raw in enumerate(document['policies'], 1):
+        if not isinstance(raw, dict):
+            raise ValueError(f"Policy #{i} must be an object")
+        label = raw.get('name') or f"#{i}"
+        unknown = set(raw) - set(POLICY_FIELDS)
+        if unknown:
+            raise ValueError(f"Policy {label}: unknown field(s) {', '.join(sorted(unknown))}")
+        policy = {field: raw.get(field) for field in POLICY_FIELDS}
+        policy['name'] = str(label)
+        policy['types'] = list(policy['types'] or ITEM_TYPES)
+        if any(t not in ITEM_TYPES for t in policy['types']):
+            raise ValueError(f"Policy {label}: types must be among {', '.join(ITEM_TYPES)}")
+        policy['names'] = list(policy['names'] or ['*'])
+        if policy['tags'] is not None:
+            policy['query'] = parse_query(policy['tags'])
+        for rule in RULES:
+            value = policy[rule]
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise ValueError(f"Policy {label}: {rule} must be a non-negative integer")
+        if policy['keep_newest'] == 0:
+            raise ValueError(f"Policy {label}: keep_newest must be at least 1")
+        if all(policy[rule] is None for rule in RULES):
+            raise ValueError(f"Policy {label}: needs at least one of {', '.join(RULES)}")
+        policy['purge'] = policy['purge'] or False
+        if not isinstance(policy['purge'], bool):
+            raise ValueError(f"Policy {label}: purge must be true or false")
+        if policy['purge'] and policy['delete_disabled_items_after_days'] is None:
+            raise ValueError(f"Policy {label}: purge needs delete_disabled_items_after_days")
+        policies.append(policy)
+    return policies
+
+def load_policies(path):
+    with open(path) as f:
+        return parse_policies(json.load(f))
+
+def _newest_first(versions):
+    return sorted(versions, key=lambda v: (v.created_on is not None, v.created_on), reverse=True)
+
+def evaluate_versions(policy, versions, now=None):
+    """
+    Applies one policy's rules to the versions of one item, without calling the vault.
+    Returns [(action, version or None, reason), ...] where action is 'disable', or 'delete' (or
+    'purge' when the policy opts into purging) for a whole item.
+    """
+    now = now or datetime.now(timezone.utc)
+    versions = _newest_first(versions)
+    if not versions:
+        return []
+
+    if not any(v.enabled for v in versions):
+        days = policy['delete_disabled_items_after_days']
+        updated = max((v.updated_on for v in versions if v.updated_on), default=None)
+        if days is not None and updated is not None and updated <= now - timedelta(days=days):
+            return [('purge' if policy['purge'] else 'delete', None, f"all versions disabled for more than {days} day(s)")]
+        return []
+
+    actions = []
+    kept = 0
+    cutoff = now - timedelta(days=policy['disable_after_days']) if policy['disable_after_days'] is not None else None
+    for v in versions:
+        if not v.enabled:
+            continue
+        kept += 1
+        if kept == 1:
+            continue
+        if policy['keep_newest'] is not None and kept > policy['keep_newest']:
+            actions.append(('disable', v.version, f"beyond the {policy['keep_newest']} newest enabled"))
+        elif cutoff is not None and v.created_on is not None and v.created_on < cutoff:
+            actions.append(('disable', v.version, f"older than {policy['disable_after_days']} day(s)"))
+    return actions
+
+def _select(policies, item_type):
+    """
+    Returns {name: policy} for the items of one type, each with the first policy that matches it.
+    """
+    selected = {}
+    policies = [p for p in policies if item_type in p['types']]
+    if not policies:
+        return selected
+    items = get_inventory(item_type, refresh=True)
+    for policy in policies:
+        matched = evaluate(get_tag_index(item_type), policy['query']) if policy['tags'] is not None else None
+        for item in items:
+            # Keys and secrets backing a certificate follow the certificate's versions
+            if item.name in selected or getattr(item, 'managed', False):
+                continue
+            if matched is not None and item.name not in matched:
+                continue
+            if any(fnmatch.fnmatch(item.name.lower(), pattern.lower()) for pattern in policy['names']):
+                selected[item.name] = policy
+    return selected
+
+@instrumented('vault')
+def plan_retention(policies, item_types=ITEM_TYPES, now=None, max_workers=None):
+    """
+    Lists the versions of every item a policy selects, concurrently in one pass, and evaluates the
+    rules locally. Returns (plan, errors): plan is a list of {'type', 'name', 'version', 'action',
+    'policy', 'reason'} dicts sorted by type and name, errors a list of {'type', 'name', 'error'}.
+    """
+    targets = []
+    for item_type in item_types:
+        targets.extend((item_type, name, policy) for name, policy in _select(policies, item_type).items())
+
+    def list_target(target):
+        item_type, name, _ = target
+        return list_versions(item_type, name)
+
+    plan = []
+    errors = []
+    for (item_type, name, policy), versions, error in run_parallel(list_target, targets, max_workers):
+        if error is not None:
+            errors.append({'type': item_type, 'name': name, 'error': str(error)})
+            continue
+        for action, version, reason in evaluate_versions(policy, versions, now):
+            plan.append({'type': item_type, 'name': name, 'version': version, 'action': action,
+                         'policy': policy['name'], 'reason': reason})
+    plan.sort(key=lambda entry: (ITEM_TYPES.index(entry['type']), entry['name'].lower(), entry['version'] or ''))
+    return plan, errors
+
+@instrumented('vault')
+def apply_retention(plan, max_workers=None):
+    """
+    Applies a plan from plan_retention: version disables run in parallel, then the item deletes
+    (and purges, for policies that opt in).
+    Returns the plan entries, each with 'status' ('ok' or 'failed') and 'error' added.
+    """
+    disables = [entry for entry in plan if entry['action'] == 'disable']
+
+    def disable(entry):
+        return _disablers[entry['type']](entry['name'], entry['version'])
+
+    results = []
+    for entry, properties, error in run_parallel(disable, disables, max_workers):
+        if error is None:
+            patch_version(entry['type'], entry['name'], properties)
+        results.append(dict(entry, status='ok' if error is None else 'failed', error=None if error is None else str(error)))
+    for item_type in ITEM_TYPES:
+        if any(entry['type'] == item_type for entry in disables):
+            invalidate_inventory(item_type)
+
+    for item_type in ITEM_TYPES:
+        for action, remove in (('delete', bulk_delete), ('purge', delete_and_purge)):
+            removals = [entry for entry in plan if entry['action'] == action and entry['type'] == item_type]
+            if not removals:
+                continue
+            summary = {r['name']: r for r in remove(item_type, [entry['name'] for entry in removals], max_workers)}
+            for entry in removals:
+                outcome = summary.get(entry['name'], {'status': 'failed', 'error': "not processed"})
+                results.append(dict(entry, status=outcome['status'], error=outcome['error']))
+
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    print(f"Retention applied: {len(results) - failed} of {len(results)} change(s) made.")
+    return results
+
+def print_plan(plan, errors=()):
+    for entry in plan:
+        target = f"{entry['name']}/{entry['version']}" if entry['version'] else entry['name']
+        print(f"{entry['action']}: {entry['type']} {target} ({entry['policy']}: {entry['reason']})")
+    for error in errors:
+        print(f"Error listing versions of {error['type']} '{error['name']}': {error['error']}")
+    counts = {action: sum(1 for entry in plan if entry['action'] == action) for action in ('disable', 'delete', 'purge')}
+    print(f"{counts['disable']} version(s) to disable, {counts['delete']} item(s) to delete, "
+          f"{counts['purge']} item(s) to delete and purge.")
+
+def apply_retention_file(path, dry_run=False, item_types=ITEM_TYPES, max_workers=None):
+    """
+    Loads policies from a JSON file, prints the plan and, unless dry_run, applies it.
+    Returns (plan, errors) for a dry run and (results, errors) otherwise; when the policies cannot
+    be loaded or the items listed, the list is empty and errors holds one entry naming the file.
+    """
+    try:
+        policies = load_policies(path)
+        plan, errors = plan_retention(policies, item_types, max_workers=max_workers)
+    except Exception as e:
+        print(f"Error evaluating retention policies: {e}")
+        return [], [{'type': None, 'name': path, 'error': str(e)}]
+    print_plan(plan, errors)
+    if dry_run or not plan:
+        return plan, errors
+    return apply_retention(plan, max_workers), errors
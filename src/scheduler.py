@@ -0,0 +1,238 @@
+import os
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from azure.core.pipeline.policies import HTTPPolicy, AsyncHTTPPolicy
+
+# Every client built by auth.py (and aio/auth.py) carries a SchedulerPolicy, so all requests,
+# including each SDK retry, take a token from a bucket shared per (vault host, operation class)
+# before they are sent. Key Vault throttles per vault, so one bucket per vault keeps the whole
+# process under the limit no matter how many threads or tasks are issuing calls.
+#
+# Limits are requests per second per class, set with KV_RATE_LIMITS ("read=250,write=50,crypto=100",
+# which adds up to the documented 4,000 transactions per 10 seconds). A 429 pauses the bucket for
+# Retry-After (or a jittered exponential backoff) and halves its rate; each success then raises the
+# rate again in small steps, so throughput settles just under the service limit.
+INTERACTIVE = 0
+BULK = 1
+
+DEFAULT_RATES = {'read': 250.0, 'write': 50.0, 'crypto': 100.0}
+CRYPTO_OPERATIONS = ('/encrypt', '/decrypt', '/sign', '/verify', '/wrapkey', '/unwrapkey')
+# Share of each bucket that bulk work leaves untouched for interactive calls
+INTERACTIVE_RESERVE = 0.1
+MIN_RATE_FACTOR = 0.05
+RECOVERY_STEP = 0.02
+MAX_BACKOFF = 30
+
+_priority = contextvars.ContextVar('kv_priority', default=INTERACTIVE)
+
+def _parse_rates(value):
+    rates = dict(DEFAULT_RATES)
+    for part in (value or "").split(','):
+        name, sep, rate = part.partition('=')
+        if sep and name.strip() in rates:
+            try:
+                rates[name.strip()] = max(float(rate), 0.1)
+            except ValueError:
+                pass
+    return rates
+
+RATES = _parse_rates(os.getenv("KV_RATE_LIMITS"))
+
+def current_priority():
+    return _priority.get()
+
+@contextmanager
+def priority(level):
+    """
+    Runs the enclosed calls at the given priority (INTERACTIVE or BULK) in this thread or task.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def classify(request):
+    """
+    Maps an HTTP request to 'read', 'write' or 'crypto'.
+    """
+    path = urlparse(request.url).path.lower().rstrip('/')
+    if request.method == 'POST' and path.endswith(CRYPTO_OPERATIONS):
+        return 'crypto'
+    if request.method in ('GET', 'HEAD'):
+        return 'read'
+    return 'write'
+
+class TokenBucket:
+    """
+    Token bucket with an adaptive rate, a shared pause for throttling, and priorities:
+    bulk callers leave INTERACTIVE_RESERVE of the capacity alone and wait while any
+    interactive caller is waiting.
+    """
+
+    def __init__(self, rate):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.throttle_streak = 0
+        self.interactive_waiting = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, level=INTERACTIVE):
+        """
+        Takes a token and returns 0, or returns how long to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            floor = 0.0
+            if level != INTERACTIVE:
+                if self.interactive_waiting:
+                    return 1.0 / self.rate
+                floor = self.capacity * INTERACTIVE_RESERVE
+            if self.tokens - 1 >= floor:
+                self.tokens -= 1
+                return 0.0
+            return (floor + 1 - self.tokens) / self.rate
+
+    def _wait_started(self, level):
+        if level == INTERACTIVE:
+            with self._lock:
+                self.interactive_waiting += 1
+
+    def _wait_finished(self, level, waited):
+        with self._lock:
+            self.waited += waited
+            if level == INTERACTIVE:
+                self.interactive_waiting -= 1
+
+    def acquire(self, level=INTERACTIVE):
+        delay = self.try_acquire(level)
+        if not delay:
+            return 0.0
+        start = time.monotonic()
+        self._wait_started(level)
+        try:
+            while delay:
+                time.sleep(delay)
+                delay = self.try_acquire(level)
+        finally:
+            waited = time.monotonic() - start
+            self._wait_finished(level, waited)
+        return waited
+
+    async def acquire_async(self, level=INTERACTIVE):
+        delay = self.try_acquire(level)
+        if not delay:
+            return 0.0
+        start = time.monotonic()
+        self._wait_started(level)
+        try:
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self.try_acquire(level)
+        finally:
+            waited = time.monotonic() - start
+            self._wait_finished(level, waited)
+        return waited
+
+    def record(self, status_code, retry_after=None):
+        """
+        Feeds a response back: 429 pauses the bucket and halves the rate, anything else
+        lets the rate climb back towards the configured maximum.
+        """
+        with self._lock:
+            if status_code == 429:
+                self.throttle_streak += 1
+                delay = retry_after
+                if delay is None:
+                    delay = min(2 ** (self.throttle_streak - 1), MAX_BACKOFF) * random.uniform(0.5, 1.0)
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                self.rate = max(self.rate / 2, self.max_rate * MIN_RATE_FACTOR)
+                self.tokens = min(self.tokens, 0.0)
+            else:
+                self.throttle_streak = 0
+                if self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+_buckets_lock = threading.Lock()
+_buckets = {}
+
+def get_bucket(host, operation_class):
+    key = (host.lower(), operation_class)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(RATES[operation_class])
+        return bucket
+
+def reset():
+    """
+    Drops every bucket (and its learned rate). Mainly for tests and after changing RATES.
+    """
+    with _buckets_lock:
+        _buckets.clear()
+
+def stats():
+    """
+    Returns one dict per bucket: vault host, class, current and configured rate, total wait.
+    """
+    with _buckets_lock:
+        items = list(_buckets.items())
+    return [
+        {'vault': host, 'class': operation_class, 'rate': round(bucket.rate, 1),
+         'max_rate': bucket.max_rate, 'waited_seconds': round(bucket.waited, 3)}
+        for (host, operation_class), bucket in sorted(items)
+    ]
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+def _bucket_for(request):
+    http_request = request.http_request
+    return get_bucket(urlparse(http_request.url).netloc, classify(http_request))
+
+class SchedulerPolicy(HTTPPolicy):
+    """
+    Per-retry pipeline policy that rate-limits requests through the shared buckets.
+    """
+
+    def send(self, request):
+        bucket = _bucket_for(request)
+        bucket.acquire(current_priority())
+        response = self.next.send(request)
+        http_response = response.http_response
+        bucket.record(http_response.status_code, _retry_after(http_response))
+        return response
+
+class AsyncSchedulerPolicy(AsyncHTTPPolicy):
+    """
+    Async variant of SchedulerPolicy; waits with asyncio.sleep so the event loop keeps running.
+    """
+
+    async def send(self, request):
+        bucket = _bucket_for(request)
+        await bucket.acquire_async(current_priority())
+        response = await self.next.send(request)
+        http_response = response.http_response
+        bucket.record(http_response.status_code, _retry_after(http_response))
+        return response
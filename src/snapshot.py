@@ -0,0 +1,145 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from .auth import get_vault_url
+
+# Local SQLite copy of the properties returned by list_properties_of_*, so a fresh start can show
+# the item list before the vault has been listed again. Only rows whose version id or updated_on
+# changed are rewritten on refresh.
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "kv-mgmt", "snapshot.db")
+
+_FIELDS = ('name', 'id', 'version', 'enabled', 'created_on', 'updated_on',
+           'expires_on', 'not_before', 'content_type', 'tags')
+_DATE_FIELDS = ('created_on', 'updated_on', 'expires_on', 'not_before')
+
+_path = None
+_lock = threading.Lock()
+
+class SnapshotItem:
+    """
+    Stand-in for the SDK *Properties objects, rebuilt from a snapshot row.
+    """
+    __slots__ = _FIELDS
+
+    def __init__(self, **values):
+        for field in _FIELDS:
+            setattr(self, field, values.get(field))
+
+def enable(path=None):
+    """
+    Turns the snapshot on. The path defaults to KV_SNAPSHOT_PATH, then ~/.cache/kv-mgmt/snapshot.db;
+    setting KV_SNAPSHOT_PATH to an empty string keeps it off. Returns True if the snapshot is enabled,
+    False when it is off or its file cannot be created.
+    """
+    global _path
+    if path is None:
+        path = os.getenv("KV_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+    if not path:
+        return False
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _path = path
+        _connect().close()
+    except (OSError, sqlite3.Error):
+        # An unusable snapshot location only costs the fast start, never the session
+        _path = None
+        return False
+    return True
+
+def disable():
+    global _path
+    _path = None
+
+def is_enabled():
+    return _path is not None
+
+def _connect():
+    conn = sqlite3.connect(_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS items ("
+        " vault TEXT NOT NULL, item_type TEXT NOT NULL, name TEXT NOT NULL,"
+        " id TEXT, version TEXT, enabled INTEGER,"
+        " created_on TEXT, updated_on TEXT, expires_on TEXT, not_before TEXT,"
+        " content_type TEXT, tags TEXT,"
+        " PRIMARY KEY (vault, item_type, name))"
+    )
+    return conn
+
+def _vault_key(vault_url):
+    return get_vault_url(vault_url).rstrip('/').lower()
+
+def _to_row(item):
+    row = {field: getattr(item, field, None) for field in _FIELDS}
+    for field in _DATE_FIELDS:
+        if row[field] is not None:
+            row[field] = row[field].isoformat()
+    if row['enabled'] is not None:
+        row['enabled'] = int(bool(row['enabled']))
+    row['tags'] = json.dumps(row['tags']) if row['tags'] else None
+    return row
+
+def _from_row(row):
+    values = dict(zip(_FIELDS, row))
+    for field in _DATE_FIELDS:
+        if values[field]:
+            values[field] = datetime.fromisoformat(values[field])
+    if values['enabled'] is not None:
+        values['enabled'] = bool(values['enabled'])
+    values['tags'] = json.loads(values['tags']) if values['tags'] else None
+    return SnapshotItem(**values)
+
+def load(item_type, vault_url=None):
+    if not is_enabled():
+        return []
+    vault = _vault_key(vault_url)
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(_FIELDS)} FROM items WHERE vault = ? AND item_type = ? ORDER BY name",
+            (vault, item_type)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_from_row(row) for row in rows]
+
+def save(item_type, items, vault_url=None):
+    """
+    Brings the stored rows for item_type in line with items.
+    Returns (rows written, rows removed).
+    """
+    if not is_enabled():
+        return 0, 0
+    vault = _vault_key(vault_url)
+    rows = {}
+    for item in items:
+        row = _to_row(item)
+        rows[row['name']] = row
+
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                existing = {
+                    name: (item_id, updated_on)
+                    for name, item_id, updated_on in conn.execute(
+                        "SELECT name, id, updated_on FROM items WHERE vault = ? AND item_type = ?",
+                        (vault, item_type)
+                    )
+                }
+                changed = [row for name, row in rows.items() if existing.get(name) != (row['id'], row['updated_on'])]
+                removed = [name for name in existing if name not in rows]
+
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO items (vault, item_type, {', '.join(_FIELDS)}) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in _FIELDS)})",
+                    [(vault, item_type) + tuple(row[field] for field in _FIELDS) for row in changed]
+                )
+                conn.executemany(
+                    "DELETE FROM items WHERE vault = ? AND item_type = ? AND name = ?",
+                    [(vault, item_type, name) for name in removed]
+                )
+        finally:
+            conn.close()
+    return len(changed), len(removed)
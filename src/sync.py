@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from .auth import get_secret_client
+from .workers import run_parallel, call_with_retry
+from .metrics import instrumented
+
+# Only secrets are synced: key material is not exportable and certificates carry their
+# own private keys, so those are mirrored with backup/restore instead.
+
+def _list(vault_url):
+    client = get_secret_client(vault_url)
+    # Secrets backing a certificate are managed by the certificate and cannot be set directly.
+    # Keyed by lower-case name: Key Vault names are case-insensitive, so "DB-pw" and "db-pw" are one secret
+    return {s.name.lower(): s for s in client.list_properties_of_secrets() if not s.managed}
+
+def _properties_differ(source, target):
+    return (
+        (source.tags or {}) != (target.tags or {})
+        or source.enabled != target.enabled
+        or source.content_type != target.content_type
+    )
+
+@instrumented('secret')
+def plan_secret_sync(source_url, target_url, max_workers=None):
+    """
+    Compares the secrets of two vaults by name, tags, enabled state and value.
+    Returns (plan, errors): plan is a list of {'name', 'action', 'reason', 'source'} dicts where
+    action is 'create', 'update-value' or 'update-properties' and source holds the source secret's
+    properties; errors is a list of {'name', 'error'} dicts for secrets that could not be compared.
+    Values are only read for secrets present and enabled in both vaults. An enabled source secret
+    whose target value cannot be read (disabled, or forbidden) gets 'update-value', so enabling
+    the target never brings a stale value back into use.
+    """
+    from azure.core.exceptions import HttpResponseError
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        source_future = pool.submit(_list, source_url)
+        target_future = pool.submit(_list, target_url)
+        source, target = source_future.result(), target_future.result()
+
+    plan = []
+    to_compare = []
+    for key, props in source.items():
+        name = props.name
+        if key not in target:
+            if props.enabled:
+                plan.append({'name': name, 'action': 'create', 'reason': "missing in target", 'source': props})
+            else:
+                print(f"Skipping disabled secret '{name}': its value cannot be read.")
+        elif props.enabled and target[key].enabled:
+            to_compare.append(name)
+        elif props.enabled:
+            plan.append({'name': name, 'action': 'update-value', 'reason': "disabled in target", 'source': props})
+        elif _properties_differ(props, target[key]):
+            plan.append({'name': name, 'action': 'update-properties', 'reason': "tags/enabled/content type differ", 'source': props})
+
+    source_client = get_secret_client(source_url)
+    target_client = get_secret_client(target_url)
+
+    # Returns why the value must be written, or None when the values match
+    def compare(name):
+        source_value = call_with_retry(source_client.get_secret, name).value
+        try:
+            target_value = call_with_retry(target_client.get_secret, name).value
+        except HttpResponseError as e:
+            if e.status_code != 403:
+                raise
+            return "target value cannot be read"
+        return "value differs" if source_value != target_value else None
+
+    errors = []
+    for name, reason, error in run_parallel(compare, to_compare, max_workers):
+        if error is not None:
+            print(f"Error comparing secret '{name}': {error}")
+            errors.append({'name': name, 'error': str(error)})
+        elif reason is not None:
+            plan.append({'name': name, 'action': 'update-value', 'reason': reason, 'source': source[name.lower()]})
+        elif _properties_differ(source[name.lower()], target[name.lower()]):
+            plan.append({'name': name, 'action': 'update-properties', 'reason': "tags/enabled/content type differ", 'source': source[name.lower()]})
+
+    plan.sort(key=lambda item: item['name'].lower())
+    return plan, errors
+
+@instrumented('secret')
+def apply_secret_sync(source_url, target_url, plan, max_workers=None):
+    """
+    Applies a plan from plan_secret_sync concurrently. Returns {'name', 'error'} dicts for the
+    changes that failed.
+    """
+    source_client = get_secret_client(source_url)
+    target_client = get_secret_client(target_url)
+
+    def apply(item):
+        name = item['name']
+        props = item['source']
+        if item['action'] == 'update-properties':
+            call_with_retry(
+                target_client.update_secret_properties, name,
+                tags=props.tags or {}, content_type=props.content_type, enabled=props.enabled
+            )
+        else:
+            # Values are re-read here rather than kept from the comparison, so they never pile up in memory
+            secret = call_with_retry(source_client.get_secret, name)
+            call_with_retry(
+                target_client.set_secret, name, secret.value,
+                tags=props.tags, content_type=props.content_type, enabled=props.enabled
+            )
+
+    failed = []
+    for item, _, error in run_parallel(apply, plan, max_workers):
+        if error is not None:
+            print(f"Error syncing secret '{item['name']}': {error}")
+            failed.append({'name': item['name'], 'error': str(error)})
+    print(f"Sync finished: {len(plan) - len(failed)} of {len(plan)} change(s) applied.")
+    return failed
+
+@instrumented('secret')
+def sync_secrets(source_url, target_url, dry_run=False, max_workers=None):
+    """
+    Makes the target vault's secrets match the source, writing only the differences.
+    Secrets that exist only in the target are left alone. Returns (plan, errors) where errors
+    lists the secrets that could not be compared or written, as {'name', 'error'} dicts.
+    """
+    try:
+        print(f"Comparing secrets: {source_url} -> {target_url}")
+        plan, errors = plan_secret_sync(source_url, target_url, max_workers)
+        for item in plan:
+            print(f"{item['action']}: {item['name']} ({item['reason']})")
+        if not plan and not errors:
+            print("Vaults are already in sync.")
+        if not dry_run and plan:
+            errors.extend(apply_secret_sync(source_url, target_url, plan, max_workers))
+        return plan, errors
+    except Exception as e:
+        print(f"Error syncing secrets: {e}")
+        return [], [{'name': None, 'error': str(e)}]
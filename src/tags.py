@@ -0,0 +1,103 @@
+import shlex
+from .get import get_tag_index
+from .metrics import instrumented
+
+# Tag searches run against get.get_tag_index(), an inverted index built from the properties the
+# inventory already holds, so no item is fetched one by one. Tag edits patch the index in place
+# through get.patch_inventory_item().
+ITEM_TYPES = ('key', 'secret', 'certificate')
+
+def parse_query(query):
+    """
+    Parses a tag query into a list of OR-ed groups of AND-ed terms. A term is `key=value`,
+    `key!=value` or a bare `key` (has the tag); AND binds tighter than OR, e.g.
+    `owner=team-x AND env=prod OR owner=ops`. Quote values that contain spaces.
+    Returns [[(key, op, value), ...], ...] where op is '=', '!=' or 'has'.
+    """
+    try:
+        tokens = shlex.split(query)
+    except ValueError as e:
+        raise ValueError(f"Invalid tag query: {e}")
+    groups = [[]]
+    expect_term = True
+    for token in tokens:
+        operator = token.upper()
+        if operator in ('AND', 'OR'):
+            if expect_term:
+                raise ValueError(f"Invalid tag query: '{token}' needs a term before it")
+            if operator == 'OR':
+                groups.append([])
+            expect_term = True
+            continue
+        if not expect_term:
+            raise ValueError(f"Invalid tag query: missing AND/OR before '{token}'")
+        if '!=' in token:
+            key, _, value = token.partition('!=')
+            term = (key, '!=', value)
+        elif '=' in token:
+            key, _, value = token.partition('=')
+            term = (key, '=', value)
+        else:
+            key, value = token, None
+            term = (key, 'has', None)
+        if not key:
+            raise ValueError(f"Invalid tag query: missing tag name in '{token}'")
+        groups[-1].append(term)
+        expect_term = False
+    if expect_term:
+        raise ValueError("Invalid tag query: expected a tag condition")
+    return groups
+
+def evaluate(index, groups):
+    """
+    Returns the set of names in `index` matching parsed query groups.
+    """
+    matched = set()
+    everything = None
+    for group in groups:
+        result = None
+        for key, op, value in group:
+            if op == '=':
+                names = index.match(key, value)
+            elif op == 'has':
+                names = index.match(key)
+            else:
+                if everything is None:
+                    everything = index.names()
+                names = everything - index.match(key, value)
+            result = names if result is None else result & names
+            if not result:
+                break
+        matched |= result
+    return matched
+
+@instrumented('vault')
+def find_by_tags(query, item_types=ITEM_TYPES):
+    """
+    Returns [(item_type, name, tags), ...] for every item matching the query, sorted by type and name.
+    Raises ValueError for a malformed query.
+    """
+    groups = parse_query(query)
+    results = []
+    for item_type in item_types:
+        index = get_tag_index(item_type)
+        for name in sorted(evaluate(index, groups), key=str.lower):
+            results.append((item_type, name, index.tags(name)))
+    return results
+
+def search_tags(query, item_types=ITEM_TYPES):
+    """
+    Prints the items matching a tag query and returns them (see find_by_tags).
+    """
+    try:
+        results = find_by_tags(query, item_types)
+    except Exception as e:
+        print(f"Error searching tags: {e}")
+        return []
+    print(f"\n--- Items matching: {query} ---")
+    for item_type, name, tags in results:
+        tag_text = ", ".join(f"{k}={v}" for k, v in sorted(tags.items()))
+        print(f"{item_type.capitalize()}: {name} | Tags: {tag_text}")
+    if not results:
+        print("No matching items found.")
+    return results
@@ -0,0 +1,77 @@
+import os
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = int(os.getenv("KV_MAX_WORKERS", "8"))
+MAX_RETRIES = 5
+MAX_BACKOFF = 30
+
+def get_retry_after(error):
+    """
+    Returns the Retry-After delay in seconds carried by a throttled response, or None.
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+def is_throttled(error):
+    from azure.core.exceptions import HttpResponseError
+    return isinstance(error, HttpResponseError) and error.status_code == 429
+
+def call_with_retry(func, *args, retries=MAX_RETRIES, **kwargs):
+    """
+    Calls func, sleeping and retrying when the vault answers 429.
+    The SDK pipeline already retries a throttled request a few times; this covers
+    bursts that outlast it. Retry-After is honoured when present, otherwise the
+    delay backs off exponentially with jitter.
+    """
+    from azure.core.exceptions import HttpResponseError
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except HttpResponseError as e:
+            if not is_throttled(e) or attempt >= retries:
+                raise
+            delay = get_retry_after(e)
+            if delay is None:
+                delay = min(2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1.0)
+            time.sleep(delay)
+            attempt += 1
+
+def call_in_bulk(func, *args, **kwargs):
+    """
+    call_with_retry at bulk priority, for work submitted to a thread pool directly.
+    """
+    from .scheduler import priority, BULK
+    with priority(BULK):
+        return call_with_retry(func, *args, **kwargs)
+
+def run_parallel(func, items, max_workers=None, retry=True):
+    """
+    Runs func(item) for every item on a bounded thread pool, retrying throttled calls unless
+    retry=False (for functions that retry their own requests and must not be run twice).
+    The calls run at bulk priority, so the scheduler serves interactive requests first.
+    Returns (item, result, error) tuples in input order; error is None on success.
+    """
+    # Imported here to keep azure.core's pipeline out of startup
+    from .scheduler import priority, BULK
+    items = list(items)
+    if not items:
+        return []
+
+    def run_one(item):
+        with priority(BULK):
+            try:
+                return item, call_with_retry(func, item) if retry else func(item), None
+            except Exception as e:
+                return item, None, e
+
+    workers = min(max_workers or DEFAULT_WORKERS, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_one, items))
@@ -0,0 +1,169 @@
+import io
+import asyncio
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, timedelta
+from emulator.testing import EmulatorTestCase
+from src.aio import auth, executor, get, edit, delete
+
+class AsyncPager:
+    def __init__(self, items):
+        self._items = list(items)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            yield item
+
+def make_version(version, age_days, enabled=True):
+    v = MagicMock()
+    v.version = version
+    v.created_on = datetime.now() - timedelta(days=age_days)
+    v.enabled = enabled
+    return v
+
+class TestExecutor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_run_bounded_limits_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def work(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if item == 3:
+                raise ValueError("boom")
+            return item * 2
+
+        results = await executor.run_bounded(work, range(10), limit=3)
+
+        self.assertLessEqual(peak, 3)
+        self.assertEqual(results[0], 0)
+        self.assertEqual(results[9], 18)
+        self.assertIsInstance(results[3], ValueError)
+
+class TestAioOperations(unittest.IsolatedAsyncioTestCase):
+
+    @patch('src.aio.get.get_secret_client')
+    async def test_get_all_secrets(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        secret = MagicMock()
+        secret.name = "secret1"
+        mock_client.list_properties_of_secrets.return_value = AsyncPager([secret])
+
+        result = await get.get_all_secrets()
+
+        self.assertEqual(result, [secret])
+
+    @patch('src.aio.get.get_key_client')
+    async def test_get_versions_of_many(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_key_versions.side_effect = lambda name: AsyncPager([make_version(f"{name}-v1", 1)])
+
+        result = await get.get_versions_of_many('key', ["a", "b"])
+
+        self.assertEqual(sorted(result), ["a", "b"])
+        self.assertEqual(result["b"][0].version, "b-v1")
+
+    @patch('src.aio.edit.get_secret_client')
+    async def test_disable_all_but_newest_secret_version(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_client.update_secret_properties = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secret_versions.return_value = AsyncPager([
+            make_version("v1", 10), make_version("v3", 0), make_version("v2", 5), make_version("v0", 20, enabled=False)
+        ])
+
+        disabled = await edit.disable_all_but_newest_secret_version("test-secret")
+
+        self.assertEqual(sorted(disabled), ["v1", "v2"])
+        self.assertEqual(mock_client.update_secret_properties.await_count, 2)
+
+    @patch('src.aio.edit.get_key_client')
+    async def test_disable_key_version_partial_failure(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_key_versions.return_value = AsyncPager([
+            make_version("v1", 0), make_version("v2", 1), make_version("v3", 2)
+        ])
+
+        async def update(name, version, enabled):
+            if version == "v3":
+                raise RuntimeError("boom")
+
+        mock_client.update_key_properties = AsyncMock(side_effect=update)
+
+        disabled = await edit.disable_all_but_newest_key_version("test-key")
+
+        self.assertEqual(disabled, ["v2"])
+
+    @patch('src.aio.delete.get_secret_client')
+    async def test_delete_secret(self, mock_get_client):
+        mock_client = MagicMock()
+        deleted = MagicMock()
+        deleted.name = "test-secret"
+        mock_client.delete_secret = AsyncMock(return_value=deleted)
+        mock_get_client.return_value = mock_client
+
+        result = await delete.delete_secret("test-secret")
+
+        self.assertIs(result, deleted)
+        mock_client.delete_secret.assert_awaited_once_with("test-secret")
+
+    @patch('src.aio.edit.get_secret_client')
+    async def test_update_secret_value_reports_disable_errors(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        new = MagicMock()
+        new.name = "test-secret"
+        new.properties.version = "v3"
+        mock_client.set_secret = AsyncMock(return_value=new)
+        mock_client.list_properties_of_secret_versions.return_value = AsyncPager([
+            make_version("v1", 10), make_version("v2", 5), make_version("v3", 0)
+        ])
+
+        async def update(name, version, enabled):
+            if version == "v1":
+                raise RuntimeError("boom")
+
+        mock_client.update_secret_properties = AsyncMock(side_effect=update)
+
+        with redirect_stdout(io.StringIO()) as out:
+            result = await edit.update_secret_value("test-secret", "value")
+
+        self.assertIs(result, new)
+        self.assertIn("Error disabling 1 old version(s): boom", out.getvalue())
+
+class TestAioAgainstEmulator(EmulatorTestCase):
+    """
+    The async clients honour auth.configure(), so they reach the emulator like the sync ones.
+    """
+
+    def run_async(self, coro):
+        async def run():
+            try:
+                with redirect_stdout(io.StringIO()):
+                    return await coro
+            finally:
+                await auth.close_clients()
+        return asyncio.run(run())
+
+    def test_disable_all_but_newest_secret_version(self):
+        name = self.vault.seed('secret', 1, versions=3)[0]
+
+        disabled = self.run_async(edit.disable_all_but_newest_secret_version(name))
+
+        versions = self.vault.versions('secret', name)
+        self.assertEqual(sorted(disabled), sorted(v['version'] for v in versions[:2]))
+        self.assertEqual([v['enabled'] for v in versions], [False, False, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src import auth
+
+ENV = {
+    "AZURE_TENANT_ID": "tenant",
+    "AZURE_CLIENT_ID": "client",
+    "AZURE_CLIENT_SECRET": "secret",
+    "KEY_VAULT_URL": "https://kv.vault.azure.net/",
+}
+
+@patch.dict(os.environ, ENV)
+class TestAuth(unittest.TestCase):
+
+    def setUp(self):
+        auth.reset_clients()
+
+    def tearDown(self):
+        auth.reset_clients()
+
+    @patch('src.auth.ClientSecretCredential')
+    @patch('src.auth.SecretClient')
+    def test_client_is_reused(self, mock_client_class, mock_credential_class):
+        first = auth.get_secret_client()
+        second = auth.get_secret_client()
+
+        self.assertIs(first, second)
+        mock_client_class.assert_called_once()
+        mock_credential_class.assert_called_once_with(tenant_id="tenant", client_id="client", client_secret="secret")
+
+    @patch('src.auth.ClientSecretCredential')
+    @patch('src.auth.KeyClient')
+    @patch('src.auth.SecretClient')
+    def test_one_client_per_vault_and_type(self, mock_secret_class, mock_key_class, mock_credential_class):
+        mock_secret_class.side_effect = lambda **kwargs: MagicMock()
+        mock_key_class.side_effect = lambda **kwargs: MagicMock()
+
+        default_secrets = auth.get_secret_client()
+        other_secrets = auth.get_secret_client("https://other.vault.azure.net/")
+        keys = auth.get_key_client()
+
+        self.assertIsNot(default_secrets, other_secrets)
+        self.assertIsNot(default_secrets, keys)
+        self.assertIs(auth.get_secret_client("https://KV.vault.azure.net"), default_secrets)
+        # All clients share the same credential
+        mock_credential_class.assert_called_once()
+
+    @patch('src.auth.ClientSecretCredential')
+    @patch('src.auth.CertificateClient')
+    def test_reset_clients(self, mock_client_class, mock_credential_class):
+        mock_client_class.side_effect = lambda **kwargs: MagicMock()
+
+        first = auth.get_certificate_client()
+        auth.reset_clients()
+        second = auth.get_certificate_client()
+
+        self.assertIsNot(first, second)
+        first.close.assert_called_once()
+        self.assertEqual(mock_credential_class.call_count, 2)
+
+    @patch('src.auth.ClientSecretCredential')
+    @patch('src.auth.SecretClient')
+    def test_concurrent_access_builds_one_client(self, mock_client_class, mock_credential_class):
+        mock_client_class.side_effect = lambda **kwargs: MagicMock()
+        results = []
+
+        def worker():
+            results.append(auth.get_secret_client())
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len({id(client) for client in results}), 1)
+        mock_client_class.assert_called_once()
+
+    def test_missing_vault_url(self):
+        with patch.dict(os.environ, {"KEY_VAULT_URL": ""}):
+            with self.assertRaises(ValueError):
+                auth.get_key_client()
+
+if __name__ == '__main__':
+    unittest.main()
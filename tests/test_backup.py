@@ -0,0 +1,81 @@
+import os
+import json
+import shutil
+import zipfile
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from src import backup, get
+
+def make_item(name, managed=False):
+    item = MagicMock()
+    item.name = name
+    item.managed = managed
+    return item
+
+@patch.dict(os.environ, {"KEY_VAULT_URL": "https://kv.vault.azure.net/"})
+class TestBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "backup.zip")
+        get.invalidate_inventory()
+
+    def tearDown(self):
+        get.invalidate_inventory()
+        shutil.rmtree(self.tmpdir)
+
+    def write_archive(self, names):
+        with zipfile.ZipFile(self.path, 'w') as archive:
+            items = []
+            for name in names:
+                entry = f"secret/{name}.bak"
+                archive.writestr(entry, f"blob-{name}".encode())
+                items.append({'type': 'secret', 'name': name, 'entry': entry})
+            archive.writestr(backup.INDEX_NAME, json.dumps({'items': items}))
+
+    @patch('src.backup.get_secret_client')
+    @patch('src.get.get_secret_client')
+    def test_backup_vault(self, mock_list_client, mock_get_client):
+        mock_client = MagicMock()
+        mock_list_client.return_value = mock_client
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = [make_item("s1"), make_item("s2"), make_item("cert", managed=True)]
+        mock_client.backup_secret.side_effect = lambda name: f"blob-{name}".encode()
+
+        index, errors = backup.backup_vault(self.path, item_types=('secret',))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(item['name'] for item in index), ["s1", "s2"])
+        self.assertEqual(sorted(call.args[0] for call in mock_client.backup_secret.call_args_list), ["s1", "s2"])
+        with zipfile.ZipFile(self.path) as archive:
+            self.assertEqual(archive.read("secret/s1.bak"), b"blob-s1")
+            stored = json.loads(archive.read(backup.INDEX_NAME))
+        self.assertEqual(len(stored['items']), 2)
+
+    @patch('src.backup.get_secret_client')
+    def test_restore_resumes_from_checkpoint(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        self.write_archive(["s1", "s2", "s3"])
+
+        def restore(blob):
+            if blob == b"blob-s3":
+                raise Exception("crash")
+        mock_client.restore_secret_backup.side_effect = restore
+
+        first, errors = backup.restore_vault(self.path)
+        self.assertEqual(sorted(first), ["secret/s1.bak", "secret/s2.bak"])
+        self.assertEqual(errors, [{'type': 'secret', 'name': "s3", 'error': "crash"}])
+        self.assertTrue(os.path.exists(self.path + ".checkpoint"))
+
+        mock_client.restore_secret_backup.side_effect = None
+        mock_client.restore_secret_backup.reset_mock()
+        second, errors = backup.restore_vault(self.path)
+
+        self.assertEqual((second, errors), (["secret/s3.bak"], []))
+        mock_client.restore_secret_backup.assert_called_once_with(b"blob-s3")
+        self.assertFalse(os.path.exists(self.path + ".checkpoint"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from azure.core.exceptions import HttpResponseError
+from src import bulk, get
+
+def make_item(name):
+    item = MagicMock()
+    item.name = name
+    return item
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        get.invalidate_inventory()
+
+    def tearDown(self):
+        get.invalidate_inventory()
+
+    @patch('src.get.get_secret_client')
+    def test_match_names(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = [
+            make_item("tmp-1"), make_item("TMP-2"), make_item("prod-db")
+        ]
+
+        names = bulk.match_names('secret', ["tmp-*", "prod-db", "explicit", "tmp-1"])
+
+        self.assertEqual(names, ["tmp-1", "TMP-2", "prod-db", "explicit"])
+
+    @patch('src.bulk.get_secret_client')
+    def test_bulk_delete_runs_all_pollers(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        def begin_delete(name):
+            if name == "bad":
+                raise HttpResponseError(message="Operation is not allowed, since it is associated with a certificate.")
+            return MagicMock()
+        mock_client.begin_delete_secret.side_effect = begin_delete
+
+        summary = bulk.bulk_delete('secret', ["a", "bad", "c"])
+
+        self.assertEqual([r['status'] for r in summary], ["ok", "failed", "ok"])
+        self.assertEqual(mock_client.begin_delete_secret.call_count, 3)
+
+    @patch('src.workers.time.sleep')
+    @patch('src.bulk.get_secret_client')
+    def test_throttled_delete_poll_does_not_resend_delete(self, mock_get_client, mock_sleep):
+        throttled = MagicMock(status_code=429, headers={})
+        poller = MagicMock()
+        poller.wait.side_effect = HttpResponseError(message="Too Many Requests", response=throttled)
+        mock_get_client.return_value.begin_delete_secret.side_effect = [
+            HttpResponseError(message="Too Many Requests", response=throttled), poller
+        ]
+
+        summary = bulk.bulk_delete('secret', ["a"])
+
+        self.assertEqual(summary[0]['status'], "failed")
+        # The throttled request is retried once; the throttled poll is not turned into a second delete
+        self.assertEqual(mock_get_client.return_value.begin_delete_secret.call_count, 2)
+
+    @patch('src.bulk.get_certificate_client')
+    def test_bulk_disable(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        summary = bulk.bulk_set_enabled('certificate', ["c1", "c2"], False)
+
+        self.assertEqual(len(summary), 2)
+        mock_client.update_certificate_properties.assert_any_call(certificate_name="c1", enabled=False)
+        mock_client.update_certificate_properties.assert_any_call(certificate_name="c2", enabled=False)
+
+    def test_merge_tags(self):
+        tags = bulk.merge_tags({"owner": "a", "env": "dev", "tmp": "1"},
+                               add={"env": "prod"}, remove=["tmp"], rename={"owner": "team"})
+
+        self.assertEqual(tags, {"team": "a", "env": "prod"})
+
+    @patch('src.bulk.get_secret_client')
+    @patch('src.get.get_secret_client')
+    def test_bulk_edit_tags_skips_unchanged_and_never_reads_values(self, mock_list_client, mock_get_client):
+        s1, s2 = make_item("s1"), make_item("s2")
+        s1.tags = {"env": "dev"}
+        s2.tags = {"env": "prod"}
+        mock_list_client.return_value.list_properties_of_secrets.return_value = [s1, s2]
+        mock_client = mock_get_client.return_value
+        mock_client.update_secret_properties.side_effect = lambda name, tags: MagicMock(tags=tags)
+
+        summary = bulk.bulk_edit_tags('secret', ["s1", "s2", "missing"], add={"env": "prod"})
+
+        self.assertEqual([r['status'] for r in summary], ["ok", "unchanged", "failed"])
+        mock_client.update_secret_properties.assert_called_once_with("s1", tags={"env": "prod"})
+        mock_client.get_secret.assert_not_called()
+        mock_list_client.return_value.get_secret.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
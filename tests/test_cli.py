@@ -0,0 +1,167 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from src import cli, get
+from tests.test_get import make_pager
+
+def make_props(name, enabled=True):
+    props = MagicMock()
+    props.name = name
+    props.id = f"https://kv.vault.azure.net/secrets/{name}/v1"
+    props.version = "v1"
+    props.enabled = enabled
+    props.created_on = datetime(2024, 1, 1)
+    props.updated_on = datetime(2024, 1, 2)
+    props.expires_on = None
+    props.not_before = None
+    props.content_type = None
+    props.tags = {"env": "prod"}
+    return props
+
+def run_cli(argv):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        code = cli.main(argv)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        get.invalidate_inventory()
+
+    def tearDown(self):
+        get.invalidate_inventory()
+
+    @patch('src.get.get_secret_client')
+    def test_secret_list_json(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = make_pager([make_props("s1")], [make_props("s2", enabled=False)])
+
+        code, out, _ = run_cli(["secret", "list", "--json"])
+
+        self.assertEqual(code, 0)
+        data = json.loads(out)
+        self.assertEqual([item['name'] for item in data], ["s1", "s2"])
+        self.assertEqual(data[0]['created_on'], "2024-01-01T00:00:00")
+        self.assertEqual(data[0]['tags'], {"env": "prod"})
+        self.assertFalse(data[1]['enabled'])
+
+    @patch('src.get.get_secret_client')
+    def test_list_with_limit_returns_continuation_token(self, mock_get_client):
+        mock_get_client.return_value.list_properties_of_secrets.return_value = make_pager(
+            [make_props("s1"), make_props("s2")], [make_props("s3")])
+
+        code, out, _ = run_cli(["secret", "list", "--limit", "1", "--json"])
+        data = json.loads(out)
+        code, out, _ = run_cli(["secret", "list", "--continuation-token", data['continuation_token'], "--json"])
+        rest = json.loads(out)
+
+        self.assertEqual([item['name'] for item in data['items']], ["s1"])
+        self.assertEqual([item['name'] for item in rest['items']], ["s2", "s3"])
+        self.assertIsNone(rest['continuation_token'])
+
+    @patch('src.bulk.get_secret_client')
+    @patch('src.get.get_secret_client')
+    def test_tag_command(self, mock_list_client, mock_client):
+        mock_list_client.return_value.list_properties_of_secrets.return_value = [make_props("s1"), make_props("s2")]
+        mock_client.return_value.update_secret_properties.side_effect = lambda name, tags: make_props(name)
+
+        code, out, _ = run_cli(["secret", "tag", "s*", "--add", "owner=ops", "--remove", "env", "--json"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual([r['status'] for r in json.loads(out)], ["ok", "ok"])
+        mock_client.return_value.update_secret_properties.assert_any_call("s1", tags={"owner": "ops"})
+
+    @patch('src.get.get_secret_client')
+    def test_json_flag_before_subcommand(self, mock_get_client):
+        mock_get_client.return_value.list_properties_of_secrets.return_value = make_pager([])
+
+        code, out, _ = run_cli(["--json", "secret", "list"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), [])
+
+    @patch('src.edit.get_key_client')
+    def test_disable_old_json_keeps_progress_off_stdout(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        v1 = make_props("k1")
+        v1.version = "v1"
+        v2 = make_props("k1")
+        v2.version = "v2"
+        v2.created_on = datetime(2023, 1, 1)
+        mock_client.list_properties_of_key_versions.return_value = [v1, v2]
+
+        code, out, err = run_cli(["key", "disable-old", "k1", "--json"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), [{'version': 'v2', 'status': 'disabled', 'error': None}])
+        self.assertIn("Fetching versions", err)
+
+    @patch('src.bulk.get_secret_client')
+    def test_failed_delete_sets_exit_code(self, mock_get_client):
+        mock_get_client.return_value.begin_delete_secret.side_effect = Exception("boom")
+
+        code, out, _ = run_cli(["secret", "delete", "s1", "--json"])
+
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out)[0]['status'], "failed")
+
+    @patch('src.cli.metrics.write_prometheus')
+    @patch('src.bulk.get_secret_client')
+    def test_stats_and_metrics_file(self, mock_get_client, mock_write):
+        code, out, err = run_cli(["--stats", "--metrics-file", "kv.prom", "secret", "delete", "s1", "--json"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)[0]['status'], "ok")
+        self.assertIn("Operation Statistics", err)
+        self.assertIn("bulk_delete", err)
+        mock_write.assert_called_once_with("kv.prom")
+
+    @patch('src.get.get_key_client')
+    @patch('src.edit.get_key_client')
+    def test_listing_errors_set_exit_code(self, mock_edit_client, mock_get_client):
+        mock_edit_client.return_value.list_properties_of_key_versions.side_effect = Exception("forbidden")
+        mock_get_client.return_value.list_properties_of_key_versions.side_effect = Exception("forbidden")
+
+        self.assertEqual(run_cli(["key", "versions", "k1", "--json"])[0], 1)
+        self.assertEqual(run_cli(["key", "disable-old", "k1", "--json"])[0], 1)
+
+    def test_unreadable_archive_fails_backup_and_restore(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "missing", "vault.zip")
+
+            code, out, err = run_cli(["restore", path, "--json"])
+
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out)['errors'][0]['name'], path)
+        self.assertIn("Error restoring backup", err)
+
+    @patch('src.cli.get_vault_url', return_value="https://source.vault.azure.net/")
+    @patch('src.cli.sync.plan_secret_sync', return_value=([], [{'name': "s1", 'error': "forbidden"}]))
+    def test_sync_errors_set_exit_code(self, mock_plan, mock_url):
+        code, out, _ = run_cli(["sync-secrets", "https://target.vault.azure.net/", "--json"])
+
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out), {'plan': [], 'errors': [{'name': "s1", 'error': "forbidden"}]})
+
+    def test_retention_with_invalid_config_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "retention.json")
+            with open(path, "w") as f:
+                json.dump({'policies': [{'names': ["app-*"]}]}, f)
+
+            code, out, err = run_cli(["retention", path, "--dry-run", "--json"])
+
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out)['changes'], [])
+        self.assertIn("needs at least one of", err)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+import threading
 from unittest.mock import MagicMock, patch, ANY
+from emulator.testing import EmulatorTestCase
 from src import create
 
 class TestCreate(unittest.TestCase):
@@ -77,5 +79,64 @@ class TestCreate(unittest.TestCase):
         self.assertIsNotNone(kwargs['policy'])
         self.assertEqual(kwargs['policy'].subject, "CN=mysubject")
 
+class TestCertificateManifest(unittest.TestCase):
+
+    def test_rejects_invalid_entries(self):
+        for document, message in (
+            ({'certificates': "web"}, "must be a list"),
+            ([{'name': "web"}], "needs a name and a subject"),
+            ([{'name': "web", 'subject': "web", 'policy': {'key_bits': 2048}}], "unknown field(s) key_bits"),
+            ([{'name': "web", 'subject': "a"}, {'name': "WEB", 'subject': "b"}], "more than once"),
+        ):
+            with self.assertRaises(ValueError) as raised:
+                create.parse_certificate_manifest(document)
+            self.assertIn(message, str(raised.exception))
+
+    def test_policy_overrides(self):
+        policy = create.certificate_policy("CN=api.example.com", key_type="EC", key_curve_name="P-256")
+
+        self.assertEqual(policy.subject, "CN=api.example.com")
+        self.assertEqual(policy.key_curve_name, "P-256")
+        self.assertIsNone(policy.key_size)
+
+class TestCreateCertificates(EmulatorTestCase):
+
+    def create(self, document, **kwargs):
+        progress = []
+        results = create.create_certificates(
+            create.parse_certificate_manifest(document), poll_interval=0.05, max_poll_interval=0.2,
+            on_progress=lambda counts, elapsed: progress.append(counts), **kwargs
+        )
+        return results, progress
+
+    def test_batch_is_issued(self):
+        self.vault.issuance_delay = 0.3
+        document = [{'name': f"web-{i}", 'subject': f"web-{i}.example.com"} for i in range(5)]
+        document[0]['policy'] = {'validity_months': 3}
+        document[0]['tags'] = {'env': "test"}
+
+        results, progress = self.create(document)
+
+        self.assertEqual([r['status'] for r in results], ["issued"] * 5)
+        self.assertEqual(progress[0], {'issued': 0, 'failed': 0, 'pending': 5})
+        self.assertEqual(progress[-1], {'issued': 5, 'failed': 0, 'pending': 0})
+        record = self.vault.latest('certificate', "web-0")
+        self.assertEqual(record['policy']['x509_props']['validity_months'], 3)
+        self.assertEqual(record['tags'], {'env': "test"})
+        # Five creates, and far fewer polls than one per 50 ms for each certificate
+        self.assertLess(self.emulator.stats()['requests'], 5 + 5 * 8)
+        # No SDK poller thread is left polling in the background
+        self.assertFalse(any(thread.name.startswith("LROPoller") for thread in threading.enumerate()))
+
+    def test_failed_start_and_timeout(self):
+        [taken] = self.vault.seed('certificate', 1, prefix="taken")
+        self.vault.delete('certificate', taken)
+        self.vault.issuance_delay = 5
+
+        results, _ = self.create([{'name': taken, 'subject': "a"}, {'name': "slow", 'subject': "b"}], timeout=0.3)
+
+        self.assertEqual([r['status'] for r in results], ["failed", "timed out"])
+        self.assertIn("deleted but recoverable", results[0]['error'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from azure.core.exceptions import HttpResponseError
+from src import deleted, workers
+
+def make_deleted(name):
+    item = MagicMock()
+    item.name = name
+    return item
+
+def conflict():
+    response = MagicMock()
+    response.status_code = 409
+    response.headers = {}
+    return HttpResponseError(message="Secret is currently being deleted.", response=response)
+
+def throttled():
+    response = MagicMock()
+    response.status_code = 429
+    response.headers = {}
+    return HttpResponseError(message="Too Many Requests", response=response)
+
+class TestDeleted(unittest.TestCase):
+
+    @patch('src.deleted.get_secret_client')
+    def test_list_deleted_secrets_streams_pages(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        pager = MagicMock()
+        pager.by_page.return_value = iter([[make_deleted("s1"), make_deleted("s2")], [make_deleted("s3")]])
+        mock_client.list_deleted_secrets.return_value = pager
+
+        items = deleted.list_deleted_secrets(page_size=2)
+
+        self.assertEqual([item.name for item in items], ["s1", "s2", "s3"])
+        mock_client.list_deleted_secrets.assert_called_once_with(max_page_size=2)
+
+    @patch('src.deleted.get_key_client')
+    def test_recover_deleted_waits_for_pollers(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        pollers = {}
+        mock_client.begin_recover_deleted_key.side_effect = lambda name: pollers.setdefault(name, MagicMock())
+
+        summary = deleted.recover_deleted('key', ["k1", "k2"])
+
+        self.assertEqual([r['status'] for r in summary], ["ok", "ok"])
+        for poller in pollers.values():
+            poller.wait.assert_called_once()
+            poller.result.assert_called_once()
+
+    @patch('src.workers.time.sleep')
+    @patch('src.deleted.get_key_client')
+    def test_throttled_recover_poll_does_not_resend_recover(self, mock_get_client, mock_sleep):
+        poller = MagicMock()
+        poller.wait.side_effect = throttled()
+        mock_get_client.return_value.begin_recover_deleted_key.side_effect = [throttled(), poller]
+
+        summary = deleted.recover_deleted('key', ["k1"])
+
+        self.assertEqual(summary[0]['status'], "failed")
+        self.assertEqual(mock_get_client.return_value.begin_recover_deleted_key.call_count, 2)
+
+    @patch('src.deleted.time.sleep')
+    @patch('src.bulk.get_secret_client')
+    @patch('src.deleted.get_secret_client')
+    def test_delete_and_purge_retries_conflict(self, mock_get_client, mock_bulk_client, mock_sleep):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_bulk_client.return_value = mock_client
+        mock_client.purge_deleted_secret.side_effect = [conflict(), None]
+
+        summary = deleted.delete_and_purge('secret', ["tmp-1"])
+
+        self.assertEqual(summary[0]['status'], "ok")
+        mock_client.begin_delete_secret.assert_called_once_with("tmp-1")
+        self.assertEqual(mock_client.purge_deleted_secret.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('src.workers.time.sleep')
+    @patch('src.deleted.get_secret_client')
+    def test_throttled_purge_is_retried_once_per_attempt(self, mock_get_client, mock_sleep):
+        mock_get_client.return_value.purge_deleted_secret.side_effect = throttled()
+
+        summary = deleted.purge_deleted('secret', ["s1"])
+
+        self.assertEqual(summary[0]['status'], "failed")
+        # One call plus MAX_RETRIES retries, not MAX_RETRIES retries of each retry
+        self.assertEqual(mock_get_client.return_value.purge_deleted_secret.call_count, workers.MAX_RETRIES + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from src import edit
+from src import edit, get
 
 class TestEdit(unittest.TestCase):
 
@@ -26,15 +26,14 @@ class TestEdit(unittest.TestCase):
             not_before=nb
         )
 
+    @patch('src.edit.find_inventory_item')
     @patch('src.edit.get_key_client')
-    def test_update_key_tags(self, mock_get_client):
+    def test_update_key_tags(self, mock_get_client, mock_find):
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
         
-        # Mock getting existing key
-        mock_existing_key = MagicMock()
-        mock_existing_key.properties.tags = {"old": "tag"}
-        mock_client.get_key.return_value = mock_existing_key
+        # Existing tags come from the listed properties
+        mock_find.return_value = MagicMock(tags={"old": "tag"})
 
         # Mock update return
         mock_updated_key = MagicMock()
@@ -44,8 +43,9 @@ class TestEdit(unittest.TestCase):
         new_tags = {"new": "tag"}
         edit.update_key_tags("test-key", new_tags)
 
-        # Verify get_key called
-        mock_client.get_key.assert_called_once_with("test-key")
+        # Verify the key itself was not fetched
+        mock_find.assert_called_once_with('key', "test-key", max_age=get.WRITE_MAX_AGE)
+        mock_client.get_key.assert_not_called()
         
         # Verify update called with merged tags
         expected_tags = {"old": "tag", "new": "tag"}
@@ -84,15 +84,14 @@ class TestEdit(unittest.TestCase):
         # Check update_secret_properties called only for v1
         mock_client.update_secret_properties.assert_called_once_with("test-secret", version="v1", enabled=False)
 
+    @patch('src.edit.find_inventory_item')
     @patch('src.edit.get_secret_client')
-    def test_update_secret_tags(self, mock_get_client):
+    def test_update_secret_tags(self, mock_get_client, mock_find):
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
         
-        # Mock getting existing secret
-        mock_existing_secret = MagicMock()
-        mock_existing_secret.properties.tags = {"env": "dev"}
-        mock_client.get_secret.return_value = mock_existing_secret
+        # Existing tags come from the listed properties
+        mock_find.return_value = MagicMock(tags={"env": "dev"})
 
         # Mock update return
         mock_updated_secret = MagicMock()
@@ -102,22 +101,21 @@ class TestEdit(unittest.TestCase):
         new_tags = {"env": "prod"} # Should overwrite
         edit.update_secret_tags("test-secret", new_tags)
 
-        # Verify get_secret called
-        mock_client.get_secret.assert_called_once_with("test-secret")
+        # Verify the secret value was never downloaded
+        mock_client.get_secret.assert_not_called()
         
         # Verify update called with merged tags
         expected_tags = {"env": "prod"}
         mock_client.update_secret_properties.assert_called_once_with("test-secret", tags=expected_tags)
 
+    @patch('src.edit.find_inventory_item')
     @patch('src.edit.get_certificate_client')
-    def test_update_certificate_tags(self, mock_get_client):
+    def test_update_certificate_tags(self, mock_get_client, mock_find):
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
         
-        # Mock getting existing cert
-        mock_existing_cert = MagicMock()
-        mock_existing_cert.properties.tags = None # No existing tags
-        mock_client.get_certificate.return_value = mock_existing_cert
+        # Existing tags come from the listed properties
+        mock_find.return_value = MagicMock(tags=None) # No existing tags
 
         mock_cert = MagicMock()
         mock_cert.name = "test-cert"
@@ -126,8 +124,8 @@ class TestEdit(unittest.TestCase):
         tags = {"env": "prod"}
         edit.update_certificate_tags("test-cert", tags)
 
-        # Verify get_certificate called
-        mock_client.get_certificate.assert_called_once_with(certificate_name="test-cert")
+        # Verify the certificate itself was not fetched
+        mock_client.get_certificate.assert_not_called()
 
         # Verify update called
         mock_client.update_certificate_properties.assert_called_once_with(certificate_name="test-cert", tags=tags)
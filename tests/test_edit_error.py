@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from azure.core.exceptions import HttpResponseError
-from src import edit
+from src import edit, get
 from datetime import datetime, timedelta
 
 class TestEditError(unittest.TestCase):
@@ -80,5 +80,15 @@ class TestEditError(unittest.TestCase):
             # Verify that the specific error message was printed
             mock_print.assert_any_call("Error: Secret 'test-secret' is associated with a certificate. Please manage the certificate versions instead.")
 
+    @patch('src.get.get_key_client')
+    @patch('src.edit.get_key_client')
+    def test_listing_errors_return_empty_lists(self, mock_edit_client, mock_get_client):
+        mock_edit_client.return_value.list_properties_of_key_versions.side_effect = Exception("forbidden")
+        mock_get_client.return_value.list_properties_of_key_versions.side_effect = Exception("forbidden")
+
+        with patch('builtins.print'):
+            self.assertEqual(edit.disable_all_but_newest_key_version("test-key"), [])
+            self.assertEqual(get.list_key_versions("test-key"), [])
+
 if __name__ == '__main__':
     unittest.main()
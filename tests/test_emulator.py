@@ -0,0 +1,240 @@
+import io
+import os
+import ssl
+import json
+import time
+import tempfile
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from emulator.testing import EmulatorTestCase
+from src import auth, get, create, edit, bulk, deleted, backup, metrics
+
+def quietly(func, *args, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+class TestListingAndVersions(EmulatorTestCase):
+
+    def test_listing_follows_next_links(self):
+        self.vault.seed('secret', 60)
+
+        items = get.get_all_secrets(refresh=True)
+
+        self.assertEqual(len(items), 60)
+        self.assertEqual(items[0].name, "secret-000000")
+        self.assertEqual(self.emulator.stats()['requests'], 3)
+
+    def test_limit_and_continuation_token(self):
+        self.vault.seed('key', 30)
+
+        first = [item.name for page, _ in get.iter_pages('key', page_size=10, limit=15) for item in page]
+        token = list(get.iter_pages('key', page_size=10, limit=15))[-1][1]
+        rest = [item.name for page, _ in get.iter_pages('key', page_size=10, continuation_token=token) for item in page]
+
+        self.assertEqual(len(first), 15)
+        self.assertEqual(first + rest, [f"key-{i:06d}" for i in range(30)])
+
+    def test_page_size_over_service_limit_is_rejected(self):
+        self.vault.seed('secret', 3)
+
+        with self.assertRaises(HttpResponseError) as raised:
+            list(auth.get_secret_client().list_properties_of_secrets(max_page_size=100))
+
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_disable_all_but_newest_version(self):
+        [name] = self.vault.seed('key', 1, versions=5)
+
+        summary = quietly(edit.disable_all_but_newest_key_version, name)
+
+        self.assertEqual(len(summary), 4)
+        versions = self.vault.versions('key', name)
+        self.assertEqual([v['enabled'] for v in versions], [False, False, False, False, True])
+
+    def test_versions_load_a_page_at_a_time(self):
+        [name] = self.vault.seed('key', 1, versions=60)
+
+        first, complete = get.get_versions('key', name, count=10)
+        after_first = self.emulator.stats()['requests']
+        more, _ = get.get_versions('key', name, count=30)
+
+        self.assertEqual((len(first), complete), (25, False))
+        self.assertEqual(len(more), 50)
+        self.assertEqual(self.emulator.stats()['requests'], after_first + 1)
+        self.assertEqual(more[0].created_on, max(v.created_on for v in more))
+
+    def test_version_updates_patch_the_cache(self):
+        [name] = self.vault.seed('secret', 1, versions=3)
+        versions, _ = get.get_versions('secret', name)
+        requests = self.emulator.stats()['requests']
+
+        quietly(edit.update_secret_version_properties, name, versions[0].version, False)
+        quietly(edit.disable_all_but_newest_secret_version, name)
+        quietly(create.create_secret, name, "rotated")
+        versions, complete = get.get_versions('secret', name)
+
+        # One update, one listing and two disables, then the new version; no re-list for the redraw
+        self.assertEqual(self.emulator.stats()['requests'], requests + 5)
+        self.assertTrue(complete)
+        self.assertEqual([v.enabled for v in versions], [True, False, False, False])
+        self.assertEqual([v.enabled for v in versions], [r['enabled'] for r in reversed(self.vault.versions('secret', name))])
+
+
+        quietly(create.create_secret, "db-password", "hunter2")
+        quietly(create.create_key, "signing", "EC", curve="P-256")
+
+        secret = auth.get_secret_client().get_secret("db-password")
+        key = auth.get_key_client().get_key("signing")
+        quietly(edit.update_secret_tags, "db-password", {"env": "prod"})
+
+        self.assertEqual(secret.value, "hunter2")
+        self.assertEqual(key.key_type, "EC")
+        self.assertEqual(self.vault.latest('secret', "db-password")['tags'], {"env": "prod"})
+
+class TestTagWrites(EmulatorTestCase):
+
+    def age_inventory(self, item_type):
+        # Still within the inventory TTL, but older than get.WRITE_MAX_AGE
+        timestamp, items = get._inventory[item_type]
+        get._inventory[item_type] = (timestamp - 30, items)
+
+    def test_tag_edit_rereads_an_old_cache(self):
+        [name] = self.vault.seed('secret', 1, versions=2, tags={"env": "dev"})
+        get.get_all_secrets()
+        self.age_inventory('secret')
+        self.vault.update('secret', name, attributes={}, tags={"env": "dev", "owner": "ops"})
+
+        quietly(edit.update_secret_tags, name, {"env": "prod"})
+
+        self.assertEqual(self.vault.latest('secret', name)['tags'], {"env": "prod", "owner": "ops"})
+
+    def test_bulk_tag_edit_relists_an_old_cache(self):
+        names = self.vault.seed('key', 2, tags={"env": "dev"})
+        get.get_all_keys()
+        self.age_inventory('key')
+        self.vault.update('key', names[0], attributes={}, tags={"env": "dev", "owner": "ops"})
+
+        quietly(bulk.bulk_edit_tags, 'key', names, add={"tier": "1"})
+
+        self.assertEqual(self.vault.latest('key', names[0])['tags'], {"env": "dev", "owner": "ops", "tier": "1"})
+        self.assertEqual(self.vault.latest('key', names[1])['tags'], {"env": "dev", "tier": "1"})
+
+class TestSoftDelete(EmulatorTestCase):
+
+    def test_delete_recover_and_purge(self):
+        names = self.vault.seed('secret', 3)
+
+        summary = quietly(bulk.bulk_delete, 'secret', names)
+        listed = quietly(deleted.list_deleted_secrets)
+        quietly(deleted.recover_deleted, 'secret', names[:1])
+        quietly(deleted.purge_deleted, 'secret', names[1:2])
+
+        self.assertEqual([r['status'] for r in summary], ["ok"] * 3)
+        self.assertEqual(sorted(item.name for item in listed), names)
+        self.assertEqual([item.name for item in get.get_all_secrets(refresh=True)], names[:1])
+        self.assertEqual(self.vault.deleted_names('secret'), names[2:])
+
+    def test_name_of_deleted_item_cannot_be_reused(self):
+        [name] = self.vault.seed('secret', 1)
+        self.vault.delete('secret', name)
+
+        with self.assertRaises(HttpResponseError) as raised:
+            auth.get_secret_client().set_secret(name, "again")
+
+        self.assertEqual(raised.exception.status_code, 409)
+
+    def test_deleted_item_appears_after_delete_delay(self):
+        [name] = self.vault.seed('key', 1)
+        self.vault.delete_delay = 0.3
+        client = auth.get_key_client()
+
+        client.begin_delete_key(name)
+        with self.assertRaises(ResourceNotFoundError):
+            client.get_deleted_key(name)
+        time.sleep(0.35)
+
+        self.assertEqual(client.get_deleted_key(name).name, name)
+
+class TestCertificateOperations(EmulatorTestCase):
+
+    def test_create_certificate_completes_after_issuance_delay(self):
+        from azure.keyvault.certificates import CertificatePolicy
+        self.vault.issuance_delay = 0.3
+        client = auth.get_certificate_client()
+
+        client.begin_create_certificate("web", CertificatePolicy.get_default(), _polling_interval=0.1)
+        pending = client.get_certificate_operation("web")
+        time.sleep(0.35)
+        done = client.get_certificate_operation("web")
+        certificate = client.get_certificate("web")
+
+        self.assertEqual(pending.status, "inProgress")
+        self.assertEqual(done.status, "completed")
+        self.assertIsNotNone(certificate.properties.expires_on)
+
+class TestBackupRestore(EmulatorTestCase):
+
+    def test_round_trip(self):
+        self.vault.seed('secret', 4, versions=2)
+        self.vault.seed('key', 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vault.zip")
+            quietly(backup.backup_vault, path)
+            self.vault.clear()
+
+            quietly(backup.restore_vault, path)
+
+        self.assertEqual(len(self.vault.items['secret']), 4)
+        self.assertEqual(len(self.vault.versions('secret', "secret-000000")), 2)
+        self.assertEqual(len(self.vault.items['key']), 2)
+
+class TestFaults(EmulatorTestCase):
+
+    def test_throttled_requests_are_retried(self):
+        self.vault.seed('secret', 1)
+        self.emulator.faults.configure(throttle_next=2, retry_after=0.01)
+        metrics.reset()
+
+        secret = auth.get_secret_client().get_secret("secret-000000")
+
+        self.assertEqual(secret.value, "value-0")
+        self.assertEqual(self.emulator.stats()['throttled'], 2)
+        [(_, series)] = [row for row in metrics.snapshot() if row[0][0] == 'sdk']
+        self.assertEqual((series.count, series.throttled, series.retries), (3, 2, 2))
+
+    def test_latency_and_path_filter(self):
+        self.vault.seed('secret', 1)
+        self.vault.seed('key', 1)
+        client = auth.get_secret_client()
+        client.get_secret("secret-000000")
+        self.emulator.faults.configure(latency=0.2, path="/secrets")
+
+        start = time.perf_counter()
+        client.get_secret("secret-000000")
+        slow = time.perf_counter() - start
+        start = time.perf_counter()
+        auth.get_key_client().get_key("key-000000")
+        fast = time.perf_counter() - start
+
+        self.assertGreaterEqual(slow, 0.2)
+        self.assertLess(fast, 0.2)
+
+    def test_admin_endpoints(self):
+        context = ssl.create_default_context(cafile=self.emulator.cert_path)
+        request = urllib.request.Request(
+            f"{self.emulator.url}/_emulator/faults", method="PUT",
+            data=json.dumps({'throttle_rate': 0.5}).encode(), headers={"Content-Type": "application/json"}
+        )
+
+        with urllib.request.urlopen(request, context=context) as response:
+            faults = json.load(response)
+        with urllib.request.urlopen(f"{self.emulator.url}/_emulator/stats", context=context) as response:
+            stats = json.load(response)
+
+        self.assertEqual(faults['throttle_rate'], 0.5)
+        self.assertEqual(stats['items'], {'key': 0, 'secret': 0, 'certificate': 0})
+
+if __name__ == '__main__':
+    unittest.main()
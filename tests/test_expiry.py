@@ -0,0 +1,65 @@
+import unittest
+import io
+import json
+from contextlib import redirect_stdout, redirect_stderr
+from unittest.mock import patch
+from emulator.testing import EmulatorTestCase
+from src import cli, expiry
+
+DAY = 86400
+
+class TestExpiryScan(EmulatorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vault.seed('secret', 2, prefix="soon", expires_in=3 * DAY)
+        self.vault.seed('key', 1, prefix="expired", expires_in=-DAY)
+        self.vault.seed('secret', 1, prefix="later", expires_in=90 * DAY)
+        self.vault.seed('certificate', 1, prefix="cert")
+
+    def test_reports_items_sorted_by_expiry(self):
+        requests = self.emulator.stats()['requests']
+
+        entries, errors = expiry.scan_expiring(days=30)
+
+        self.assertEqual(errors, [])
+        self.assertEqual([(e['type'], e['name']) for e in entries],
+                         [('key', "expired-000000"), ('secret', "soon-000000"), ('secret', "soon-000001")])
+        self.assertTrue(entries[0]['expired'])
+        self.assertAlmostEqual(entries[1]['days_left'], 3, places=1)
+        # One listing per item type, no per-item reads
+        self.assertEqual(self.emulator.stats()['requests'] - requests, 3)
+
+    def test_versions_and_disabled(self):
+        [name] = self.vault.seed('secret', 1, versions=3, prefix="rotated", expires_in=DAY)
+        self.vault.update('secret', name, self.vault.versions('secret', name)[0]['version'], attributes={'enabled': False})
+
+        enabled, _ = expiry.scan_expiring(days=2, item_types=('secret',), versions=True)
+        everything, _ = expiry.scan_expiring(days=2, item_types=('secret',), versions=True, include_disabled=True)
+
+        self.assertEqual(sum(1 for e in enabled if e['name'] == name), 2)
+        self.assertEqual(sum(1 for e in everything if e['name'] == name), 3)
+        self.assertTrue(all(e['version'] for e in everything))
+
+    def test_cli_exit_code_and_json(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            code = cli.main(["expiring", "--days", "7", "--type", "secret", "--json"])
+        document = json.loads(stdout.getvalue())
+
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            quiet = cli.main(["expiring", "--days", "1", "--type", "certificate"])
+
+        self.assertEqual(code, 1)
+        self.assertEqual([e['name'] for e in document['items']], ["soon-000000", "soon-000001"])
+        self.assertEqual(quiet, 0)
+
+    def test_cli_exit_code_for_scan_errors(self):
+        with patch('src.expiry.list_versions', side_effect=Exception("Forbidden")), \
+                redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            code = cli.main(["expiring", "--days", "7", "--type", "secret", "--versions", "--json"])
+
+        self.assertEqual(code, 2)
+
+if __name__ == '__main__':
+    unittest.main()
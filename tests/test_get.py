@@ -1,9 +1,31 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from src import get
+from src import get, create
+
+class FakePages:
+    """
+    Stands in for the SDK's page iterator: continuation tokens are "page<N>".
+    """
+    def __init__(self, pages, continuation_token=None):
+        self.pages = pages
+        self.start = int(continuation_token[4:]) if continuation_token else 0
+        self.continuation_token = continuation_token
+
+    def __iter__(self):
+        for index in range(self.start, len(self.pages)):
+            self.continuation_token = f"page{index + 1}" if index + 1 < len(self.pages) else None
+            yield iter(self.pages[index])
+
+def make_pager(*pages):
+    pager = MagicMock()
+    pager.by_page.side_effect = lambda continuation_token=None: FakePages(pages, continuation_token)
+    return pager
 
 class TestGet(unittest.TestCase):
 
+    def setUp(self):
+        get.invalidate_inventory()
+
     @patch('src.get.get_key_client')
     def test_list_keys(self, mock_get_client):
         # Setup mock
@@ -16,7 +38,7 @@ class TestGet(unittest.TestCase):
         mock_key1.enabled = True
         mock_key1.created_on = "2023-01-01"
         
-        mock_client.list_properties_of_keys.return_value = [mock_key1]
+        mock_client.list_properties_of_keys.return_value = make_pager([mock_key1])
 
         # Run function
         get.list_keys()
@@ -35,7 +57,7 @@ class TestGet(unittest.TestCase):
         mock_secret1.enabled = True
         mock_secret1.created_on = "2023-01-01"
         
-        mock_client.list_properties_of_secrets.return_value = [mock_secret1]
+        mock_client.list_properties_of_secrets.return_value = make_pager([mock_secret1])
 
         # Run function
         get.list_secrets()
@@ -54,7 +76,7 @@ class TestGet(unittest.TestCase):
         mock_cert1.enabled = True
         mock_cert1.created_on = "2023-01-01"
         
-        mock_client.list_properties_of_certificates.return_value = [mock_cert1]
+        mock_client.list_properties_of_certificates.return_value = make_pager([mock_cert1])
 
         # Run function
         get.list_certificates()
@@ -62,5 +84,122 @@ class TestGet(unittest.TestCase):
         # Assertions
         mock_client.list_properties_of_certificates.assert_called_once()
 
+class TestPagedListing(unittest.TestCase):
+
+    def make_secrets(self, *names):
+        secrets = []
+        for name in names:
+            secret = MagicMock()
+            secret.name = name
+            secrets.append(secret)
+        return secrets
+
+    @patch('src.get.get_secret_client')
+    def test_iter_pages_yields_each_page(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.list_properties_of_secrets.return_value = make_pager(
+            self.make_secrets("s1", "s2"), self.make_secrets("s3"))
+
+        pages = [([s.name for s in items], token) for items, token in get.iter_pages('secret', page_size=2)]
+
+        self.assertEqual(pages, [(["s1", "s2"], "0:page1"), (["s3"], None)])
+        mock_client.list_properties_of_secrets.assert_called_once_with(max_page_size=2)
+
+    @patch('src.get.get_secret_client')
+    def test_limit_inside_page_resumes_at_next_item(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.list_properties_of_secrets.return_value = make_pager(
+            self.make_secrets("s1", "s2"), self.make_secrets("s3", "s4"))
+
+        first = list(get.iter_pages('secret', limit=3))
+        token = first[-1][1]
+        rest = list(get.iter_pages('secret', continuation_token=token))
+
+        self.assertEqual([s.name for items, _ in first for s in items], ["s1", "s2", "s3"])
+        self.assertEqual(token, "1:page1")
+        self.assertEqual([s.name for items, _ in rest for s in items], ["s4"])
+        self.assertIsNone(rest[-1][1])
+
+    @patch('src.get.get_secret_client')
+    def test_list_secrets_returns_token_and_leaves_inventory_alone(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.list_properties_of_secrets.return_value = make_pager(
+            self.make_secrets("s1"), self.make_secrets("s2"))
+
+        with patch('builtins.print'):
+            token = get.list_secrets(limit=1)
+
+        self.assertEqual(token, "0:page1")
+        self.assertNotIn('secret', get._inventory)
+
+    def test_invalid_token_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(get.iter_pages('secret', continuation_token="not-a-token"))
+
+class TestInventoryCache(unittest.TestCase):
+
+    def setUp(self):
+        get.invalidate_inventory()
+        self.addCleanup(get.set_inventory_ttl, get.INVENTORY_TTL)
+        self.addCleanup(get.invalidate_inventory)
+
+    @patch('src.get.get_secret_client')
+    def test_get_all_secrets_is_cached(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = [MagicMock()]
+
+        first = get.get_all_secrets()
+        second = get.get_all_secrets()
+
+        self.assertEqual(first, second)
+        mock_client.list_properties_of_secrets.assert_called_once()
+
+    @patch('src.get.get_secret_client')
+    def test_refresh_and_ttl(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = []
+
+        get.get_all_secrets()
+        get.get_all_secrets(refresh=True)
+        self.assertEqual(mock_client.list_properties_of_secrets.call_count, 2)
+
+        get.set_inventory_ttl(0)
+        get.get_all_secrets()
+        self.assertEqual(mock_client.list_properties_of_secrets.call_count, 3)
+
+    @patch('src.create.get_secret_client')
+    @patch('src.get.get_secret_client')
+    def test_create_invalidates_inventory(self, mock_get_client, mock_create_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_create_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = []
+
+        get.get_all_secrets()
+        create.create_secret("new-secret", "value")
+        get.get_all_secrets()
+
+        self.assertEqual(mock_client.list_properties_of_secrets.call_count, 2)
+
+    @patch('src.get.get_secret_client')
+    def test_inventory_names_are_sorted_and_reused(self, mock_get_client):
+        secrets = []
+        for name in ("beta", "Alpha", "gamma"):
+            secret = MagicMock()
+            secret.name = name
+            secrets.append(secret)
+        mock_get_client.return_value.list_properties_of_secrets.return_value = secrets
+
+        first = get.get_inventory_names('secret')
+        second = get.get_inventory_names('secret')
+        get.invalidate_inventory('secret')
+        third = get.get_inventory_names('secret')
+
+        self.assertEqual(first, ["Alpha", "beta", "gamma"])
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import random
+import time
+import unittest
+from src.index import NameIndex, subsequence_pattern
+
+NAMES = ["prod-db-password", "Prod-API-key", "prod-db-user", "staging-db-password", "billing-token"]
+
+class TestNameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NameIndex(NAMES)
+
+    def test_prefix_is_case_insensitive(self):
+        self.assertEqual(self.index.prefix("PROD-D"), ["prod-db-password", "prod-db-user"])
+        self.assertEqual(self.index.prefix("prod", limit=1), ["Prod-API-key"])
+        self.assertEqual(self.index.prefix("x"), [])
+
+    def test_complete_extends_to_common_prefix(self):
+        self.assertEqual(self.index.complete("prod-d"), "prod-db-")
+        self.assertEqual(self.index.complete("bil"), "billing-token")
+        self.assertEqual(self.index.complete("nothing"), "nothing")
+
+    def test_fuzzy_matches_characters_in_order(self):
+        self.assertEqual(self.index.fuzzy("dbpw"), ["prod-db-password", "staging-db-password"])
+        self.assertEqual(self.index.fuzzy("wdp"), [])
+        self.assertEqual(self.index.fuzzy("zz"), [])
+
+    def test_fuzzy_pattern_avoids_possessive_quantifiers(self):
+        # Possessive quantifiers (`*+`) are a re.error before Python 3.11
+        pattern = subsequence_pattern("p.d*b")
+
+        self.assertNotIn("*+", pattern.pattern)
+        self.assertTrue(pattern.match("prod-.d*-db"))
+        self.assertIsNone(pattern.match("prod-db"))
+        self.assertEqual(NameIndex(['prod-db', 'dev-db', 'app']).search('pdb', limit=5), ['prod-db'])
+
+    def test_search_puts_prefix_matches_first(self):
+        results = self.index.search("s")
+
+        self.assertEqual(results[0], "staging-db-password")
+        self.assertIn("prod-db-password", results)
+        self.assertEqual(len(results), len(set(results)))
+        self.assertEqual(len(self.index.search("s", limit=2)), 2)
+
+    def test_lookups_stay_fast_on_large_vaults(self):
+        rng = random.Random(1)
+        services = ["billing", "auth", "orders", "search", "payments", "gateway"]
+        kinds = ["db-password", "api-key", "conn-string", "tls"]
+        index = NameIndex(f"{rng.choice(services)}-{rng.choice(['dev', 'prod'])}-{rng.choice(kinds)}-{i}"
+                          for i in range(50000))
+        index.fuzzy("x")
+
+        for query in ("pay", "payments-prod-t", "bpt", "gwdk"):
+            start = time.perf_counter()
+            index.search(query, limit=200)
+            index.complete(query)
+            # Generous bound so slow CI machines do not flake; typical runs take well under 1 ms
+            self.assertLess(time.perf_counter() - start, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,5 +48,55 @@ class TestInputEsc(unittest.TestCase):
             mock_write.assert_any_call('a')
             mock_write.assert_any_call('b')
 
+    @patch('sys.stdin.fileno')
+    @patch('termios.tcgetattr')
+    @patch('termios.tcsetattr')
+    @patch('tty.setcbreak')
+    @patch('os.read')
+    @patch('sys.stdout.write')
+    def test_page_keys_go_to_handler_linux(self, mock_write, mock_read, mock_setcbreak, mock_tcsetattr, mock_tcgetattr, mock_fileno):
+        with patch('os.name', 'posix'):
+            # 'a', Page Down, an arrow key (ignored), 'b', Enter
+            mock_read.side_effect = [b'a', b'\x1b[6~', b'\x1b[A', b'b', b'\n']
+            on_key = MagicMock(side_effect=lambda key, text: text if key == 'pgdn' else None)
+
+            result = input_with_esc("Prompt: ", on_key=on_key)
+
+            self.assertEqual(result, "ab")
+            self.assertEqual(
+                [c.args for c in on_key.call_args_list],
+                [('change', 'a'), ('pgdn', 'a'), ('change', 'ab')]
+            )
+            # The prompt and the typed text are written again after the handler redraws
+            mock_write.assert_any_call("\rPrompt: a\x1b[K")
+
+    @patch('sys.stdin.fileno')
+    @patch('termios.tcgetattr')
+    @patch('termios.tcsetattr')
+    @patch('tty.setcbreak')
+    @patch('os.read')
+    @patch('sys.stdout.write')
+    def test_tab_replaces_text_with_completion_linux(self, mock_write, mock_read, mock_setcbreak, mock_tcsetattr, mock_tcgetattr, mock_fileno):
+        with patch('os.name', 'posix'):
+            mock_read.side_effect = [b'pr', b'\t', b'1', b'\n']
+            on_key = MagicMock(side_effect=lambda key, text: "prod-db-" if key == 'tab' else None)
+
+            result = input_with_esc("Prompt: ", on_key=on_key)
+
+            self.assertEqual(result, "prod-db-1")
+            on_key.assert_any_call('tab', 'pr')
+
+    @patch('sys.stdin.fileno')
+    @patch('termios.tcgetattr')
+    @patch('termios.tcsetattr')
+    @patch('tty.setcbreak')
+    @patch('os.read')
+    @patch('sys.stdout.write')
+    def test_lone_esc_with_handler_linux(self, mock_write, mock_read, mock_setcbreak, mock_tcsetattr, mock_tcgetattr, mock_fileno):
+        with patch('os.name', 'posix'):
+            mock_read.side_effect = [b'\x1b']
+
+            self.assertIsNone(input_with_esc("Prompt: ", on_key=MagicMock()))
+
 if __name__ == '__main__':
     unittest.main()
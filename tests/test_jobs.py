@@ -0,0 +1,85 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src import jobs, delete
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        jobs.clear_finished()
+
+    def test_job_succeeds(self):
+        poller = MagicMock()
+        poller.result.return_value = "done"
+        finished = threading.Event()
+
+        job = jobs.submit("Test job", poller, on_done=lambda job: finished.set())
+
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.result, "done")
+        self.assertIn(job, jobs.pop_finished())
+        self.assertEqual(jobs.pop_finished(), [])
+
+    def test_job_failure_is_recorded(self):
+        poller = MagicMock()
+        poller.result.side_effect = Exception("boom")
+        finished = threading.Event()
+
+        job = jobs.submit("Failing job", poller, on_done=lambda job: finished.set())
+
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error, "boom")
+
+    def test_failed_certificate_operation_is_recorded(self):
+        operation = MagicMock(status="failed", status_details="Issuer rejected the request")
+        operation.error.message = "CSR is invalid"
+        poller = MagicMock()
+        poller.result.return_value = operation
+        finished = threading.Event()
+
+        job = jobs.submit("Create certificate", poller, on_done=lambda job: finished.set())
+
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error, "failed: CSR is invalid")
+
+    @patch('src.create.invalidate_versions')
+    @patch('src.create.invalidate_inventory')
+    def test_failed_certificate_job_keeps_caches(self, mock_invalidate_inventory, mock_invalidate_versions):
+        from src import create
+        job = jobs.Job(1, "Create certificate 'web'", MagicMock())
+        job.status = 'failed'
+
+        create._certificate_done(job, "web")
+
+        mock_invalidate_inventory.assert_not_called()
+        mock_invalidate_versions.assert_not_called()
+
+    def test_running_jobs_are_kept_on_clear(self):
+        release = threading.Event()
+        poller = MagicMock()
+        poller.result.side_effect = lambda: release.wait(2)
+
+        job = jobs.submit("Slow job", poller)
+        jobs.clear_finished()
+
+        self.assertIn(job, jobs.list_jobs())
+        self.assertEqual(jobs.running_count(), 1)
+        release.set()
+
+    @patch('src.delete.get_key_client')
+    def test_delete_key_in_background(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_poller = MagicMock()
+        mock_client.begin_delete_key.return_value = mock_poller
+
+        job = delete.delete_key("test-key", wait=False)
+
+        self.assertIs(job.poller, mock_poller)
+        self.assertIn(job, jobs.list_jobs())
+
+if __name__ == '__main__':
+    unittest.main()
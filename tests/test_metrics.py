@@ -0,0 +1,185 @@
+import os
+import io
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from src import metrics
+from src.metrics import MetricsPolicy, instrumented
+
+def make_request(method, url, body=None):
+    request = MagicMock()
+    request.http_request.method = method
+    request.http_request.url = url
+    request.http_request.body = body
+    request.context = {}
+    return request
+
+def make_response(status_code, body=b""):
+    response = MagicMock()
+    response.http_response.status_code = status_code
+    response.http_response.headers = {'Content-Length': str(len(body))}
+    return response
+
+class TestSeries(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_record_and_quantiles(self):
+        for seconds in (0.001, 0.02, 0.02, 0.3, 40):
+            metrics.record('op', 'secret', 'get', seconds)
+        metrics.record('op', 'secret', 'get', 0.02, error=True)
+
+        [(key, series)] = metrics.snapshot()
+
+        self.assertEqual(key, ('op', 'secret', 'get'))
+        self.assertEqual(series.count, 6)
+        self.assertEqual(series.errors, 1)
+        self.assertEqual(series.quantile(0.5), 0.025)
+        self.assertEqual(series.quantile(1.0), float('inf'))
+
+    def test_snapshot_is_a_copy(self):
+        metrics.record('op', 'key', 'list', 0.01)
+        [(_, series)] = metrics.snapshot()
+
+        metrics.record('op', 'key', 'list', 0.01)
+
+        self.assertEqual(series.count, 1)
+        self.assertEqual(sum(series.buckets), 1)
+
+class TestDescribeRequest(unittest.TestCase):
+
+    def test_path_templates(self):
+        cases = [
+            ("GET", "https://kv.vault.azure.net/secrets/db-pw?api-version=7.5", ('secret', "GET /secrets/{name}")),
+            ("GET", "https://kv.vault.azure.net/secrets/db-pw/abc123", ('secret', "GET /secrets/{name}/{version}")),
+            ("GET", "https://kv.vault.azure.net/keys/k1/versions", ('key', "GET /keys/{name}/versions")),
+            ("POST", "https://kv.vault.azure.net/keys/k1/abc/sign", ('key', "POST /keys/{name}/{version}/sign")),
+            ("POST", "https://kv.vault.azure.net/certificates/c1/create", ('certificate', "POST /certificates/{name}/create")),
+            ("DELETE", "https://kv.vault.azure.net/deletedsecrets/s1", ('secret', "DELETE /deletedsecrets/{name}")),
+            ("GET", "https://kv.vault.azure.net/secrets", ('secret', "GET /secrets")),
+            ("POST", "https://kv.vault.azure.net/keys/restore", ('key', "POST /keys/restore")),
+        ]
+        for method, url, expected in cases:
+            self.assertEqual(metrics.describe_request(MagicMock(method=method, url=url)), expected)
+
+    def test_items_named_like_actions(self):
+        cases = [
+            ("GET", "https://kv.vault.azure.net/secrets/backup", ('secret', "GET /secrets/{name}")),
+            ("POST", "https://kv.vault.azure.net/secrets/backup/backup", ('secret', "POST /secrets/{name}/backup")),
+            ("GET", "https://kv.vault.azure.net/keys/restore/versions", ('key', "GET /keys/{name}/versions")),
+            ("POST", "https://kv.vault.azure.net/deletedkeys/recover/recover", ('key', "POST /deletedkeys/{name}/recover")),
+        ]
+        for method, url, expected in cases:
+            self.assertEqual(metrics.describe_request(MagicMock(method=method, url=url)), expected)
+
+class TestMetricsPolicy(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_records_attempts_retries_and_bytes(self):
+        policy = MetricsPolicy()
+        policy.next = MagicMock()
+        policy.next.send.side_effect = [make_response(429), make_response(200, b'{"value": []}')]
+        request = make_request("PUT", "https://kv.vault.azure.net/secrets/s1", body='{"value": "x"}')
+
+        # The retry policy sends the same pipeline request again
+        policy.send(request)
+        policy.send(request)
+
+        [(key, series)] = metrics.snapshot()
+        self.assertEqual(key, ('sdk', 'secret', "PUT /secrets/{name}"))
+        self.assertEqual(series.count, 2)
+        self.assertEqual(series.errors, 1)
+        self.assertEqual(series.throttled, 1)
+        self.assertEqual(series.retries, 1)
+        self.assertEqual(series.bytes_sent, 28)
+        self.assertEqual(series.bytes_received, 13)
+
+    def test_transport_error_is_recorded(self):
+        policy = MetricsPolicy()
+        policy.next = MagicMock()
+        policy.next.send.side_effect = ConnectionError("reset")
+
+        with self.assertRaises(ConnectionError):
+            policy.send(make_request("GET", "https://kv.vault.azure.net/keys/k1"))
+
+        [(_, series)] = metrics.snapshot()
+        self.assertEqual(series.errors, 1)
+
+class TestInstrumented(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_resource_from_item_type_and_errors(self):
+        @instrumented()
+        def bulk_thing(item_type, names):
+            if not names:
+                raise ValueError("no names")
+            return len(names)
+
+        self.assertEqual(bulk_thing('key', ['a']), 1)
+        with self.assertRaises(ValueError):
+            bulk_thing('secret', [])
+
+        rows = dict(metrics.snapshot())
+        self.assertEqual(rows[('op', 'key', 'bulk_thing')].errors, 0)
+        self.assertEqual(rows[('op', 'secret', 'bulk_thing')].errors, 1)
+        self.assertEqual(bulk_thing.__name__, 'bulk_thing')
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_prometheus_text(self):
+        metrics.record('sdk', 'secret', 'GET /secrets/{name}', 0.03, throttled=True, received=10)
+
+        text = metrics.render_prometheus()
+
+        labels = 'layer="sdk",resource="secret",operation="GET /secrets/{name}"'
+        self.assertIn('kv_operation_duration_seconds_bucket{' + labels + ',le="0.025"} 0', text)
+        self.assertIn('kv_operation_duration_seconds_bucket{' + labels + ',le="0.05"} 1', text)
+        self.assertIn('kv_operation_duration_seconds_bucket{' + labels + ',le="+Inf"} 1', text)
+        self.assertIn('kv_operation_duration_seconds_count{' + labels + '} 1', text)
+        self.assertIn('kv_operation_throttled_total{' + labels + '} 1', text)
+        self.assertIn('kv_bytes_received_total{' + labels + '} 10', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_write_prometheus_replaces_file(self):
+        metrics.record('op', 'vault', 'backup_vault', 1.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "kv.prom")
+
+            metrics.write_prometheus(path)
+
+            self.assertEqual(os.listdir(tmp), ["kv.prom"])
+            with open(path) as f:
+                self.assertIn('operation="backup_vault"', f.read())
+
+    def test_report(self):
+        out = io.StringIO()
+        metrics.report(file=out)
+        self.assertIn("No operations recorded yet.", out.getvalue())
+
+        metrics.record('op', 'key', 'list_keys', 0.2)
+        out = io.StringIO()
+        metrics.report(file=out)
+        self.assertIn("list_keys", out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
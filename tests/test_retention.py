@@ -0,0 +1,142 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from emulator.testing import EmulatorTestCase
+from src import retention
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+def make_version(version, age_days, enabled=True, updated_days=None):
+    return SimpleNamespace(
+        version=version, enabled=enabled, created_on=NOW - timedelta(days=age_days),
+        updated_on=NOW - timedelta(days=age_days if updated_days is None else updated_days)
+    )
+
+def make_policy(**rules):
+    return retention.parse_policies({'policies': [dict({'name': "test"}, **rules)]})[0]
+
+class TestParsePolicies(unittest.TestCase):
+
+    def test_defaults(self):
+        policy = make_policy(keep_newest=2)
+
+        self.assertEqual(policy['types'], ['key', 'secret', 'certificate'])
+        self.assertEqual(policy['names'], ['*'])
+        self.assertIsNone(policy['disable_after_days'])
+
+    def test_rejects_invalid_policies(self):
+        for raw, message in (
+            ({'keep_newest': 2, 'max_age': 3}, "unknown field"),
+            ({'names': ["app-*"]}, "needs at least one"),
+            ({'keep_newest': 0}, "at least 1"),
+            ({'disable_after_days': "30"}, "non-negative integer"),
+            ({'types': ["vault"], 'keep_newest': 1}, "types must be"),
+            ({'tags': "AND", 'keep_newest': 1}, "Invalid tag query"),
+            ({'keep_newest': 1, 'purge': True}, "purge needs delete_disabled_items_after_days"),
+            ({'delete_disabled_items_after_days': 30, 'purge': "yes"}, "purge must be true or false"),
+        ):
+            with self.assertRaises(ValueError) as raised:
+                retention.parse_policies({'policies': [raw]})
+            self.assertIn(message, str(raised.exception))
+
+class TestEvaluateVersions(unittest.TestCase):
+
+    def test_keep_newest(self):
+        versions = [make_version("v1", 40), make_version("v4", 10), make_version("v2", 30),
+                    make_version("v3", 20, enabled=False)]
+
+        actions = retention.evaluate_versions(make_policy(keep_newest=2), versions, NOW)
+
+        self.assertEqual([(a, v) for a, v, _ in actions], [('disable', "v1")])
+
+    def test_age_never_disables_the_newest_enabled_version(self):
+        versions = [make_version("v1", 200), make_version("v2", 100), make_version("v3", 50, enabled=False)]
+
+        actions = retention.evaluate_versions(make_policy(disable_after_days=30), versions, NOW)
+
+        self.assertEqual([(a, v) for a, v, _ in actions], [('disable', "v1")])
+
+    def test_delete_items_disabled_long_enough(self):
+        old = [make_version("v1", 400, enabled=False), make_version("v2", 300, enabled=False, updated_days=200)]
+        recent = [make_version("v1", 400, enabled=False, updated_days=5)]
+        policy = make_policy(delete_disabled_items_after_days=90)
+
+        self.assertEqual(retention.evaluate_versions(policy, old, NOW), [('delete', None, "all versions disabled for more than 90 day(s)")])
+        self.assertEqual(retention.evaluate_versions(policy, recent, NOW), [])
+        self.assertEqual(retention.evaluate_versions(make_policy(keep_newest=1), old, NOW), [])
+
+    def test_purge_only_when_opted_in(self):
+        old = [make_version("v1", 400, enabled=False)]
+        policy = make_policy(delete_disabled_items_after_days=90, purge=True)
+
+        self.assertEqual([a for a, _, _ in retention.evaluate_versions(policy, old, NOW)], ['purge'])
+
+class TestRetentionAgainstEmulator(EmulatorTestCase):
+
+    def disable_items(self, item_type, names, days_ago):
+        for name in names:
+            for record in self.vault.versions(item_type, name):
+                record.update(enabled=False, updated=record['updated'] - days_ago * 86400)
+
+    def test_dry_run_lists_items_to_remove(self):
+        stale = self.vault.seed('key', 2, versions=2, prefix="stale")
+        recent = self.vault.seed('key', 1, prefix="recent")
+        self.vault.seed('key', 1, prefix="live")
+        self.vault.seed('secret', 1, versions=2, prefix="old")
+        self.disable_items('key', stale, 100)
+        self.disable_items('key', recent, 5)
+        self.disable_items('secret', ["old-000000"], 100)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "retention.json")
+            with open(path, "w") as f:
+                json.dump({'policies': [
+                    {'name': "keys", 'types': ["key"], 'delete_disabled_items_after_days': 30},
+                    {'name': "secrets", 'types': ["secret"], 'delete_disabled_items_after_days': 30, 'purge': True},
+                ]}, f)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                plan, errors = retention.apply_retention_file(path, dry_run=True)
+
+        self.assertEqual(errors, [])
+        self.assertEqual([(e['type'], e['name'], e['action']) for e in plan],
+                         [('key', "stale-000000", 'delete'), ('key', "stale-000001", 'delete'), ('secret', "old-000000", 'purge')])
+        self.assertIn("0 version(s) to disable, 2 item(s) to delete, 1 item(s) to delete and purge.", output.getvalue())
+        self.assertEqual(len(self.vault.items['key']), 4)
+        self.assertEqual(len(self.vault.items['secret']), 1)
+
+    def test_plan_and_apply(self):
+        self.vault.seed('secret', 2, versions=4, prefix="app", tags={"env": "prod"})
+        self.vault.seed('secret', 1, versions=4, prefix="other")
+        [stale] = self.vault.seed('key', 1, versions=2, prefix="stale")
+        [purged] = self.vault.seed('certificate', 1, prefix="purged")
+        self.disable_items('key', [stale], 100)
+        self.disable_items('certificate', [purged], 100)
+        policies = retention.parse_policies({'policies': [
+            {'name': "prod", 'types': ["secret"], 'names': ["app-*"], 'tags': "env=prod", 'keep_newest': 1},
+            {'name': "cleanup", 'types': ["key"], 'delete_disabled_items_after_days': 30},
+            {'name': "certs", 'types': ["certificate"], 'delete_disabled_items_after_days': 30, 'purge': True},
+        ]})
+
+        plan, errors = retention.plan_retention(policies)
+        with redirect_stdout(io.StringIO()):
+            results = retention.apply_retention(plan)
+
+        self.assertEqual(errors, [])
+        self.assertEqual([(e['type'], e['name'], e['action']) for e in plan],
+                         [('key', stale, 'delete')] + [('secret', "app-000000", 'disable')] * 3
+                         + [('secret', "app-000001", 'disable')] * 3 + [('certificate', purged, 'purge')])
+        self.assertEqual({r['status'] for r in results}, {'ok'})
+        self.assertEqual([v['enabled'] for v in self.vault.versions('secret', "app-000001")], [False, False, False, True])
+        self.assertTrue(all(v['enabled'] for v in self.vault.versions('secret', "other-000000")))
+        self.assertEqual(self.vault.items['key'], {})
+        self.assertIn(stale, self.vault.deleted['key'])
+        self.assertEqual(self.vault.items['certificate'], {})
+        self.assertEqual(self.vault.deleted['certificate'], {})
+
+if __name__ == '__main__':
+    unittest.main()
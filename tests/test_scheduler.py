@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src import scheduler
+from src.scheduler import TokenBucket, SchedulerPolicy, INTERACTIVE, BULK
+
+def make_request(method, url):
+    request = MagicMock()
+    request.http_request.method = method
+    request.http_request.url = url
+    return request
+
+def make_response(status_code, headers=None):
+    response = MagicMock()
+    response.http_response.status_code = status_code
+    response.http_response.headers = headers or {}
+    return response
+
+class TestClassify(unittest.TestCase):
+
+    def test_classes(self):
+        cases = [
+            ("GET", "https://kv.vault.azure.net/secrets/s1?api-version=7.5", 'read'),
+            ("PUT", "https://kv.vault.azure.net/secrets/s1?api-version=7.5", 'write'),
+            ("PATCH", "https://kv.vault.azure.net/keys/k1/abc", 'write'),
+            ("POST", "https://kv.vault.azure.net/keys/k1/abc/sign?api-version=7.5", 'crypto'),
+            ("POST", "https://kv.vault.azure.net/keys/k1/backup", 'write'),
+        ]
+        for method, url, expected in cases:
+            self.assertEqual(scheduler.classify(MagicMock(method=method, url=url)), expected)
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=5)
+
+        delays = [bucket.try_acquire() for _ in range(6)]
+
+        self.assertEqual(delays[:5], [0.0] * 5)
+        self.assertGreater(delays[5], 0)
+
+    def test_bulk_leaves_reserve_for_interactive(self):
+        bucket = TokenBucket(rate=10)
+        while bucket.try_acquire(BULK) == 0:
+            pass
+
+        # Bulk stopped at the reserve; an interactive call still gets through
+        self.assertEqual(bucket.try_acquire(INTERACTIVE), 0.0)
+
+    def test_bulk_yields_to_waiting_interactive(self):
+        bucket = TokenBucket(rate=100)
+        bucket.interactive_waiting = 1
+
+        self.assertGreater(bucket.try_acquire(BULK), 0)
+        self.assertEqual(bucket.try_acquire(INTERACTIVE), 0.0)
+
+    def test_throttle_pauses_and_recovers(self):
+        bucket = TokenBucket(rate=100)
+
+        bucket.record(429, retry_after=5)
+
+        self.assertGreater(bucket.try_acquire(), 4)
+        self.assertEqual(bucket.rate, 50)
+        bucket.paused_until = 0
+        for _ in range(100):
+            bucket.record(200)
+        self.assertEqual(bucket.rate, 100)
+
+    @patch('src.scheduler.random.uniform', return_value=1.0)
+    def test_backoff_without_retry_after_grows(self, mock_uniform):
+        bucket = TokenBucket(rate=100)
+
+        bucket.record(429)
+        first = bucket.paused_until
+        bucket.record(429)
+
+        self.assertGreater(bucket.paused_until, first)
+        self.assertEqual(bucket.throttle_streak, 2)
+
+class TestSchedulerPolicy(unittest.TestCase):
+
+    def setUp(self):
+        scheduler.reset()
+
+    def tearDown(self):
+        scheduler.reset()
+
+    def test_429_pauses_the_vault_bucket(self):
+        policy = SchedulerPolicy()
+        policy.next = MagicMock()
+        policy.next.send.return_value = make_response(429, {'Retry-After': '3'})
+
+        policy.send(make_request("GET", "https://kv.vault.azure.net/secrets/s1"))
+
+        read = scheduler.get_bucket("kv.vault.azure.net", 'read')
+        write = scheduler.get_bucket("kv.vault.azure.net", 'write')
+        self.assertGreater(read.try_acquire(), 2)
+        self.assertEqual(write.try_acquire(), 0.0)
+
+    def test_bulk_priority_follows_context(self):
+        seen = []
+        with scheduler.priority(BULK):
+            seen.append(scheduler.current_priority())
+            thread = threading.Thread(target=lambda: seen.append(scheduler.current_priority()))
+            thread.start()
+            thread.join()
+        seen.append(scheduler.current_priority())
+
+        self.assertEqual(seen, [BULK, INTERACTIVE, INTERACTIVE])
+
+    def test_async_acquire_waits_without_blocking(self):
+        bucket = TokenBucket(rate=50)
+        bucket.tokens = 0
+
+        waited = asyncio.run(bucket.acquire_async())
+
+        self.assertGreater(waited, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from main import sidebar_layout, render_sidebar_page
+
+class TestSidebar(unittest.TestCase):
+
+    def test_layout_packs_columns_into_width(self):
+        rows, cols, col_width, pages = sidebar_layout(1000, width=60, height=10, name_width=8)
+
+        self.assertEqual((rows, cols, col_width), (10, 6, 10))
+        self.assertEqual(pages, 17)
+
+    def test_long_names_are_capped(self):
+        _, cols, col_width, _ = sidebar_layout(5, width=60, height=10, name_width=120)
+
+        self.assertEqual((cols, col_width), (1, 42))
+
+    def test_render_only_touches_requested_page(self):
+        names = [f"name-{i:03d}" for i in range(25)]
+
+        lines = render_sidebar_page(names, page=1, rows=4, cols=2, col_width=10)
+
+        # Page 1 holds names 8-15, filled column by column
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0].split(), ["name-008", "name-012"])
+        self.assertEqual(lines[3].split(), ["name-011", "name-015"])
+
+    def test_last_page_is_partial(self):
+        names = [f"n{i}" for i in range(5)]
+
+        lines = render_sidebar_page(names, page=1, rows=2, cols=2, col_width=4)
+
+        self.assertEqual(lines, ["n4"])
+
+    def test_overlong_name_is_truncated(self):
+        lines = render_sidebar_page(["a" * 20], page=0, rows=1, cols=1, col_width=8)
+
+        self.assertEqual(lines, ["aaaaa~"])
+
+if __name__ == '__main__':
+    unittest.main()
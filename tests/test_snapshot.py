@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from src import get, snapshot
+
+def make_props(name, version, updated_on, tags=None, enabled=True):
+    return SimpleNamespace(
+        name=name,
+        id=f"https://kv.vault.azure.net/secrets/{name}/{version}",
+        version=version,
+        enabled=enabled,
+        created_on=datetime(2024, 1, 1),
+        updated_on=updated_on,
+        expires_on=None,
+        not_before=None,
+        content_type=None,
+        tags=tags,
+    )
+
+@patch.dict(os.environ, {"KEY_VAULT_URL": "https://kv.vault.azure.net/"})
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        snapshot.enable(os.path.join(self.tmpdir, "snapshot.db"))
+        get.invalidate_inventory()
+
+    def tearDown(self):
+        snapshot.disable()
+        get.invalidate_inventory()
+        shutil.rmtree(self.tmpdir)
+
+    def test_save_and_load_round_trip(self):
+        snapshot.save('secret', [make_props("s1", "v1", datetime(2024, 2, 1), tags={"env": "prod"})])
+
+        items = snapshot.load('secret')
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].name, "s1")
+        self.assertEqual(items[0].updated_on, datetime(2024, 2, 1))
+        self.assertEqual(items[0].tags, {"env": "prod"})
+        self.assertTrue(items[0].enabled)
+        self.assertEqual(snapshot.load('key'), [])
+
+    def test_save_only_rewrites_changed_rows(self):
+        first = [make_props("s1", "v1", datetime(2024, 2, 1)), make_props("s2", "v1", datetime(2024, 2, 1))]
+        self.assertEqual(snapshot.save('secret', first), (2, 0))
+        self.assertEqual(snapshot.save('secret', first), (0, 0))
+
+        second = [make_props("s1", "v2", datetime(2024, 3, 1))]
+        self.assertEqual(snapshot.save('secret', second), (1, 1))
+        self.assertEqual([item.version for item in snapshot.load('secret')], ["v2"])
+
+    @patch('src.get.get_secret_client')
+    def test_sidebar_served_from_snapshot(self, mock_get_client):
+        snapshot.save('secret', [make_props("s1", "v1", datetime(2024, 2, 1))])
+
+        get.load_inventory_snapshot()
+        names = get.get_inventory_names('secret')
+
+        self.assertEqual(names, ["s1"])
+        mock_get_client.assert_not_called()
+
+    @patch('src.get.get_secret_client')
+    def test_snapshot_entries_are_refreshed_on_first_use(self, mock_get_client):
+        snapshot.save('secret', [make_props("s1", "v1", datetime(2024, 2, 1))])
+        mock_get_client.return_value.list_properties_of_secrets.return_value = [make_props("s2", "v1", datetime(2024, 3, 1))]
+
+        get.load_inventory_snapshot()
+        names = [item.name for item in get.get_all_secrets()]
+
+        self.assertEqual(names, ["s2"])
+
+    @patch('src.get.refresh_inventory_in_background')
+    def test_warm_start_refreshes_only_the_opened_type(self, mock_refresh):
+        snapshot.save('secret', [make_props("s1", "v1", datetime(2024, 2, 1))])
+        snapshot.save('key', [make_props("k1", "v1", datetime(2024, 2, 1))])
+
+        get.load_inventory_snapshot()
+        get.refresh_inventory_on_first_use()
+        get.get_inventory_names('secret')
+        get.get_inventory_names('secret')
+
+        mock_refresh.assert_called_once_with('secret')
+
+    def test_unwritable_location_disables_snapshot(self):
+        blocker = os.path.join(self.tmpdir, "file")
+        open(blocker, "w").close()
+
+        self.assertFalse(snapshot.enable(os.path.join(blocker, "sub", "snapshot.db")))
+        self.assertFalse(snapshot.is_enabled())
+
+    @patch('src.get.get_certificate_client')
+    @patch('src.get.get_key_client')
+    @patch('src.get.get_secret_client')
+    def test_refresh_writes_snapshot(self, mock_get_client, mock_key_client, mock_cert_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_client.list_properties_of_secrets.return_value = [make_props("s9", "v1", datetime(2024, 2, 1))]
+
+        get.refresh_inventory_in_background('secret').join()
+
+        self.assertEqual([item.name for item in snapshot.load('secret')], ["s9"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_modules(code, env=None):
+    """
+    Runs `code` in a fresh interpreter and returns the names in sys.modules afterwards.
+    """
+    script = code + "\nimport sys, json\nprint(json.dumps(sorted(sys.modules)))\n"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}, check=True
+    )
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_main_does_not_load_sdks(self):
+        modules = loaded_modules("import main")
+
+        for name in ("azure.core", "azure.identity", "azure.keyvault.keys", "azure.keyvault.secrets",
+                     "azure.keyvault.certificates", "dotenv"):
+            self.assertNotIn(name, modules)
+
+    def test_secret_client_only_loads_secrets_sdk(self):
+        env = {
+            "AZURE_TENANT_ID": "tenant",
+            "AZURE_CLIENT_ID": "client",
+            "AZURE_CLIENT_SECRET": "secret",
+            "KEY_VAULT_URL": "https://kv.vault.azure.net/",
+        }
+        modules = loaded_modules("from src import auth\nauth.get_secret_client()", env)
+
+        self.assertIn("azure.keyvault.secrets", modules)
+        self.assertNotIn("azure.keyvault.keys", modules)
+        self.assertNotIn("azure.keyvault.certificates", modules)
+
+if __name__ == '__main__':
+    unittest.main()
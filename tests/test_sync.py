@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src import sync
+
+SOURCE = "https://source.vault.azure.net/"
+TARGET = "https://target.vault.azure.net/"
+
+def make_props(name, tags=None, enabled=True, managed=False):
+    props = MagicMock()
+    props.name = name
+    props.tags = tags
+    props.enabled = enabled
+    props.managed = managed
+    props.content_type = None
+    return props
+
+def make_client(secrets, values):
+    client = MagicMock()
+    client.list_properties_of_secrets.return_value = secrets
+    # Key Vault resolves names case-insensitively
+    values = {name.lower(): value for name, value in values.items()}
+    def get_secret(name):
+        secret = MagicMock()
+        secret.value = values[name.lower()]
+        secret.properties = next(s for s in secrets if s.name.lower() == name.lower())
+        return secret
+    client.get_secret.side_effect = get_secret
+    return client
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        self.source = make_client(
+            [make_props("same"), make_props("changed"), make_props("retagged", tags={"env": "prod"}),
+             make_props("new"), make_props("cert-backed", managed=True)],
+            {"same": "a", "changed": "new-value", "retagged": "c", "new": "d", "cert-backed": "e"}
+        )
+        self.target = make_client(
+            [make_props("same"), make_props("changed"), make_props("retagged", tags={"env": "dev"}),
+             make_props("extra")],
+            {"same": "a", "changed": "old-value", "retagged": "c", "extra": "x"}
+        )
+        patcher = patch('src.sync.get_secret_client', side_effect=lambda url: self.source if url == SOURCE else self.target)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_plan_only_lists_differences(self):
+        plan, errors = sync.plan_secret_sync(SOURCE, TARGET)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [(item['name'], item['action']) for item in plan],
+            [("changed", "update-value"), ("new", "create"), ("retagged", "update-properties")]
+        )
+
+    def test_names_match_case_insensitively(self):
+        self.source = make_client([make_props("DB-Password"), make_props("Api-Key")], {"DB-Password": "a", "Api-Key": "new"})
+        self.target = make_client([make_props("db-password"), make_props("api-key")], {"db-password": "a", "api-key": "old"})
+
+        plan, errors = sync.plan_secret_sync(SOURCE, TARGET)
+
+        self.assertEqual(errors, [])
+        self.assertEqual([(item['name'], item['action']) for item in plan], [("Api-Key", "update-value")])
+
+    def test_dry_run_writes_nothing(self):
+        sync.sync_secrets(SOURCE, TARGET, dry_run=True)
+
+        self.target.set_secret.assert_not_called()
+        self.target.update_secret_properties.assert_not_called()
+
+    def test_sync_writes_differences(self):
+        _, errors = sync.sync_secrets(SOURCE, TARGET)
+
+        self.assertEqual(errors, [])
+        written = sorted(call.args[0] for call in self.target.set_secret.call_args_list)
+        self.assertEqual(written, ["changed", "new"])
+        self.target.set_secret.assert_any_call("changed", "new-value", tags=None, content_type=None, enabled=True)
+        self.target.update_secret_properties.assert_called_once_with(
+            "retagged", tags={"env": "prod"}, content_type=None, enabled=True
+        )
+
+    def test_disabled_or_unreadable_target_gets_the_source_value(self):
+        from azure.core.exceptions import HttpResponseError
+        forbidden = HttpResponseError("Forbidden")
+        forbidden.status_code = 403
+        get_target = self.target.get_secret.side_effect
+        def get_secret(name):
+            if name == "same":
+                raise forbidden
+            return get_target(name)
+        self.target.get_secret.side_effect = get_secret
+        self.target.list_properties_of_secrets.return_value.append(make_props("parked", enabled=False))
+        self.source.list_properties_of_secrets.return_value.append(make_props("parked"))
+
+        plan, _ = sync.plan_secret_sync(SOURCE, TARGET)
+
+        self.assertEqual(
+            [(item['name'], item['action'], item['reason']) for item in plan if item['name'] in ("parked", "same")],
+            [("parked", "update-value", "disabled in target"), ("same", "update-value", "target value cannot be read")]
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src import get, tags, edit
+from src.index import TagIndex
+
+def make_item(name, item_tags):
+    item = MagicMock()
+    item.name = name
+    item.tags = item_tags
+    return item
+
+SECRETS = [
+    make_item("db-password", {"owner": "team-x", "env": "prod"}),
+    make_item("api-token", {"owner": "team-x", "env": "dev"}),
+    make_item("legacy", None),
+    make_item("ops-key", {"owner": "ops", "env": "prod"}),
+]
+
+class TestTagQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TagIndex(SECRETS)
+
+    def query(self, text):
+        return sorted(tags.evaluate(self.index, tags.parse_query(text)))
+
+    def test_and_or(self):
+        self.assertEqual(self.query("owner=team-x AND env=prod"), ["db-password"])
+        self.assertEqual(self.query("owner=ops OR env=dev"), ["api-token", "ops-key"])
+        # AND binds tighter than OR
+        self.assertEqual(self.query("env=dev OR owner=team-x and env=prod"), ["api-token", "db-password"])
+
+    def test_not_equal_and_has(self):
+        self.assertEqual(self.query("env!=prod"), ["api-token", "legacy"])
+        self.assertEqual(self.query("owner"), ["api-token", "db-password", "ops-key"])
+
+    def test_quoted_values(self):
+        index = TagIndex([make_item("s1", {"team": "Data Platform"})])
+
+        self.assertEqual(tags.evaluate(index, tags.parse_query('team="Data Platform"')), {"s1"})
+
+    def test_malformed_queries(self):
+        for text in ("", "AND env=prod", "env=prod AND", "env=prod owner=x", "=prod"):
+            with self.assertRaises(ValueError):
+                tags.parse_query(text)
+
+class TestTagSearch(unittest.TestCase):
+
+    def setUp(self):
+        get.invalidate_inventory()
+
+    def tearDown(self):
+        get.invalidate_inventory()
+
+    @patch('src.get.get_secret_client')
+    def test_search_uses_listed_properties_only(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.list_properties_of_secrets.return_value = list(SECRETS)
+
+        results = tags.find_by_tags("owner=team-x", item_types=('secret',))
+
+        self.assertEqual([name for _, name, _ in results], ["api-token", "db-password"])
+        mock_client.get_secret.assert_not_called()
+
+    @patch('src.edit.get_secret_client')
+    @patch('src.get.get_secret_client')
+    def test_tag_edit_updates_index_without_relisting(self, mock_get_client, mock_edit_client):
+        mock_get_client.return_value.list_properties_of_secrets.return_value = list(SECRETS)
+        self.assertEqual(tags.find_by_tags("env=staging", item_types=('secret',)), [])
+
+        existing = MagicMock()
+        existing.properties.tags = {"owner": "team-x", "env": "dev"}
+        mock_edit_client.return_value.get_secret.return_value = existing
+        mock_edit_client.return_value.update_secret_properties.return_value = make_item(
+            "api-token", {"owner": "team-x", "env": "staging"})
+
+        edit.update_secret_tags("api-token", {"env": "staging"})
+        results = tags.find_by_tags("env=staging", item_types=('secret',))
+
+        self.assertEqual([name for _, name, _ in results], ["api-token"])
+        self.assertEqual(tags.find_by_tags("env=dev", item_types=('secret',)), [])
+        mock_get_client.return_value.list_properties_of_secrets.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
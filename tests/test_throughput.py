@@ -0,0 +1,34 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestThroughputBenchmark(unittest.TestCase):
+
+    def test_small_run_writes_results(self):
+        # Runs the real SDK against the emulator, end to end, at a tiny size
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "results.json")
+            subprocess.run(
+                [sys.executable, "benchmarks/throughput.py", "--sizes", "60", "--bulk-items", "10",
+                 "--cleanup-items", "2", "--cleanup-versions", "4", "--sidebar-rounds", "1",
+                 "--no-memory", "--output", output],
+                cwd=ROOT, capture_output=True, text=True, check=True, timeout=120
+            )
+            with open(output) as f:
+                document = json.load(f)
+
+        results = {r['workload']: r for r in document['results']}
+        self.assertEqual(set(results), {'list', 'sidebar', 'version_cleanup', 'bulk_update'})
+        self.assertEqual(results['list']['ops'], 60)
+        self.assertEqual(results['list']['samples'], 3)
+        self.assertEqual(results['version_cleanup']['ops'], 6)
+        self.assertEqual(results['bulk_update']['ops'], 10)
+        self.assertIsNotNone(results['sidebar']['p99_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
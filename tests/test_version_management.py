@@ -68,5 +68,32 @@ class TestVersionManagement(unittest.TestCase):
         # v1 is newest, v2 should be disabled
         mock_client.update_key_properties.assert_called_once_with("test-key", version="v2", enabled=False)
 
+    @patch('src.edit.get_certificate_client')
+    def test_disable_all_but_newest_returns_summary(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        versions = []
+        for i in range(4):
+            v = MagicMock()
+            v.version = f"v{i}"
+            v.created_on = datetime.now() - timedelta(days=i)
+            v.enabled = True
+            versions.append(v)
+        mock_client.list_properties_of_certificate_versions.return_value = versions
+
+        def update(certificate_name, version, enabled):
+            if version == "v2":
+                raise Exception("boom")
+        mock_client.update_certificate_properties.side_effect = update
+
+        summary = edit.disable_all_but_newest_certificate_version("test-cert")
+
+        self.assertEqual(
+            [(r['version'], r['status']) for r in summary],
+            [("v1", "disabled"), ("v2", "failed"), ("v3", "disabled")]
+        )
+        self.assertIn("boom", summary[1]['error'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from azure.core.exceptions import HttpResponseError
+from src import workers
+
+def throttled(retry_after=None):
+    response = MagicMock()
+    response.status_code = 429
+    response.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    return HttpResponseError(message="Too Many Requests", response=response)
+
+class TestWorkers(unittest.TestCase):
+
+    @patch('src.workers.time.sleep')
+    def test_call_with_retry_honours_retry_after(self, mock_sleep):
+        func = MagicMock(side_effect=[throttled("3"), throttled("1"), "ok"])
+
+        result = workers.call_with_retry(func, "arg")
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(func.call_count, 3)
+        mock_sleep.assert_any_call(3.0)
+        mock_sleep.assert_any_call(1.0)
+
+    @patch('src.workers.time.sleep')
+    def test_call_with_retry_gives_up(self, mock_sleep):
+        func = MagicMock(side_effect=throttled())
+
+        with self.assertRaises(HttpResponseError):
+            workers.call_with_retry(func, retries=2)
+
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_other_errors_are_not_retried(self):
+        func = MagicMock(side_effect=HttpResponseError(message="Forbidden"))
+
+        with self.assertRaises(HttpResponseError):
+            workers.call_with_retry(func)
+
+        func.assert_called_once()
+
+    def test_run_parallel_collects_results_in_order(self):
+        def func(item):
+            if item == 2:
+                raise ValueError("bad item")
+            return item * 10
+
+        results = workers.run_parallel(func, [1, 2, 3], max_workers=2)
+
+        self.assertEqual([item for item, _, _ in results], [1, 2, 3])
+        self.assertEqual(results[0][1], 10)
+        self.assertIsInstance(results[1][2], ValueError)
+        self.assertIsNone(results[2][2])
+
+if __name__ == '__main__':
+    unittest.main()